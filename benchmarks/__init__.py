@@ -0,0 +1 @@
+"""Bancs d'essai du championnat (``python -m benchmarks``)."""
@@ -0,0 +1,242 @@
+"""Bancs d'essai des traitements du championnat.
+
+Chaque échelle (nombre d'athlètes) est générée dans un répertoire temporaire
+puis chaque scénario est chronométré ``--repetitions`` fois (médiane et
+minimum). Les résultats sont écrits en JSON et comparés à une référence :
+toute médiane qui dépasse la référence de plus de ``--seuil`` (et d'au moins
+``--plancher`` secondes, pour ignorer le bruit des mesures très courtes) est
+une régression et le code de retour vaut 1. La mémoire de ``judo_data`` par
+athlète est aussi relevée et comparée à ``schema.OCTETS_PAR_ATHLETE_MAX``.
+
+Exemples ::
+
+    python -m benchmarks --echelles 1000 10000
+    python -m benchmarks --echelles 1000 10000 100000 --sortie resultats.json
+    python -m benchmarks --scenarios match classement --seuil 0.10
+    python -m benchmarks --echelles 1000 10000 --enregistrer-reference
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+
+from benchmarks.generateur import csv_combats, csv_joueurs, ecrire_instantane, generer  # noqa: E402
+from championnat import analyses, evenements, rapports  # noqa: E402
+from championnat.classements import MoteurClassement  # noqa: E402
+from championnat.importation import importer_combats, importer_csv  # noqa: E402
+from championnat.journal import INSTANTANE_JSON, INSTANTANE_PATH, JOURNAL_PATH, Journal  # noqa: E402
+from championnat.schema import OCTETS_PAR_ATHLETE_MAX, octets_par_ligne  # noqa: E402
+from championnat.stockage import StockageJournal, reconstruire  # noqa: E402
+
+SCENARIOS = ["chargement", "sauvegarde", "match", "matchs_lot", "import_csv", "classement", "analyses", "figures",
+             "export_pdf", "apptest_demarrage", "apptest_rerun", "apptest_saisie"]
+COMBATS_PAR_LOT = 1000
+REFERENCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reference.json")
+
+
+def mesurer(fonction, repetitions, preparation=None):
+    durees = []
+    for _ in range(repetitions):
+        if preparation is not None:
+            preparation()
+        debut = time.perf_counter()
+        fonction()
+        durees.append(time.perf_counter() - debut)
+    return {"mediane": statistics.median(durees), "min": min(durees), "repetitions": repetitions}
+
+
+def scenarios(echelle, repertoire):
+    """Nom -> (fonction chronométrée, préparation non chronométrée ou None)."""
+    judo_data, matchs = generer(echelle)
+    # Instantané JSON généré puis migré en colonnes au premier chargement (hors mesure)
+    ecrire_instantane(os.path.join(repertoire, INSTANTANE_JSON), judo_data, matchs)
+    stockage = StockageJournal(Journal(os.path.join(repertoire, JOURNAL_PATH),
+                                       os.path.join(repertoire, INSTANTANE_PATH)))
+    moteur = stockage.charger()
+    instantane = stockage.journal.charger_instantane()
+    joueurs = moteur.noms()
+    fichier_csv = csv_joueurs(echelle)
+    compteur = iter(range(10**9))
+    moteur_import = {}
+
+    def nouvel_evenement():
+        stockage.journal.ajouter(evenements.ajout("BANC", f"BANC{next(compteur):08d}", 70))
+
+    def match():
+        i = next(compteur)
+        stockage.enregistrer(moteur, evenements.match(joueurs[i % len(joueurs)], joueurs[(i + 1) % len(joueurs)],
+                                                      joueurs[i % len(joueurs)], "Ippon (10 pts)"))
+
+    lot = {}
+
+    def nouveau_lot():
+        stockage.rattraper(moteur)
+        lot["csv"] = csv_combats(joueurs, COMBATS_PAR_LOT, prefixe=f"LOT{next(compteur):06d}-")
+
+    def matchs_lot():
+        importer_combats(io.BytesIO(lot["csv"]), moteur, lambda evenement: stockage.enregistrer(moteur, evenement))
+
+    def nouveau_moteur():
+        moteur_import["moteur"] = MoteurClassement.depuis_instantane(instantane)
+
+    def importer():
+        m = moteur_import["moteur"]
+        importer_csv(io.BytesIO(fichier_csv), m, m.appliquer)
+
+    def invalider():
+        moteur.version += 1  # oblige vues et agrégats à se reconstruire
+
+    def agregats():
+        analyses.filtrer(moteur, "Toutes", "Toutes")
+        analyses.statistiques(moteur, "Toutes", "Toutes")
+
+    def pdf():
+        classement = moteur.classement_joueurs.sort_values(by='Points', ascending=False)
+        rapports.export_to_pdf("Classement des joueurs", analyses.statistiques(moteur, "Toutes", "Toutes"), classement)
+
+    appli = {}
+
+    def demarrer_appli():
+        import streamlit as st
+        from streamlit.testing.v1 import AppTest
+
+        st.cache_resource.clear()  # nouveau moteur partagé, chargé depuis ce répertoire
+        appli["test"] = AppTest.from_file(os.path.join(repertoire, "judo.py"), default_timeout=600).run()
+
+    def relancer_appli():
+        appli["test"].sidebar.selectbox[0].set_value("Voir Classements").run()
+
+    def ouvrir_saisie():
+        # Première visite de la page de saisie sur une appli fraîche : inclut la liste des matchs,
+        # construite à la demande et non au démarrage
+        appli["test"].sidebar.selectbox[0].set_value("Enregistrer un Match").run()
+
+    return {
+        "chargement": (stockage.charger, None),
+        "sauvegarde": (lambda: stockage.journal.compacter(reconstruire), nouvel_evenement),
+        "match": (match, lambda: stockage.rattraper(moteur)),  # hors mesure : événements des autres bancs
+        "matchs_lot": (matchs_lot, nouveau_lot),  # COMBATS_PAR_LOT combats en un seul événement
+        "import_csv": (importer, nouveau_moteur),
+        "classement": (lambda: moteur.classement_joueurs.sort_values(by='Points', ascending=False), invalider),
+        "analyses": (agregats, invalider),
+        "figures": (lambda: analyses.figures(moteur, "Toutes", "Toutes"), invalider),
+        "export_pdf": (pdf, None),
+        "apptest_demarrage": (demarrer_appli, None),
+        "apptest_rerun": (relancer_appli, lambda: appli or demarrer_appli()),
+        "apptest_saisie": (ouvrir_saisie, demarrer_appli),
+    }
+
+
+def memoire(echelle):
+    """Octets par athlète de la vue typée ``judo_data``."""
+    judo_data, matchs = generer(echelle)
+    moteur = MoteurClassement.depuis_instantane({"judo_data": judo_data.to_dict(), "matchs": matchs})
+    return octets_par_ligne(moteur.judo_data)
+
+
+def executer(echelles, noms, repetitions):
+    resultats = {}
+    dossier = os.getcwd()
+    for echelle in echelles:
+        repertoire = tempfile.mkdtemp(prefix=f"banc_judo_{echelle}_")
+        shutil.copy(os.path.join(RACINE, "judo.py"), repertoire)
+        os.chdir(repertoire)  # l'application lit ses fichiers dans le répertoire courant
+        os.environ["JUDO_STOCKAGE"] = "json"
+        try:
+            bancs = scenarios(echelle, repertoire)
+            resultats[str(echelle)] = {}
+            for nom in noms:
+                fonction, preparation = bancs[nom]
+                mesure = mesurer(fonction, repetitions, preparation)
+                resultats[str(echelle)][nom] = mesure
+                print(f"{echelle:>8} {nom:<18} médiane {mesure['mediane'] * 1000:10.2f} ms"
+                      f"   min {mesure['min'] * 1000:10.2f} ms", file=sys.stderr)
+        finally:
+            os.chdir(dossier)
+            shutil.rmtree(repertoire, ignore_errors=True)
+    return resultats
+
+
+def comparer(resultats, reference, seuil, plancher):
+    """Liste des régressions (échelle, scénario, référence, mesure, ratio)."""
+    regressions = []
+    for echelle, mesures in resultats.items():
+        for nom, mesure in mesures.items():
+            attendu = reference.get(echelle, {}).get(nom)
+            if attendu is None:
+                continue
+            avant, apres = attendu["mediane"], mesure["mediane"]
+            if apres > avant * (1 + seuil) and apres - avant > plancher:
+                regressions.append((echelle, nom, avant, apres, apres / avant))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.splitlines()[0])
+    parser.add_argument("--echelles", type=int, nargs="+", default=[1000, 10_000, 100_000])
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--repetitions", type=int, default=3)
+    parser.add_argument("--sortie", help="fichier JSON des résultats (défaut : sortie standard)")
+    parser.add_argument("--reference", default=REFERENCE)
+    parser.add_argument("--seuil", type=float, default=0.25, help="régression tolérée, en fraction (0.25 = +25 %%)")
+    parser.add_argument("--plancher", type=float, default=0.005, help="écart absolu ignoré, en secondes")
+    parser.add_argument("--enregistrer-reference", action="store_true",
+                        help="remplace les mesures de référence par celles-ci")
+    args = parser.parse_args(argv)
+
+    rapport = {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plateforme": platform.platform(),
+        "repetitions": args.repetitions,
+        "resultats": executer(args.echelles, args.scenarios, args.repetitions),
+        "octets_par_athlete": {str(echelle): memoire(echelle) for echelle in args.echelles},
+    }
+    texte = json.dumps(rapport, indent=2, ensure_ascii=False)
+    if args.sortie:
+        with open(args.sortie, "w") as f:
+            f.write(texte)
+    else:
+        print(texte)
+
+    depassements = {echelle: octets for echelle, octets in rapport["octets_par_athlete"].items()
+                    if octets > OCTETS_PAR_ATHLETE_MAX}
+    for echelle, octets in depassements.items():
+        print(f"MÉMOIRE {echelle} : {octets:.1f} octets par athlète (cible {OCTETS_PAR_ATHLETE_MAX})", file=sys.stderr)
+
+    if args.enregistrer_reference:
+        reference = {}
+        if os.path.exists(args.reference):
+            with open(args.reference) as f:
+                reference = json.load(f)
+        reference.setdefault("resultats", {})
+        for echelle, mesures in rapport["resultats"].items():
+            reference["resultats"].setdefault(echelle, {}).update(mesures)
+        reference.update({cle: rapport[cle] for cle in ("date", "python", "plateforme", "repetitions")})
+        with open(args.reference, "w") as f:
+            json.dump(reference, f, indent=2, ensure_ascii=False)
+        return 0
+    if not os.path.exists(args.reference):
+        print("Pas de référence : comparaison ignorée.", file=sys.stderr)
+        return 0
+    with open(args.reference) as f:
+        reference = json.load(f)["resultats"]
+    regressions = comparer(rapport["resultats"], reference, args.seuil, args.plancher)
+    for echelle, nom, avant, apres, ratio in regressions:
+        print(f"RÉGRESSION {echelle} {nom} : {avant * 1000:.2f} ms -> {apres * 1000:.2f} ms (x{ratio:.2f})",
+              file=sys.stderr)
+    return 1 if regressions or depassements else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
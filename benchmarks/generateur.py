@@ -0,0 +1,79 @@
+"""Générateur de championnats synthétiques reproductibles.
+
+Les combats sont tirés en premier ; victoires, défaites et points des
+athlètes en sont déduits, de sorte que l'instantané produit est cohérent
+avec ses matchs (``MoteurClassement.verifier`` ne relève aucun écart).
+"""
+import json
+
+import numpy as np
+import pandas as pd
+
+from championnat.evenements import POINTS_VICTOIRE
+
+
+def generer(athletes, equipes=None, combats=None, graine=0):
+    """Renvoie (judo_data, matchs) pour ``athletes`` joueurs répartis en ``equipes``."""
+    rng = np.random.default_rng(graine)
+    equipes = equipes or max(athletes // 25, 2)
+    combats = athletes * 2 if combats is None else combats
+    joueurs = np.array([f"ATHLETE{i:06d}" for i in range(athletes)], dtype=object)
+
+    joueur1 = rng.integers(0, athletes, combats)
+    joueur2 = (joueur1 + rng.integers(1, athletes, combats)) % athletes
+    issue = rng.random(combats)
+    gagnant = np.where(issue < 0.5, joueur1, joueur2)
+    perdant = np.where(issue < 0.5, joueur2, joueur1)
+    egalite = issue > 0.95
+    points = rng.choice(list(POINTS_VICTOIRE.values()), combats)
+    points[egalite] = 0
+    decisifs = ~egalite
+
+    judo_data = pd.DataFrame({
+        'Equipe': [f"CLUB{k:04d}" for k in rng.integers(0, equipes, athletes)],
+        'Joueur': joueurs,
+        'Poids': rng.normal(75, 15, athletes).clip(40, 140).round().astype(int),
+        'Victoires': np.bincount(gagnant[decisifs], minlength=athletes),
+        'Defaites': np.bincount(perdant[decisifs], minlength=athletes),
+        'Points': np.bincount(gagnant[decisifs], weights=points[decisifs], minlength=athletes).astype(int),
+    })
+    vainqueurs = np.where(egalite, "Égalité", joueurs[gagnant])
+    matchs = [{"id": f"m{i:08d}", "joueur1": j1, "joueur2": j2, "vainqueur": v, "points": int(p), "date": 0}
+              for i, (j1, j2, v, p) in enumerate(zip(joueurs[joueur1], joueurs[joueur2], vainqueurs, points))]
+    return judo_data, matchs
+
+
+def ecrire_instantane(chemin, judo_data, matchs):
+    with open(chemin, "w") as f:
+        json.dump({"judo_data": judo_data.to_dict(), "matchs": matchs, "journal_seq": 0}, f)
+
+
+def csv_joueurs(athletes, graine=1, prefixe="NOUVEAU"):
+    """CSV d'inscriptions (Equipe, Joueur, Poids, Victoires, Defaites), en octets."""
+    rng = np.random.default_rng(graine)
+    df = pd.DataFrame({
+        'Equipe': [f"CLUB{k:04d}" for k in rng.integers(0, max(athletes // 25, 2), athletes)],
+        'Joueur': [f"{prefixe}{i:06d}" for i in range(athletes)],
+        'Poids': rng.integers(40, 140, athletes),
+        'Victoires': rng.integers(0, 20, athletes),
+        'Defaites': rng.integers(0, 20, athletes),
+    })
+    return df.to_csv(index=False).encode("utf-8")
+
+
+def csv_combats(joueurs, combats, graine=2, prefixe="LOT"):
+    """CSV de résultats de tapis (Id, Joueur1, Joueur2, Vainqueur, Technique) entre ``joueurs``, en octets."""
+    rng = np.random.default_rng(graine)
+    joueurs = np.asarray(joueurs, dtype=object)
+    joueur1 = rng.integers(0, len(joueurs), combats)
+    joueur2 = (joueur1 + rng.integers(1, len(joueurs), combats)) % len(joueurs)
+    issue = rng.integers(0, 5, combats)  # 0-1 : joueur 1, 2-3 : joueur 2, 4 : égalité
+    vainqueurs = np.where(issue < 2, joueurs[joueur1], np.where(issue < 4, joueurs[joueur2], "Égalité"))
+    df = pd.DataFrame({
+        'Id': [f"{prefixe}{i:08d}" for i in range(combats)],
+        'Joueur1': joueurs[joueur1],
+        'Joueur2': joueurs[joueur2],
+        'Vainqueur': vainqueurs,
+        'Technique': np.where(issue < 4, rng.choice(["Ippon", "Waza-ari", "Yuko"], combats), ""),
+    })
+    return df.to_csv(index=False).encode("utf-8")
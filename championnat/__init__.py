@@ -0,0 +1 @@
+"""Logique métier du Championnat Marocain de Judo (sans interface)."""
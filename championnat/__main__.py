@@ -0,0 +1,259 @@
+"""Interface en ligne de commande pour les traitements par lots.
+
+Exemples ::
+
+    python -m championnat recalculer --verifier
+    python -m championnat classement --equipes -n 10
+    python -m championnat compacter
+    python -m championnat migrer judo_data.json
+    python -m championnat saison 2025-2026
+    python -m championnat saison 2025-2026-cadettes --table F-cadet --sans-joueurs
+    python -m championnat archives carrieres -n 20 --en-cours
+    python -m championnat importer joueurs.csv
+    python -m championnat combats tapis3.json
+    python -m championnat exporter csv championnat.csv
+    python -m championnat exporter pdf podium.pdf --table podium
+    python -m championnat exporter parquet combats.parquet --table combats
+    python -m championnat planning --tapis 8 planning.csv
+    python -m championnat direct --port 8765 --simulation 2
+    python -m championnat direct --hote 0.0.0.0
+    python -m championnat --logs stderr compacter
+"""
+import argparse
+import sys
+
+from championnat import categories, instantane, mesures, saisons
+from championnat.journal import INSTANTANE_JSON, INSTANTANE_PATH, JOURNAL_PATH, Journal
+from championnat.stockage import StockageSQLite, ouvrir_stockage
+from championnat.tirage import DUREE_COMBAT, REPOS_MIN
+
+TABLES = ["judo_data", "classement_equipes", "classement_joueurs", "podium", "combats"]
+
+
+def table(moteur, nom):
+    if nom == "podium":
+        return moteur.podium_joueurs()
+    if nom == "combats":
+        return moteur.combats.tableau(moteur.combats.ordre_chronologique())
+    return getattr(moteur, nom)
+
+
+def recalculer(stockage, args):
+    moteur = stockage.charger()
+    print(f"{len(moteur)} joueurs, {len(moteur.equipes)} équipes, {len(moteur.matchs)} matchs")
+    if args.verifier:
+        ecarts = moteur.verifier()
+        if ecarts:
+            print(f"Écarts sur les équipes : {', '.join(sorted(ecarts))}", file=sys.stderr)
+            return 1
+        print("Classements cohérents.")
+    return 0
+
+
+def classement(stockage, args):
+    if isinstance(stockage, StockageSQLite):
+        # Requête indexée : inutile de charger tout le championnat
+        df = stockage.classement_equipes(args.n) if args.equipes else stockage.classement_joueurs(limite=args.n)
+    elif stockage.journal.colonnes and stockage.dernier_seq() == stockage.journal.seq_instantane():
+        # Instantané à jour : seules les colonnes du classement sont lues
+        df = instantane.classement(stockage.journal.instantane, args.n, args.equipes)
+    else:
+        moteur = stockage.charger()
+        df = moteur.podium_equipes(args.n) if args.equipes else moteur.podium_joueurs(args.n)
+    print(df.to_string(index=False))
+    return 0
+
+
+def compacter(stockage, args):
+    stockage.compacter()
+    return 0
+
+
+def migrer(stockage, args):
+    if not instantane.migrer(args.source, args.instantane):
+        print(f"{args.source} introuvable.", file=sys.stderr)
+        return 1
+    print(f"{args.source} converti en {args.instantane}.")
+    return 0
+
+
+def saison(stockage, args):
+    moteur = stockage.charger()
+    ancienne = moteur.saison
+    try:
+        table_categories = None if args.table is None else tuple(args.table.split("-"))
+        saisons.nouvelle_saison(stockage, args.championnat or moteur.championnat, args.saison,
+                                not args.sans_joueurs, args.archives, table_categories)
+    except ValueError as erreur:
+        print(erreur, file=sys.stderr)
+        return 1
+    print(f"Saison {ancienne} archivée dans {args.archives}, saison {args.saison} ouverte.")
+    return 0
+
+
+def archives(stockage, args):
+    en_cours = stockage.charger() if args.en_cours else None
+    if args.vue == "saisons":
+        df = saisons.lire_cumuls("saisons", championnat=args.championnat, racine=args.archives, en_cours=en_cours)
+    elif args.vue == "carrieres":
+        df = saisons.carrieres(args.championnat, args.archives, en_cours).head(args.n)
+    elif args.vue == "dynasties":
+        df = saisons.dynasties(args.championnat, args.archives, en_cours).head(args.n)
+    else:
+        df = saisons.evolution_categories(args.mesure, args.championnat, args.archives, en_cours)
+    print(df.to_string(index=args.vue == "categories"))
+    return 0
+
+
+def importer(stockage, args):
+    from championnat.importation import importer_csv
+
+    moteur = stockage.charger()
+    with open(args.fichier, "rb") as f:
+        rapport = importer_csv(f, moteur, lambda evenement: stockage.enregistrer(moteur, evenement))
+    print(f"{rapport.acceptes} joueur(s) importé(s), {rapport.nb_rejets} ligne(s) rejetée(s).")
+    if rapport.nb_rejets:
+        print(rapport.rejets_df.to_string(index=False), file=sys.stderr)
+    return 0
+
+
+def combats(stockage, args):
+    from championnat.importation import importer_combats
+
+    moteur = stockage.charger()
+    if args.fichier == "-":
+        rapport = importer_combats(sys.stdin.read(), moteur, lambda evenement: stockage.enregistrer(moteur, evenement))
+    else:
+        with open(args.fichier, "rb") as f:
+            rapport = importer_combats(f, moteur, lambda evenement: stockage.enregistrer(moteur, evenement))
+    print(f"{rapport.acceptes} combat(s) enregistré(s), {rapport.deja_enregistres} déjà connu(s), "
+          f"{rapport.nb_rejets} ligne(s) rejetée(s).")
+    if rapport.nb_rejets:
+        print(rapport.rejets_df.to_string(index=False), file=sys.stderr)
+    return 0
+
+
+def exporter(stockage, args):
+    moteur = stockage.charger()
+    if args.format == "parquet" and args.table == "combats":
+        moteur.combats.ecrire_parquet(args.sortie)  # colonnes typées, noms en dictionnaire
+        return 0
+    df = table(moteur, args.table)
+    if args.format == "parquet":
+        df.to_parquet(args.sortie, index=False)
+    elif args.format == "csv":
+        df.to_csv(args.sortie, index=False)
+    else:
+        from championnat.rapports import export_to_pdf
+
+        with open(args.sortie, "wb") as f:
+            f.write(export_to_pdf(f"{args.table} - Championnat Marocain de Judo", None, df).getvalue())
+    return 0
+
+
+def planning(stockage, args):
+    from championnat import tirage
+
+    moteur = stockage.charger()
+    tirages = tirage.tirer_tout(moteur.judo_data)
+    df = tirage.planifier(tirages, args.tapis, args.duree, args.repos)
+    if args.sortie:
+        df.to_csv(args.sortie, index=False)
+    else:
+        print(df.to_string(index=False))
+    print(f"{len(df)} combats sur {args.tapis} tapis, fin à +{df['Fin'].max() if len(df) else 0} min.", file=sys.stderr)
+    return 0
+
+
+def direct(stockage, args):
+    import asyncio
+
+    from championnat.direct import servir
+
+    print(f"Tableau d'affichage : http://{args.hote}:{args.port}/  (flux : /flux)", file=sys.stderr)
+    try:
+        asyncio.run(servir(stockage, args.hote, args.port, args.intervalle, args.simulation))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m championnat", description=__doc__.splitlines()[0])
+    parser.add_argument("--stockage", help="json ou sqlite:chemin.db (défaut : $JUDO_STOCKAGE ou json)")
+    parser.add_argument("--journal", default=JOURNAL_PATH)
+    parser.add_argument("--instantane", default=INSTANTANE_PATH)
+    parser.add_argument("--archives", default=saisons.ARCHIVES_PATH, help="répertoire des saisons archivées")
+    parser.add_argument("--logs", help="journaux JSON des mesures : stderr ou un fichier (défaut : $JUDO_LOGS)")
+    commandes = parser.add_subparsers(dest="commande", required=True)
+
+    p = commandes.add_parser("recalculer", help="rejoue instantané + journal et affiche un résumé")
+    p.add_argument("--verifier", action="store_true", help="compare les totaux d'équipe à un recalcul complet")
+    p.set_defaults(action=recalculer)
+
+    p = commandes.add_parser("classement", help="affiche le haut du classement")
+    p.add_argument("--equipes", action="store_true")
+    p.add_argument("-n", type=int, default=10)
+    p.set_defaults(action=classement)
+
+    p = commandes.add_parser("compacter", help="écrit un nouvel instantané et vide le journal")
+    p.set_defaults(action=compacter)
+
+    p = commandes.add_parser("migrer", help="convertit un instantané JSON en instantané en colonnes")
+    p.add_argument("source", nargs="?", default=INSTANTANE_JSON)
+    p.set_defaults(action=migrer)
+
+    p = commandes.add_parser("saison", help="archive la saison en cours (lecture seule) et en ouvre une nouvelle")
+    p.add_argument("saison", help="nom de la nouvelle saison, ex. 2025-2026")
+    p.add_argument("--championnat", help="championnat de la nouvelle saison (défaut : le même)")
+    p.add_argument("--sans-joueurs", action="store_true", help="repartir sans joueurs inscrits")
+    p.add_argument("--table", choices=[categories.nom_table(table) for table in categories.TABLES],
+                   help="catégories de poids de la nouvelle saison (défaut : les mêmes)")
+    p.set_defaults(action=saison)
+
+    p = commandes.add_parser("archives", help="statistiques sur les saisons archivées")
+    p.add_argument("vue", choices=["saisons", "carrieres", "dynasties", "categories"])
+    p.add_argument("-n", type=int, default=20)
+    p.add_argument("--championnat")
+    p.add_argument("--mesure", default="Performance", choices=["Performance", "Points", "Victoires", "Athletes"])
+    p.add_argument("--en-cours", action="store_true", help="inclut la saison en cours")
+    p.set_defaults(action=archives)
+
+    p = commandes.add_parser("importer", help="importe un CSV de joueurs")
+    p.add_argument("fichier")
+    p.set_defaults(action=importer)
+
+    p = commandes.add_parser("combats", help="enregistre un lot de combats (CSV ou JSON ; - pour l'entrée standard)")
+    p.add_argument("fichier")
+    p.set_defaults(action=combats)
+
+    p = commandes.add_parser("exporter", help="exporte une table en CSV, PDF ou Parquet")
+    p.add_argument("format", choices=["csv", "pdf", "parquet"])
+    p.add_argument("sortie")
+    p.add_argument("--table", choices=TABLES, default="judo_data")
+    p.set_defaults(action=exporter)
+
+    p = commandes.add_parser("planning", help="tire au sort chaque catégorie et planifie les combats sur les tapis")
+    p.add_argument("sortie", nargs="?", help="fichier CSV (défaut : affichage)")
+    p.add_argument("--tapis", type=int, default=8)
+    p.add_argument("--duree", type=int, default=DUREE_COMBAT, help="minutes par combat")
+    p.add_argument("--repos", type=int, default=REPOS_MIN, help="minutes de repos entre deux combats d'un athlète")
+    p.set_defaults(action=planning)
+
+    p = commandes.add_parser("direct", help="sert le flux en direct (SSE) et le tableau d'affichage")
+    p.add_argument("--hote", default="127.0.0.1",
+                   help="adresse d'écoute ; 0.0.0.0 expose le flux, sans authentification, à tout le réseau")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--intervalle", type=float, default=0.5, help="secondes entre deux lectures du stockage")
+    p.add_argument("--simulation", type=float, metavar="SECONDES",
+                   help="combats aléatoires à cette cadence, sur une copie temporaire des données")
+    p.set_defaults(action=direct)
+
+    args = parser.parse_args(argv)
+    mesures.configurer_logs(args.logs)
+    stockage = ouvrir_stockage(args.stockage, Journal(args.journal, args.instantane))
+    return args.action(stockage, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""Agrégats et graphiques de la page « Analyser Performances ».
+
+Les résultats sont mémorisés dans un cache LRU partagé par le processus, sous
+la clé (identifiant du moteur, version, catégorie, équipe) : tant qu'aucune
+mutation n'incrémente la version, changer d'onglet ou de widget ne recalcule
+ni les agrégats ni les figures.
+"""
+from championnat import mesures
+from championnat.cache import CacheLRU
+
+COLONNES_DETAIL = ['Joueur', 'Equipe', 'Categorie', 'Poids', 'Victoires', 'Defaites', 'Points', 'Performance']
+
+cache = CacheLRU(nom="analyses")
+
+
+def memoiser(moteur, categorie, equipe, nom, calcul):
+    return cache.obtenir((moteur.identifiant, moteur.version, categorie, equipe, nom),
+                         mesures.mesurer(f"analyses.{nom}")(calcul))
+
+
+def filtrer(moteur, categorie, equipe):
+    def calcul():
+        with moteur.verrou:  # vue et index de la même version
+            df = moteur.judo_data
+            if equipe != "Toutes":
+                df = df.iloc[moteur.index.lignes_equipe(equipe)]
+        if categorie != "Toutes":
+            df = df[df['Categorie'] == categorie]
+        return df[COLONNES_DETAIL]
+    return memoiser(moteur, categorie, equipe, "donnees", calcul)
+
+
+def statistiques(moteur, categorie, equipe):
+    def calcul():
+        df = filtrer(moteur, categorie, equipe)
+        victoires = df['Victoires'].sum()
+        return {
+            "Total Combats": int(victoires + df['Defaites'].sum()),
+            "Points Totaux": int(df['Points'].sum()),
+            "Ratio Points/Victoire": f"{df['Points'].sum() / victoires:.2f}" if victoires > 0 else "N/A",
+            "Performance Moyenne": f"{df['Performance'].mean():.2%}",
+        }
+    return memoiser(moteur, categorie, equipe, "statistiques", calcul)
+
+
+def figures(moteur, categorie, equipe):
+    """Les quatre graphiques de la page ; le radar vaut None sans joueur."""
+    def calcul():
+        # Plotly n'est chargé qu'au premier graphique demandé
+        import plotly.express as px
+        import plotly.graph_objects as go
+
+        df = filtrer(moteur, categorie, equipe)
+        # Ordre du palmarès (départage déterministe) plutôt qu'un nouveau tri
+        with moteur.verrou:
+            noms = moteur.palmares.noms(Categorie=None if categorie == "Toutes" else categorie,
+                                        Equipe=None if equipe == "Toutes" else equipe)
+            par_points = moteur.judo_data.iloc[[moteur.index.position(joueur) for joueur in noms]][COLONNES_DETAIL]
+
+        fig1 = px.bar(par_points, x='Joueur', y='Points', color='Equipe',
+                      title="Classement par Points", text='Points', height=500)
+        fig1.update_traces(textposition='outside')
+        fig1.update_layout(xaxis_title="Joueur", yaxis_title="Points", bargap=0.2, showlegend=True)
+
+        heatmap_data = df.pivot_table(values='Performance', index='Equipe', columns='Categorie',
+                                      aggfunc='mean', observed=True).fillna(0)
+        fig2 = go.Figure(data=go.Heatmap(
+            z=heatmap_data.values,
+            x=heatmap_data.columns.astype(str),
+            y=heatmap_data.index,
+            colorscale='Viridis',
+            text=heatmap_data.values.round(2),
+            texttemplate="%{text}",
+            textfont={"size": 12}
+        ))
+        fig2.update_layout(title="Performance Moyenne par Équipe et Catégorie", height=500)
+
+        top_5 = par_points.head(5)
+        fig3 = None
+        if len(top_5) >= 1:
+            fig3 = go.Figure()
+            axes = ['Victoires', 'Points', 'Performance']
+            for row in top_5.itertuples():
+                fig3.add_trace(go.Scatterpolar(
+                    r=[row.Victoires, row.Points / 10, row.Performance * 100],  # Normalisation pour lisibilité
+                    theta=axes,
+                    fill='toself',
+                    name=f"{row.Joueur} ({row.Equipe})"
+                ))
+            fig3.update_layout(
+                polar=dict(radialaxis=dict(visible=True, range=[0, max(top_5['Points'].max() / 10, top_5['Victoires'].max(), top_5['Performance'].max() * 100)])),
+                showlegend=True,
+                title="Comparaison des Top 5 Joueurs (Radar)",
+                height=500
+            )
+
+        victoires_par_equipe = df.groupby('Equipe')['Victoires'].sum().reset_index()
+        fig4 = px.pie(victoires_par_equipe, names='Equipe', values='Victoires',
+                      title="Répartition des Victoires par Équipe", hole=0.3, height=500)
+        fig4.update_traces(textinfo='percent+label', pull=[0.1 if i == 0 else 0 for i in range(len(victoires_par_equipe))])
+        return fig1, fig2, fig3, fig4
+    return memoiser(moteur, categorie, equipe, "figures", calcul)
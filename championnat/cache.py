@@ -0,0 +1,45 @@
+"""Cache LRU borné et sûr entre threads, partagé par toutes les sessions."""
+import threading
+from collections import OrderedDict
+
+from championnat import mesures
+
+
+class CacheLRU:
+    def __init__(self, taille=64, nom=None):
+        self.taille = taille
+        self.nom = nom  # si présent, succès et échecs sont comptés sous ``cache.<nom>``
+        self._valeurs = OrderedDict()
+        self._verrou = threading.Lock()
+
+    def __contains__(self, cle):
+        with self._verrou:
+            return cle in self._valeurs
+
+    def lire(self, cle, defaut=None):
+        with self._verrou:
+            if cle not in self._valeurs:
+                return defaut
+            self._valeurs.move_to_end(cle)
+            return self._valeurs[cle]
+
+    def ajouter(self, cle, valeur):
+        with self._verrou:
+            self._valeurs[cle] = valeur
+            self._valeurs.move_to_end(cle)
+            while len(self._valeurs) > self.taille:
+                self._valeurs.popitem(last=False)
+
+    def retirer(self, cle):
+        with self._verrou:
+            self._valeurs.pop(cle, None)
+
+    def obtenir(self, cle, calcul):
+        manquant = object()
+        valeur = self.lire(cle, manquant)
+        if self.nom is not None:
+            mesures.compter(f"cache.{self.nom}.{'echec' if valeur is manquant else 'succes'}")
+        if valeur is manquant:
+            valeur = calcul()
+            self.ajouter(cle, valeur)
+        return valeur
@@ -0,0 +1,57 @@
+"""Catégories de poids.
+
+Chaque table de catégories est une liste de bornes supérieures croissantes
+(en kg) ; la dernière catégorie est ouverte (« +100 kg »). Les colonnes de
+poids entières sont classées en un seul appel à ``np.searchsorted`` et
+renvoyées sous forme de ``pd.Categorical`` ordonné.
+"""
+from bisect import bisect_left
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# (sexe, tranche d'âge) -> bornes supérieures, d'après les catégories IJF
+TABLES = {
+    ("M", "senior"): [60, 66, 73, 81, 90, 100],
+    ("F", "senior"): [48, 52, 57, 63, 70, 78],
+    ("M", "junior"): [60, 66, 73, 81, 90, 100],
+    ("F", "junior"): [48, 52, 57, 63, 70, 78],
+    ("M", "cadet"): [50, 55, 60, 66, 73, 81, 90],
+    ("F", "cadet"): [40, 44, 48, 52, 57, 63, 70],
+}
+TABLE_PAR_DEFAUT = ("M", "senior")
+SEXES = {"M": "Hommes", "F": "Femmes"}
+
+
+def nom_table(table):
+    """Nom court d'une table (« F-junior »), celui de l'option ``--table`` en ligne de commande."""
+    return "-".join(table)
+
+
+def libelle_table(table):
+    sexe, age = table
+    return f"{SEXES[sexe]}, {age} ({', '.join(libelles(table))})"
+
+
+@lru_cache(maxsize=None)
+def libelles(table=TABLE_PAR_DEFAUT):
+    bornes = TABLES[table]
+    return [f"-{borne} kg" for borne in bornes] + [f"+{bornes[-1]} kg"]
+
+
+@lru_cache(maxsize=None)
+def type_categorie(table=TABLE_PAR_DEFAUT):
+    return pd.CategoricalDtype(libelles(table), ordered=True)
+
+
+def categoriser(poids, table=TABLE_PAR_DEFAUT):
+    """Classe une colonne de poids entière ; les poids manquants restent NaN."""
+    poids = np.asarray(poids, dtype=float)
+    codes = np.searchsorted(TABLES[table], poids, side="left")
+    codes[np.isnan(poids)] = -1
+    return pd.Categorical.from_codes(codes, dtype=type_categorie(table))
+
+
+def categorie_poids(poids, table=TABLE_PAR_DEFAUT):
+    return libelles(table)[bisect_left(TABLES[table], poids)]
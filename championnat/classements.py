@@ -0,0 +1,566 @@
+"""Moteur de classement alimenté par les événements du journal.
+
+Le moteur garde une ligne par joueur, retrouvée via l'index des joueurs, et
+les totaux de chaque équipe dans un dictionnaire : un match, un ajout ou une
+modification ne touche que les entrées concernées (O(1)). Les tables
+``judo_data``, ``classement_equipes`` et ``classement_joueurs`` ne sont plus
+que des vues matérialisées, reconstruites à la demande quand la version change
+et typées selon ``championnat.schema``.
+"""
+import sys
+import threading
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from championnat.categories import TABLE_PAR_DEFAUT, TABLES, categorie_poids, categoriser
+from championnat.combats import JournalCombats
+from championnat.index import IndexJoueurs
+from championnat.palmares import Palmares, cle_equipe, cle_joueur, cles_joueurs
+from championnat.schema import borner, construire, typer, verifier_bornes
+
+COLONNES = {
+    "judo_data": ['Id', 'Equipe', 'Joueur', 'Poids', 'Victoires', 'Defaites', 'Points', 'Performance', 'Categorie'],
+    "classement_equipes": ['Equipe', 'Points_Totaux', 'Victoires_Totaux'],
+    "classement_joueurs": ['Joueur', 'Equipe', 'Points', 'Victoires'],
+}
+TAILLE_PAGE = 50
+CHAMPIONNAT_PAR_DEFAUT = "Championnat Marocain de Judo"
+SAISON_PAR_DEFAUT = "2024-2025"
+
+
+def interner(equipes):
+    """Une seule chaîne par équipe (``sys.intern`` une fois par équipe distincte)."""
+    codes, distinctes = pd.factorize(equipes)
+    return np.array([sys.intern(equipe) for equipe in distinctes], dtype=object)[codes]
+
+
+def performance(victoires, defaites):
+    return victoires / (victoires + defaites) if (victoires + defaites) > 0 else 0
+
+
+class MoteurClassement:
+    def __init__(self, table_categories=TABLE_PAR_DEFAUT, championnat=CHAMPIONNAT_PAR_DEFAUT,
+                 saison=SAISON_PAR_DEFAUT):
+        self.table_categories = tuple(table_categories)
+        self.championnat = championnat
+        self.saison = saison
+        self.index = IndexJoueurs()
+        self._lignes = []   # position -> ligne de judo_data
+        self._prochain_id = 0  # identifiant interne du prochain joueur (jamais réutilisé)
+        self.equipes = {}   # Equipe -> Points_Totaux, Victoires_Totaux
+        self._matchs = {}   # id -> joueur1, joueur2, vainqueur, points, date ; None : à tirer du journal des combats
+        self.combats = JournalCombats()  # historique en colonnes, y compris les matchs annulés
+        self.palmares = Palmares(cle_joueur, ('Categorie', 'Equipe'))
+        self.palmares_equipes = Palmares(cle_equipe)
+        self.equipes_par_categorie = {}  # Categorie -> Equipe -> Points_Totaux, Victoires_Totaux, Membres
+        self.palmares_categories = {}    # Categorie -> Palmares des équipes sur cette catégorie
+        self.identifiant = uuid.uuid4().hex  # distingue les moteurs dans les caches partagés
+        self.version = 0
+        self.seq = 0        # numéro du dernier événement persistant appliqué
+        self._vues = {}
+        # Les sessions Streamlit partagent le moteur : écritures et vues sous verrou
+        self.verrou = threading.RLock()
+        self._joueurs_modifies = set()
+        self._equipes_modifiees = set()
+
+    def __contains__(self, joueur):
+        return joueur in self.index
+
+    def __len__(self):
+        return len(self._lignes)
+
+    def joueur(self, joueur):
+        return self._lignes[self.index.position(joueur)]
+
+    @property
+    def matchs(self):
+        """Matchs non annulés ; après un instantané en colonnes, construits à la première utilisation."""
+        if self._matchs is None:
+            with self.verrou:
+                if self._matchs is None:
+                    self._matchs = {match["id"]: match for match in self.combats.matchs()}
+        return self._matchs
+
+    def noms(self):
+        with self.verrou:
+            return list(self.index.noms)
+
+    def fiche(self, joueur):
+        """Copie de la ligne d'un joueur, None s'il n'est (plus) inscrit : lecture sûre pour l'interface."""
+        with self.verrou:
+            return dict(self.joueur(joueur)) if joueur in self.index else None
+
+    def noms_equipes(self):
+        with self.verrou:
+            return sorted(self.index.membres)
+
+    def liste_matchs(self):
+        """Copie des matchs non annulés, du plus récent au plus ancien."""
+        with self.verrou:
+            return [dict(match) for match in reversed(self.matchs.values())]
+
+    def categories(self):
+        """Catégories représentées, dans l'ordre des poids."""
+        return self.judo_data['Categorie'].cat.remove_unused_categories().cat.categories.tolist()
+
+    # Construction
+
+    @classmethod
+    def depuis_instantane(cls, instantane):
+        moteur = cls(instantane.get("categories", TABLE_PAR_DEFAUT), instantane.get("championnat", CHAMPIONNAT_PAR_DEFAUT),
+                     instantane.get("saison", SAISON_PAR_DEFAUT))
+        judo_data = pd.DataFrame(instantane.get("judo_data", {}))
+        if not judo_data.empty:
+            moteur._inserer_lot(judo_data)
+        if "combats" in instantane:  # instantané en colonnes : le journal des combats est repris tel quel
+            moteur.combats = JournalCombats.depuis_arrow(instantane["combats"])
+            moteur._matchs = None
+        else:
+            # Les matchs annulés (marqués ``annule``) restent connus du journal des combats
+            matchs = instantane.get("matchs", [])
+            moteur.combats.ajouter_lot(matchs)
+            moteur.matchs.update((match["id"], match) for match in matchs if not match.get("annule"))
+        moteur.seq = instantane.get("journal_seq", 0)
+        return moteur
+
+    @classmethod
+    def recalculer(cls, instantane, evenements):
+        """Reconstruit le moteur depuis zéro (chemin de vérification)."""
+        moteur = cls.depuis_instantane(instantane)
+        for evenement in evenements:
+            moteur.appliquer(evenement)
+        return moteur
+
+    def exporter(self):
+        return {
+            "judo_data": self.judo_data.to_dict(),
+            "classement_equipes": self.classement_equipes.to_dict(),
+            "classement_joueurs": self.classement_joueurs.to_dict(),
+            "matchs": self.combats.matchs(annules=True),
+            "categories": list(self.table_categories),
+            "championnat": self.championnat,
+            "saison": self.saison,
+        }
+
+    # Événements
+
+    def appliquer(self, evenement):
+        with self.verrou:
+            type_evenement = evenement["type"]
+            if type_evenement == "ajout":
+                self.ajouter_joueur(evenement["equipe"], evenement["joueur"], evenement["poids"],
+                                    evenement["victoires"], evenement["defaites"])
+            elif type_evenement == "match":
+                self.enregistrer_match(evenement["id"], evenement["joueur1"], evenement["joueur2"],
+                                       evenement["vainqueur"], evenement["points"], evenement.get("date"))
+            elif type_evenement == "matchs":
+                self.enregistrer_matchs(evenement["lignes"])
+            elif type_evenement == "annulation":
+                self.annuler_match(evenement["match"])
+            elif type_evenement == "suppression":
+                self.supprimer_joueur(evenement["joueur"])
+            elif type_evenement == "modification":
+                self.modifier_joueur(evenement["joueur"], evenement["equipe"], evenement["poids"],
+                                     evenement["victoires"], evenement["defaites"])
+            elif type_evenement == "import":
+                self.importer(pd.DataFrame(evenement["lignes"]))
+            elif type_evenement == "saison":
+                if evenement.get("apres", self.seq) != self.seq:
+                    raise ValueError("Des événements ont été enregistrés depuis l'archivage de la saison.")
+                self.ouvrir_saison(evenement["championnat"], evenement["saison"], evenement["garder_joueurs"],
+                                   evenement.get("categories"))
+            else:
+                raise ValueError(f"Type d'événement inconnu : {type_evenement}")
+            self.version += 1
+            self.seq = evenement.get("seq", self.seq)
+
+    def remplacer(self, autre):
+        """Adopte l'état d'un moteur rechargé, en gardant le même objet (et son verrou)."""
+        with self.verrou:
+            self.__dict__.update({cle: valeur for cle, valeur in autre.__dict__.items() if cle != "verrou"})
+
+    def prendre_modifications(self):
+        """Renvoie puis oublie les joueurs et équipes touchés depuis le dernier appel."""
+        modifications = (self._joueurs_modifies, self._equipes_modifiees)
+        self._joueurs_modifies, self._equipes_modifiees = set(), set()
+        return modifications
+
+    def ajouter_joueur(self, equipe, joueur, poids, victoires=0, defaites=0):
+        self._inserer_joueur(equipe, joueur, borner('Poids', poids), borner('Victoires', victoires),
+                             borner('Defaites', defaites), 0)
+
+    def importer(self, lignes):
+        """Ajoute un lot de joueurs et met à jour les équipes en une seule agrégation."""
+        lignes = lignes[[joueur not in self.index for joueur in lignes['Joueur']]].drop_duplicates('Joueur')
+        if 'Points' not in lignes:  # événements enregistrés avant l'import des points
+            lignes = lignes.assign(Points=0)
+        if not lignes.empty:
+            self._inserer_lot(lignes)
+
+    def ouvrir_saison(self, championnat, saison, garder_joueurs=True, table_categories=None):
+        """Repart de zéro pour une nouvelle saison : combats effacés, joueurs gardés avec des compteurs nuls.
+
+        Avec ``table_categories``, les joueurs gardés sont reclassés selon cette table.
+        """
+        table_categories = tuple(table_categories or self.table_categories)
+        if table_categories not in TABLES:
+            raise ValueError(f"Table de catégories inconnue : {table_categories}")
+        suivant = MoteurClassement(table_categories, championnat, saison)
+        if garder_joueurs and self._lignes:
+            suivant._inserer_lot(self.judo_data[['Id', 'Equipe', 'Joueur', 'Poids']].assign(
+                Victoires=0, Defaites=0, Points=0))
+        suivant._prochain_id = self._prochain_id
+        suivant.seq = self.seq
+        # Tout le monde a changé : les stockages réécrivent chaque joueur et chaque équipe
+        suivant._joueurs_modifies = set(self.index.noms) | set(suivant.index.noms)
+        suivant._equipes_modifiees = set(self.equipes) | set(suivant.equipes)
+        self.remplacer(suivant)
+
+    def _inserer_lot(self, lignes):
+        """Insère des joueurs nouveaux (avec leurs points) : colonnes calculées et équipes agrégées d'un bloc."""
+        verifier_bornes(lignes)
+        if 'Id' not in lignes:
+            lignes = lignes.assign(Id=range(self._prochain_id, self._prochain_id + len(lignes)))
+        self._prochain_id = max(self._prochain_id, int(lignes['Id'].max()) + 1)
+        lignes = lignes.assign(
+            Equipe=interner(lignes['Equipe']),
+            Performance=(lignes['Victoires'] / (lignes['Victoires'] + lignes['Defaites'])).fillna(0),
+            Categorie=categoriser(lignes['Poids'], self.table_categories),
+        )
+        # Colonnes converties en listes Python une fois pour toutes (plus rapide que to_dict)
+        colonnes = {colonne: lignes[colonne].tolist() for colonne in COLONNES["judo_data"]}
+        self.index.ajouter_lot(colonnes['Joueur'], colonnes['Equipe'])
+        self._joueurs_modifies.update(colonnes['Joueur'])
+        noms_colonnes = tuple(colonnes)
+        nouvelles = [dict(zip(noms_colonnes, valeurs)) for valeurs in zip(*colonnes.values())]
+        self._lignes.extend(nouvelles)
+        if len(self.palmares):
+            self.palmares.placer_lot(dict(zip(colonnes['Joueur'], nouvelles)))
+        else:  # chargement : clés tirées des colonnes, déjà dans l'ordre du classement pour un instantané
+            self.palmares.charger(colonnes['Joueur'], cles_joueurs(colonnes),
+                                  list(zip(*(colonnes[groupe] for groupe in self.palmares.groupes))))
+        totaux = lignes.groupby('Equipe', sort=False)[['Points', 'Victoires']].sum()
+        lot = {}
+        for equipe, points, victoires in zip(totaux.index.tolist(), totaux['Points'].tolist(),
+                                             totaux['Victoires'].tolist()):
+            stats = lot[equipe] = self.equipes.setdefault(equipe, {'Points_Totaux': 0, 'Victoires_Totaux': 0})
+            stats['Points_Totaux'] += points
+            stats['Victoires_Totaux'] += victoires
+        self._equipes_modifiees.update(lot)
+        self.palmares_equipes.placer_lot(lot)
+        totaux = lignes.groupby(['Categorie', 'Equipe'], sort=False, observed=True).agg(
+            Points=('Points', 'sum'), Victoires=('Victoires', 'sum'), Membres=('Joueur', 'size')).reset_index()
+        lots = {}
+        for categorie, equipe, points, victoires, membres in zip(
+                *(totaux[colonne].tolist() for colonne in ('Categorie', 'Equipe', 'Points', 'Victoires', 'Membres'))):
+            stats = self.equipes_par_categorie.setdefault(categorie, {}).setdefault(
+                equipe, {'Points_Totaux': 0, 'Victoires_Totaux': 0, 'Membres': 0})
+            stats['Points_Totaux'] += points
+            stats['Victoires_Totaux'] += victoires
+            stats['Membres'] += membres
+            lots.setdefault(categorie, {})[equipe] = stats
+        for categorie, lot in lots.items():
+            self._palmares_categorie(categorie).placer_lot(lot)
+
+    def enregistrer_match(self, match_id, joueur1, joueur2, vainqueur, points, date=None):
+        if joueur1 == joueur2:
+            raise ValueError("Les deux joueurs doivent être différents !")
+        if vainqueur not in (joueur1, joueur2, "Égalité"):
+            raise ValueError("Le vainqueur doit être l'un des deux joueurs.")
+        self.matchs[match_id] = {"id": match_id, "joueur1": joueur1, "joueur2": joueur2,
+                                 "vainqueur": vainqueur, "points": points, "date": date or 0}
+        self._compter_match(self.matchs[match_id], 1)
+        self.combats.ajouter(match_id, joueur1, joueur2, vainqueur, points, date)
+
+    def enregistrer_matchs(self, lignes):
+        """Enregistre un lot de combats (colonnes de ``evenements.matchs``) ; renvoie le nombre retenu.
+
+        Un identifiant déjà connu (combat enregistré ou annulé) est ignoré :
+        renvoyer le même lot ne compte rien deux fois. Chaque athlète, chaque
+        équipe et chaque palmarès n'est mis à jour qu'une fois par lot.
+        """
+        matchs, vus = [], set()
+        for match_id, joueur1, joueur2, vainqueur, points, date in zip(
+                lignes['id'], lignes['joueur1'], lignes['joueur2'], lignes['vainqueur'], lignes['points'],
+                lignes['date']):
+            if match_id in self.combats or match_id in vus:
+                continue
+            if joueur1 == joueur2 or vainqueur not in (joueur1, joueur2, "Égalité"):
+                raise ValueError(f"Combat {match_id} invalide.")
+            vus.add(match_id)
+            matchs.append({"id": match_id, "joueur1": joueur1, "joueur2": joueur2,
+                           "vainqueur": vainqueur, "points": points, "date": date or 0})
+        if not matchs:
+            return 0
+        self.matchs.update((match["id"], match) for match in matchs)
+        self.combats.ajouter_lot(matchs)
+
+        # Bilan du lot par athlète, puis par équipe et par (catégorie, équipe)
+        bilans = {}
+        for match in matchs:
+            if match["vainqueur"] == "Égalité":
+                continue
+            perdant = match["joueur2"] if match["vainqueur"] == match["joueur1"] else match["joueur1"]
+            bilan = bilans.setdefault(match["vainqueur"], [0, 0, 0])
+            bilan[0] += 1
+            bilan[2] += match["points"]
+            bilans.setdefault(perdant, [0, 0, 0])[1] += 1
+        equipes, categories = {}, {}
+        for joueur, (victoires, defaites, points) in bilans.items():
+            if joueur not in self.index:
+                continue  # joueur supprimé entre la saisie et l'enregistrement
+            self._joueurs_modifies.add(joueur)
+            stats = self.joueur(joueur)
+            stats['Victoires'] += victoires
+            stats['Defaites'] += defaites
+            stats['Points'] += points
+            stats['Performance'] = performance(stats['Victoires'], stats['Defaites'])
+            self.palmares.placer(joueur, stats)
+            for cumul, cle in ((equipes, stats['Equipe']), (categories, (stats['Categorie'], stats['Equipe']))):
+                total = cumul.setdefault(cle, [0, 0])
+                total[0] += points
+                total[1] += victoires
+        # Les équipes touchées ont toutes un membre inscrit : elles existent déjà
+        lot = {}
+        for equipe, (points, victoires) in equipes.items():
+            stats = lot[equipe] = self.equipes[equipe]
+            stats['Points_Totaux'] += points
+            stats['Victoires_Totaux'] += victoires
+        self._equipes_modifiees.update(lot)
+        self.palmares_equipes.placer_lot(lot)
+        lots = {}
+        for (categorie, equipe), (points, victoires) in categories.items():
+            stats = self.equipes_par_categorie[categorie][equipe]
+            stats['Points_Totaux'] += points
+            stats['Victoires_Totaux'] += victoires
+            lots.setdefault(categorie, {})[equipe] = stats
+        for categorie, lot in lots.items():
+            self.palmares_categories[categorie].placer_lot(lot)
+        return len(matchs)
+
+    def annuler_match(self, match_id):
+        """Retire la contribution d'un match aux classements, sans descendre un compteur sous zéro."""
+        if match_id not in self.matchs:
+            raise ValueError(f"Combat inconnu ou déjà annulé : {match_id}")
+        self._compter_match(self.matchs.pop(match_id), -1)
+        self.combats.annuler(match_id)
+
+    def supprimer_joueur(self, joueur):
+        stats = self.joueur(joueur)
+        self._joueurs_modifies.add(joueur)
+        position, derniere = self.index.retirer(joueur, stats['Equipe'], self._lignes[-1]['Equipe'])
+        self._lignes[position] = self._lignes[derniere]
+        self._lignes.pop()
+        self.palmares.retirer(joueur)
+        self._ajuster_equipe(stats['Equipe'], -stats['Points'], -stats['Victoires'])
+        self._ajuster_equipe_categorie(stats['Categorie'], stats['Equipe'], -stats['Points'], -stats['Victoires'], -1)
+
+    def modifier_joueur(self, joueur, equipe, poids, victoires, defaites):
+        stats = self.joueur(joueur)
+        equipe, poids = sys.intern(equipe), borner('Poids', poids)
+        victoires, defaites = borner('Victoires', victoires), borner('Defaites', defaites)
+        self._joueurs_modifies.add(joueur)
+        ancienne_equipe = stats['Equipe']
+        if ancienne_equipe != equipe:
+            self.index.changer_equipe(joueur, ancienne_equipe, equipe)
+        # Le joueur emporte ses points et victoires dans sa nouvelle équipe
+        self._ajuster_equipe(ancienne_equipe, -stats['Points'], -stats['Victoires'])
+        self._ajuster_equipe_categorie(stats['Categorie'], ancienne_equipe, -stats['Points'], -stats['Victoires'], -1)
+        stats.update(Equipe=equipe, Poids=poids, Victoires=victoires, Defaites=defaites,
+                     Performance=performance(victoires, defaites),
+                     Categorie=categorie_poids(poids, self.table_categories))
+        self.palmares.placer(joueur, stats)
+        self._ajuster_equipe(equipe, stats['Points'], victoires)
+        self._ajuster_equipe_categorie(stats['Categorie'], equipe, stats['Points'], victoires, 1)
+
+    # Mises à jour incrémentales
+
+    def _inserer_joueur(self, equipe, joueur, poids, victoires, defaites, points):
+        self.index.ajouter(joueur, equipe)
+        self._joueurs_modifies.add(joueur)
+        equipe = sys.intern(equipe)
+        self._lignes.append({
+            'Id': self._prochain_id, 'Joueur': joueur, 'Equipe': equipe, 'Poids': poids,
+            'Victoires': victoires, 'Defaites': defaites, 'Points': points, 'Performance': performance(victoires, defaites),
+            'Categorie': categorie_poids(poids, self.table_categories),
+        })
+        self._prochain_id += 1
+        self.palmares.placer(joueur, self._lignes[-1])
+        self._ajuster_equipe(equipe, points, victoires)
+        self._ajuster_equipe_categorie(self._lignes[-1]['Categorie'], equipe, points, victoires, 1)
+
+    def _compter_match(self, match, signe):
+        if match["vainqueur"] == "Égalité":
+            return
+        for joueur in (match["joueur1"], match["joueur2"]):
+            if joueur not in self.index:
+                continue  # joueur supprimé depuis : sa contribution est déjà partie
+            if joueur == match["vainqueur"]:
+                self._ajuster_joueur(joueur, victoires=signe, points=signe * match["points"])
+            else:
+                self._ajuster_joueur(joueur, defaites=signe)
+
+    def _ajuster_joueur(self, joueur, victoires=0, defaites=0, points=0):
+        stats = self.joueur(joueur)
+        self._joueurs_modifies.add(joueur)
+        # Un compteur abaissé à la main (modification) ne passe pas sous zéro quand on annule un match
+        victoires = max(victoires, -stats['Victoires'])
+        defaites = max(defaites, -stats['Defaites'])
+        points = max(points, -stats['Points'])
+        stats['Victoires'] += victoires
+        stats['Defaites'] += defaites
+        stats['Points'] += points
+        stats['Performance'] = performance(stats['Victoires'], stats['Defaites'])
+        self.palmares.placer(joueur, stats)
+        self._ajuster_equipe(stats['Equipe'], points, victoires)
+        self._ajuster_equipe_categorie(stats['Categorie'], stats['Equipe'], points, victoires)
+
+    def _ajuster_equipe(self, equipe, points, victoires):
+        self._equipes_modifiees.add(equipe)
+        if equipe not in self.index.membres:
+            self.equipes.pop(equipe, None)  # plus aucun membre : l'équipe disparaît
+            self.palmares_equipes.retirer(equipe)
+            return
+        stats = self.equipes.setdefault(equipe, {'Points_Totaux': 0, 'Victoires_Totaux': 0})
+        stats['Points_Totaux'] += points
+        stats['Victoires_Totaux'] += victoires
+        self.palmares_equipes.placer(equipe, stats)
+
+    def _palmares_categorie(self, categorie):
+        palmares = self.palmares_categories.get(categorie)
+        if palmares is None:
+            palmares = self.palmares_categories[categorie] = Palmares(cle_equipe)
+        return palmares
+
+    def _ajuster_equipe_categorie(self, categorie, equipe, points, victoires, membres=0):
+        """Totaux d'une équipe restreints aux membres d'une catégorie."""
+        equipes = self.equipes_par_categorie.setdefault(categorie, {})
+        palmares = self._palmares_categorie(categorie)
+        stats = equipes.setdefault(equipe, {'Points_Totaux': 0, 'Victoires_Totaux': 0, 'Membres': 0})
+        stats['Points_Totaux'] += points
+        stats['Victoires_Totaux'] += victoires
+        stats['Membres'] += membres
+        if stats['Membres']:
+            palmares.placer(equipe, stats)
+            return
+        del equipes[equipe]
+        palmares.retirer(equipe)
+        if not equipes:
+            del self.equipes_par_categorie[categorie], self.palmares_categories[categorie]
+
+    # Vues matérialisées
+
+    def _vue(self, table, construire):
+        with self.verrou:
+            vue = self._vues.get(table)
+            if vue is None or vue[0] != self.version:
+                vue = (self.version, construire())
+                self._vues[table] = vue
+            return vue[1]
+
+    @property
+    def judo_data(self):
+        return self._vue("judo_data", lambda: construire(
+            {colonne: [ligne[colonne] for ligne in self._lignes] for colonne in COLONNES["judo_data"]},
+            self.table_categories))
+
+    @property
+    def classement_equipes(self):
+        return self._vue("classement_equipes", lambda: typer(pd.DataFrame(
+            [dict(stats, Equipe=equipe) for equipe, stats in self.equipes.items()],
+            columns=COLONNES["classement_equipes"])))
+
+    @property
+    def classement_joueurs(self):
+        return self._vue("classement_joueurs", lambda: self.judo_data[COLONNES["classement_joueurs"]])
+
+    # Classements ordonnés (palmarès), podium et résumé
+
+    def classement(self, debut=0, taille=None, categorie=None, equipe=None):
+        """Joueurs classés (points, victoires, performance, nom), sans retrier la table."""
+        with self.verrou:
+            noms = self.palmares.noms(debut, taille, Categorie=categorie, Equipe=equipe)
+            lignes = [dict(self.joueur(joueur)) for joueur in noms]
+        return typer(pd.DataFrame(lignes, columns=COLONNES["classement_joueurs"]))
+
+    def classement_des_equipes(self, debut=0, taille=None, categorie=None):
+        """Équipes classées ; avec ``categorie``, sur les seuls membres de cette catégorie."""
+        with self.verrou:
+            palmares, equipes = self._palmares_equipes(categorie)
+            lignes = [dict(equipes[equipe], Equipe=equipe) for equipe in palmares.noms(debut, taille)]
+        return typer(pd.DataFrame(lignes, columns=COLONNES["classement_equipes"]))
+
+    def _palmares_equipes(self, categorie):
+        if categorie is None:
+            return self.palmares_equipes, self.equipes
+        return self.palmares_categories.get(categorie, Palmares(cle_equipe)), self.equipes_par_categorie.get(categorie, {})
+
+    def page_classement(self, debut=0, taille=TAILLE_PAGE, categorie=None, equipe=None, recherche=None, tri="rang"):
+        """(nombre de joueurs retenus, page du classement avec le rang) : seule la page est construite."""
+        with self.verrou:
+            total, rangs = self.palmares.page(debut, taille, recherche, tri, Categorie=categorie, Equipe=equipe)
+            lignes = [dict(self.joueur(joueur)) for _, joueur in rangs]
+        page = typer(pd.DataFrame(lignes, columns=COLONNES["classement_joueurs"]))
+        page.insert(0, 'Rang', [rang for rang, _ in rangs])
+        return total, page
+
+    def page_classement_equipes(self, debut=0, taille=TAILLE_PAGE, categorie=None, recherche=None, tri="rang"):
+        with self.verrou:
+            palmares, equipes = self._palmares_equipes(categorie)
+            total, rangs = palmares.page(debut, taille, recherche, tri)
+            lignes = [dict(equipes[equipe], Equipe=equipe) for _, equipe in rangs]
+        page = typer(pd.DataFrame(lignes, columns=COLONNES["classement_equipes"]))
+        page.insert(0, 'Rang', [rang for rang, _ in rangs])
+        return total, page
+
+    def rang(self, joueur, categorie=None, equipe=None):
+        with self.verrou:
+            return self.palmares.rang(joueur, Categorie=categorie, Equipe=equipe)
+
+    def podium_equipes(self, n=3):
+        return self.classement_des_equipes(taille=n)
+
+    def podium_joueurs(self, n=3):
+        return self.classement(taille=n)
+
+    def classement_au(self, date):
+        """Classement des combats à une date donnée (hors compteurs saisis à la main)."""
+        with self.verrou:
+            bilan = self.combats.bilan_au(date)
+            bilan.insert(1, 'Equipe', [self.joueur(j)['Equipe'] if j in self else None for j in bilan['Joueur']])
+        return bilan.sort_values(by=['Points', 'Victoires'], ascending=False, ignore_index=True)
+
+    def resume(self):
+        with self.verrou:
+            return self._resume()
+
+    def _resume(self):
+        judo_data = self.judo_data
+        return {
+            "joueurs": len(judo_data),
+            "equipes": len(self.equipes),
+            "total_combats": int(judo_data['Victoires'].sum() + judo_data['Defaites'].sum()),
+            "points": int(judo_data['Points'].sum()),
+            "meilleur_joueur": None if judo_data.empty else self.podium_joueurs(1).iloc[0],
+            "meilleure_equipe": None if not self.equipes else self.podium_equipes(1).iloc[0],
+        }
+
+    def verifier(self):
+        """Compare les totaux d'équipe incrémentaux (globaux et par catégorie) à un recalcul complet."""
+        attendus = {}
+        for stats in self._lignes:
+            equipe = attendus.setdefault(stats['Equipe'], {'Points_Totaux': 0, 'Victoires_Totaux': 0})
+            equipe['Points_Totaux'] += stats['Points']
+            equipe['Victoires_Totaux'] += stats['Victoires']
+            equipe = attendus.setdefault((stats['Equipe'], stats['Categorie']),
+                                         {'Points_Totaux': 0, 'Victoires_Totaux': 0, 'Membres': 0})
+            equipe['Points_Totaux'] += stats['Points']
+            equipe['Victoires_Totaux'] += stats['Victoires']
+            equipe['Membres'] += 1
+        obtenus = dict(self.equipes)
+        obtenus.update(((equipe, categorie), stats) for categorie, equipes in self.equipes_par_categorie.items()
+                       for equipe, stats in equipes.items())
+        return [equipe for equipe in attendus.keys() | obtenus.keys()
+                if attendus.get(equipe) != obtenus.get(equipe)]
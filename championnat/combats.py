@@ -0,0 +1,340 @@
+"""Journal des combats en colonnes, pour les requêtes historiques.
+
+Chaque combat enregistré est conservé (adversaires, vainqueur, technique,
+date) dans des tableaux NumPy typés : les noms sont encodés en entiers
+(dictionnaire), les dates en secondes. Deux index accompagnent les colonnes :
+par athlète (lignes de ses combats) et par date (ordre chronologique). Les
+requêtes — face-à-face, forme, bilan par technique, classement à une date —
+ne parcourent ainsi que les lignes utiles, même sur plusieurs saisons.
+"""
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+from championnat.evenements import TECHNIQUES
+
+CAPACITE_INITIALE = 1024
+BLOC_CUMUL = 32_768  # taille des blocs dont les totaux cumulés sont gardés pour bilan_au
+SANS_VAINQUEUR = -1  # égalité
+
+
+def secondes(date):
+    """Date (datetime, date, Timestamp ou chaîne) -> secondes depuis l'époque."""
+    return pd.Timestamp(date).timestamp()
+
+
+class JournalCombats:
+    def __init__(self):
+        self.noms = []       # code -> Joueur
+        self.codes = {}      # Joueur -> code
+        self.ids = []        # ligne -> id du match
+        self.lignes = {}     # id du match -> ligne
+        self._par_joueur = {}  # code -> [lignes] ; None : à reconstruire (chargement en bloc)
+        self._n = 0
+        self._alloc(CAPACITE_INITIALE)
+        self._trie = True    # les combats arrivent en général dans l'ordre chronologique
+        self._ordre = None   # (nombre de lignes, argsort des dates) quand ce n'est pas le cas
+        self._controles = []  # bloc k -> totaux par athlète sur les lignes [0, (k + 1) * BLOC_CUMUL)
+
+    def _alloc(self, capacite):
+        anciennes = getattr(self, "_colonnes", None)
+        self._colonnes = {
+            "joueur1": np.empty(capacite, np.int32),
+            "joueur2": np.empty(capacite, np.int32),
+            "vainqueur": np.empty(capacite, np.int32),
+            "perdant": np.empty(capacite, np.int32),
+            "points": np.empty(capacite, np.int8),
+            "ts": np.empty(capacite, np.float64),
+            "annule": np.empty(capacite, np.bool_),
+        }
+        if anciennes is not None:
+            for nom, colonne in anciennes.items():
+                self._colonnes[nom][:self._n] = colonne[:self._n]
+
+    def __len__(self):
+        return self._n
+
+    def __contains__(self, match_id):
+        return match_id in self.lignes
+
+    def colonne(self, nom):
+        return self._colonnes[nom][:self._n]
+
+    def code(self, joueur):
+        code = self.codes.get(joueur)
+        if code is None:
+            code = self.codes[joueur] = len(self.noms)
+            self.noms.append(joueur)
+        return code
+
+    # Écriture
+
+    def ajouter(self, match_id, joueur1, joueur2, vainqueur, points, ts=0.0):
+        if self._n == len(self._colonnes["ts"]):
+            self._alloc(2 * self._n)
+        ligne = self._n
+        code1, code2 = self.code(joueur1), self.code(joueur2)
+        if vainqueur == joueur1:
+            gagnant, perdant = code1, code2
+        elif vainqueur == joueur2:
+            gagnant, perdant = code2, code1
+        else:
+            gagnant = perdant = SANS_VAINQUEUR
+        c = self._colonnes
+        c["joueur1"][ligne], c["joueur2"][ligne] = code1, code2
+        c["vainqueur"][ligne], c["perdant"][ligne] = gagnant, perdant
+        c["points"][ligne], c["ts"][ligne], c["annule"][ligne] = points, ts or 0.0, False
+        if ligne and c["ts"][ligne] < c["ts"][ligne - 1]:
+            self._trie = False
+        if self._par_joueur is not None:
+            self._par_joueur.setdefault(code1, []).append(ligne)
+            self._par_joueur.setdefault(code2, []).append(ligne)
+        self.ids.append(match_id)
+        self.lignes[match_id] = ligne
+        self._n += 1
+
+    def ajouter_lot(self, matchs):
+        """Ajoute d'un bloc des matchs (dictionnaires ``id``, ``joueur1``, ``joueur2``, ``vainqueur``, ``points``, ``date``,
+        et ``annule`` facultatif : un combat annulé reste connu sans compter dans les requêtes)."""
+        n = len(matchs)
+        if not n:
+            return
+        while self._n + n > len(self._colonnes["ts"]):
+            self._alloc(2 * len(self._colonnes["ts"]))
+        joueurs1 = np.array([m["joueur1"] for m in matchs], dtype=object)
+        joueurs2 = np.array([m["joueur2"] for m in matchs], dtype=object)
+        vainqueurs = np.array([m["vainqueur"] for m in matchs], dtype=object)
+        # Codes attribués dans le même ordre qu'en ajoutant les combats un à un
+        codes = np.fromiter(map(self.code, chain.from_iterable(zip(joueurs1, joueurs2))), np.int32, 2 * n)
+        code1, code2 = codes[0::2], codes[1::2]
+        gagne1, gagne2 = vainqueurs == joueurs1, vainqueurs == joueurs2
+        ts = np.fromiter((m.get("date") or 0.0 for m in matchs), np.float64, n)
+        debut, c = self._n, self._colonnes
+        lignes = slice(debut, debut + n)
+        c["joueur1"][lignes], c["joueur2"][lignes] = code1, code2
+        c["vainqueur"][lignes] = np.where(gagne1, code1, np.where(gagne2, code2, SANS_VAINQUEUR))
+        c["perdant"][lignes] = np.where(gagne1, code2, np.where(gagne2, code1, SANS_VAINQUEUR))
+        c["points"][lignes] = np.fromiter((m["points"] for m in matchs), np.int8, n)
+        c["ts"][lignes] = ts
+        c["annule"][lignes] = np.fromiter((bool(m.get("annule")) for m in matchs), np.bool_, n)
+        if (debut and ts[0] < c["ts"][debut - 1]) or (np.diff(ts) < 0).any():
+            self._trie = False
+        if not debut:
+            self._par_joueur = None  # chargement en bloc : index reconstruit à la première requête
+        elif self._par_joueur is not None:
+            par_joueur = self._par_joueur
+            for ligne, premier, second in zip(range(debut, debut + n), code1.tolist(), code2.tolist()):
+                par_joueur.setdefault(premier, []).append(ligne)
+                par_joueur.setdefault(second, []).append(ligne)
+        ids = [m["id"] for m in matchs]
+        self.ids.extend(ids)
+        self.lignes.update(zip(ids, range(debut, debut + n)))
+        self._n += n
+
+    def annuler(self, match_id):
+        """Le combat reste dans le journal mais ne compte plus dans aucune requête."""
+        ligne = self.lignes[match_id]
+        self._colonnes["annule"][ligne] = True
+        del self._controles[ligne // BLOC_CUMUL:]
+
+    # Index
+
+    def ordre_chronologique(self):
+        if self._trie:
+            return np.arange(self._n)
+        if self._ordre is None or self._ordre[0] != self._n:
+            self._ordre = (self._n, np.argsort(self.colonne("ts"), kind="stable"))
+        return self._ordre[1]
+
+    def _lignes_par_joueur(self):
+        if self._par_joueur is None:
+            n = self._n
+            codes = np.concatenate([self.colonne("joueur1"), self.colonne("joueur2")])
+            lignes = np.concatenate([np.arange(n), np.arange(n)])
+            ordre = np.lexsort((lignes, codes))
+            codes, lignes = codes[ordre], lignes[ordre]
+            bornes = np.flatnonzero(np.diff(codes)) + 1
+            self._par_joueur = dict(zip(codes[np.r_[0, bornes]].tolist() if n else [],
+                                        (bloc.tolist() for bloc in np.split(lignes, bornes))))
+        return self._par_joueur
+
+    def combats_de(self, joueur):
+        """Lignes valides des combats d'un athlète, dans l'ordre chronologique."""
+        code = self.codes.get(joueur)
+        if code is None:
+            return np.empty(0, np.int64)
+        lignes = np.asarray(self._lignes_par_joueur().get(code, []))
+        lignes = lignes[~self._colonnes["annule"][lignes]]
+        return lignes[np.argsort(self._colonnes["ts"][lignes], kind="stable")]
+
+    def tableau(self, lignes):
+        c = self._colonnes
+        noms = np.asarray(self.noms + ["Égalité"], dtype=object)  # code -1 -> "Égalité"
+        points = c["points"][lignes]
+        return pd.DataFrame({
+            "Id": [self.ids[ligne] for ligne in lignes],
+            "Date": pd.to_datetime(c["ts"][lignes], unit="s"),
+            "Joueur1": noms[c["joueur1"][lignes]],
+            "Joueur2": noms[c["joueur2"][lignes]],
+            "Vainqueur": noms[c["vainqueur"][lignes]],
+            "Technique": pd.Series(points).map(TECHNIQUES).fillna("Égalité").values,
+            "Points": points.astype(int),
+        })
+
+    # Requêtes
+
+    def face_a_face(self, joueur1, joueur2):
+        """Bilan et liste des combats entre deux athlètes."""
+        lignes = self.combats_de(joueur1)
+        code2 = self.codes.get(joueur2, SANS_VAINQUEUR - 1)
+        c = self._colonnes
+        lignes = lignes[(c["joueur1"][lignes] == code2) | (c["joueur2"][lignes] == code2)]
+        vainqueurs = c["vainqueur"][lignes]
+        return {
+            "victoires": {joueur1: int((vainqueurs == self.codes.get(joueur1)).sum()),
+                          joueur2: int((vainqueurs == code2).sum())},
+            "nuls": int((vainqueurs == SANS_VAINQUEUR).sum()),
+            "combats": self.tableau(lignes),
+        }
+
+    def forme(self, joueur, n=5):
+        """Les ``n`` derniers combats d'un athlète, du plus récent au plus ancien."""
+        lignes = self.combats_de(joueur)[-n:][::-1]
+        c = self._colonnes
+        code = self.codes.get(joueur)
+        adversaires = np.where(c["joueur1"][lignes] == code, c["joueur2"][lignes], c["joueur1"][lignes])
+        vainqueurs = c["vainqueur"][lignes]
+        tableau = self.tableau(lignes)
+        tableau.insert(1, "Adversaire", np.asarray(self.noms, dtype=object)[adversaires])
+        tableau.insert(2, "Resultat", np.select([vainqueurs == code, vainqueurs == SANS_VAINQUEUR],
+                                                ["V", "N"], default="D"))
+        return tableau[["Id", "Date", "Adversaire", "Resultat", "Technique", "Points"]]
+
+    def techniques(self, joueur=None):
+        """Victoires et points par technique, pour un athlète ou tout le championnat."""
+        c = self._colonnes
+        if joueur is None:
+            decisifs = ~self.colonne("annule") & (self.colonne("vainqueur") != SANS_VAINQUEUR)
+            points = self.colonne("points")[decisifs]
+        else:
+            lignes = self.combats_de(joueur)
+            points = c["points"][lignes[c["vainqueur"][lignes] == self.codes.get(joueur, SANS_VAINQUEUR)]]
+        valeurs = np.array(list(TECHNIQUES))
+        victoires = np.bincount(points, minlength=valeurs.max() + 1)[valeurs]
+        return pd.DataFrame({"Technique": list(TECHNIQUES.values()), "Victoires": victoires,
+                             "Points": victoires * valeurs})
+
+    def _compter(self, lignes):
+        """Victoires, défaites, nuls et points par athlète (matrice n x 4) sur ``lignes``."""
+        c = {nom: colonne[lignes] for nom, colonne in self._colonnes.items()}
+        valides = ~c["annule"]
+        decisifs = valides & (c["vainqueur"] != SANS_VAINQUEUR)
+        nuls = valides & ~decisifs
+        n = len(self.noms)
+        # Un seul comptage (athlète, points) donne victoires et points sans pondération flottante
+        largeur = max(TECHNIQUES) + 1
+        par_points = np.bincount(c["vainqueur"][decisifs].astype(np.int64) * largeur + c["points"][decisifs],
+                                 minlength=n * largeur).reshape(n, largeur)
+        return np.column_stack([
+            par_points.sum(axis=1),
+            np.bincount(c["perdant"][decisifs], minlength=n),
+            np.bincount(c["joueur1"][nuls], minlength=n) + np.bincount(c["joueur2"][nuls], minlength=n),
+            par_points @ np.arange(largeur),
+        ])
+
+    def _cumul(self, blocs):
+        """Totaux sur les ``blocs`` premiers blocs de lignes, mis en cache (ordre chronologique)."""
+        while len(self._controles) < blocs:
+            k = len(self._controles)
+            totaux = self._compter(slice(k * BLOC_CUMUL, (k + 1) * BLOC_CUMUL))
+            if k:
+                precedent = self._controles[-1]
+                totaux[:len(precedent)] += precedent
+            self._controles.append(totaux)
+        n = len(self.noms)
+        if not blocs:
+            return np.zeros((n, 4), np.int64)
+        totaux = self._controles[blocs - 1]
+        return np.vstack([totaux, np.zeros((n - len(totaux), 4), np.int64)])
+
+    def bilan_au(self, date):
+        """Victoires, défaites, nuls et points de combat de chaque athlète à une date."""
+        if self._trie:
+            # Cas courant : colonnes déjà chronologiques, cumul en cache + un bloc partiel
+            fin = np.searchsorted(self.colonne("ts"), secondes(date), side="right")
+            blocs = fin // BLOC_CUMUL
+            totaux = self._cumul(blocs) + self._compter(slice(blocs * BLOC_CUMUL, fin))
+        else:
+            ordre = self.ordre_chronologique()
+            totaux = self._compter(ordre[:np.searchsorted(self.colonne("ts")[ordre], secondes(date), side="right")])
+        actifs = np.flatnonzero(totaux[:, :3].sum(axis=1))
+        return pd.DataFrame({
+            "Joueur": np.asarray(self.noms, dtype=object)[actifs],
+            "Victoires": totaux[actifs, 0],
+            "Defaites": totaux[actifs, 1],
+            "Nuls": totaux[actifs, 2],
+            "Points": totaux[actifs, 3],
+        })
+
+    # Export colonne
+
+    def vers_arrow(self):
+        import pyarrow as pa
+
+        c = {nom: self.colonne(nom) for nom in self._colonnes}
+        noms = pa.array(self.noms, pa.string())
+        return pa.table({
+            "id": pa.array(self.ids, pa.string()),
+            "joueur1": pa.DictionaryArray.from_arrays(pa.array(c["joueur1"]), noms),
+            "joueur2": pa.DictionaryArray.from_arrays(pa.array(c["joueur2"]), noms),
+            "vainqueur": pa.DictionaryArray.from_arrays(
+                pa.array(c["vainqueur"], mask=c["vainqueur"] == SANS_VAINQUEUR), noms),
+            "points": pa.array(c["points"]),
+            "ts": pa.array(c["ts"]),
+            "annule": pa.array(c["annule"]),
+        })
+
+    def matchs(self, annules=False):
+        """Combats non annulés, sous la forme des matchs du moteur ; tous, marqués ``annule``, avec ``annules``."""
+        c = self._colonnes
+        lignes = np.arange(self._n) if annules else np.flatnonzero(~self.colonne("annule"))
+        noms = np.asarray(self.noms + ["Égalité"], dtype=object)
+        colonnes = zip([self.ids[ligne] for ligne in lignes.tolist()], noms[c["joueur1"][lignes]].tolist(),
+                       noms[c["joueur2"][lignes]].tolist(), noms[c["vainqueur"][lignes]].tolist(),
+                       c["points"][lignes].tolist(), c["ts"][lignes].tolist())
+        matchs = [{"id": i, "joueur1": j1, "joueur2": j2, "vainqueur": v, "points": p, "date": d}
+                  for i, j1, j2, v, p, d in colonnes]
+        if annules:
+            for match, annule in zip(matchs, c["annule"][lignes].tolist()):
+                match["annule"] = annule
+        return matchs
+
+    @classmethod
+    def depuis_arrow(cls, table):
+        """Journal relu depuis une table produite par ``vers_arrow`` (codes et colonnes repris tels quels)."""
+        journal = cls()
+        n = table.num_rows
+        colonnes = {nom: table.column(nom).combine_chunks() for nom in table.column_names}
+        journal.noms = colonnes["joueur1"].dictionary.to_pylist()
+        journal.codes = {nom: code for code, nom in enumerate(journal.noms)}
+        journal._alloc(max(n, CAPACITE_INITIALE))
+        c = journal._colonnes
+        joueur1 = colonnes["joueur1"].indices.to_numpy()
+        joueur2 = colonnes["joueur2"].indices.to_numpy()
+        vainqueur = colonnes["vainqueur"].indices.fill_null(SANS_VAINQUEUR).to_numpy()
+        c["joueur1"][:n], c["joueur2"][:n], c["vainqueur"][:n] = joueur1, joueur2, vainqueur
+        c["perdant"][:n] = np.where(vainqueur == joueur1, joueur2, np.where(vainqueur == joueur2, joueur1, SANS_VAINQUEUR))
+        for nom in ("points", "ts", "annule"):
+            c[nom][:n] = colonnes[nom].to_numpy(zero_copy_only=False)
+        journal.ids = colonnes["id"].to_pylist()
+        journal.lignes = dict(zip(journal.ids, range(n)))
+        journal._n = n
+        journal._trie = bool((np.diff(c["ts"][:n]) >= 0).all())
+        journal._par_joueur = None
+        return journal
+
+    def ecrire_parquet(self, chemin):
+        import pyarrow.parquet as pq
+
+        pq.write_table(self.vers_arrow(), chemin)
@@ -0,0 +1,258 @@
+"""Direct : flux Server-Sent Events et tableau d'affichage en lecture seule.
+
+Un petit serveur asyncio (bibliothèque standard seulement) suit le même
+stockage que l'application : il relit régulièrement les nouveaux événements,
+les applique à sa propre copie du moteur et diffuse à tous les écrans :
+
+* ``match`` / ``annulation`` : chaque combat dès qu'il est enregistré ;
+* ``diff`` : les lignes de joueurs et d'équipes modifiées par le lot ;
+* ``tableau`` : haut des classements, résumé et derniers combats.
+
+Le tableau n'est calculé qu'une fois par lot d'événements, quel que soit le
+nombre d'écrans ; un écran trop lent est déconnecté (il se reconnecte et
+repart du tableau courant). ``/`` sert une page d'affichage minimale,
+``/flux`` le flux SSE et ``/tableau`` le dernier tableau en JSON.
+
+Le serveur n'a pas d'authentification : il n'écoute par défaut que sur
+``127.0.0.1`` ; l'exposer au réseau est un choix explicite (``--hote``).
+"""
+import asyncio
+import json
+import os
+import random
+import tempfile
+from collections import deque
+
+from championnat import evenements
+from championnat.evenements import POINTS_VICTOIRE, TECHNIQUES
+from championnat.journal import INSTANTANE_PATH, JOURNAL_PATH, Journal
+
+TAILLE_TABLEAU = 10
+INTERVALLE = 0.5       # secondes entre deux lectures du stockage
+ATTENTE_MAX = 256      # messages en attente par écran avant déconnexion
+BATTEMENT = 15         # secondes sans message avant un commentaire de maintien
+MAX_DIFF = 1000        # au-delà (import massif), seul le tableau est envoyé
+
+
+def encoder(type_message, donnees, seq):
+    texte = json.dumps(donnees, ensure_ascii=False, separators=(",", ":"),
+                       default=lambda valeur: valeur.item() if hasattr(valeur, "item") else str(valeur))
+    return f"event: {type_message}\nid: {seq}\ndata: {texte}\n\n".encode("utf-8")
+
+
+def combat(evenement):
+    return {"id": evenement["id"], "joueur1": evenement["joueur1"], "joueur2": evenement["joueur2"],
+            "vainqueur": evenement["vainqueur"], "points": evenement["points"],
+            "technique": TECHNIQUES.get(evenement["points"], "Égalité"), "date": evenement.get("date")}
+
+
+class Direct:
+    def __init__(self, stockage, taille=TAILLE_TABLEAU, intervalle=INTERVALLE):
+        self.stockage = stockage
+        self.taille = taille
+        self.intervalle = intervalle
+        self.moteur = stockage.charger()
+        self.moteur.prendre_modifications()
+        self.derniers = deque(maxlen=taille)
+        self.clients = set()
+        self.paquet_tableau = encoder("tableau", self.tableau(), self.moteur.seq)
+
+    def tableau(self):
+        moteur = self.moteur
+        resume = moteur.resume()
+        return {
+            "seq": moteur.seq,
+            "resume": {cle: resume[cle] for cle in ("joueurs", "equipes", "total_combats", "points")},
+            "joueurs": moteur.podium_joueurs(self.taille).to_dict("records"),
+            "equipes": moteur.podium_equipes(self.taille).to_dict("records"),
+            "derniers": list(self.derniers),
+        }
+
+    def lire(self):
+        """Applique les nouveaux événements ; renvoie les messages à diffuser (thread de travail)."""
+        moteur = self.moteur
+        nouveaux = self.stockage.evenements_depuis(moteur.seq)
+        if nouveaux is None:  # compaction : on repart d'un moteur rechargé
+            moteur.remplacer(self.stockage.charger())
+            nouveaux = []
+        elif not nouveaux:
+            return []
+        messages = []
+        for evenement in nouveaux:
+            if evenement["type"] == "match":
+                self.derniers.appendleft(combat(evenement))
+                messages.append(("match", self.derniers[0]))
+            elif evenement["type"] == "matchs":
+                lignes = evenement["lignes"]
+                lot = [combat(dict(zip(lignes, valeurs))) for valeurs in zip(*lignes.values())]
+                # Seuls les derniers combats inédits sont diffusés un à un
+                lot = [c for c in lot if c["id"] not in moteur.combats][-self.taille:]
+                self.derniers.extendleft(lot)
+                messages.extend(("match", c) for c in lot)
+            elif evenement["type"] == "annulation":
+                self.derniers = deque((c for c in self.derniers if c["id"] != evenement["match"]), maxlen=self.taille)
+                messages.append(("annulation", {"id": evenement["match"]}))
+            elif evenement["type"] == "saison":
+                self.derniers.clear()
+            moteur.appliquer(evenement)
+        joueurs, equipes = moteur.prendre_modifications()
+        if nouveaux and len(joueurs) + len(equipes) <= MAX_DIFF:
+            messages.append(("diff", {
+                "seq": moteur.seq,
+                "joueurs": {j: dict(moteur.joueur(j)) if j in moteur else None for j in joueurs},
+                "equipes": {e: moteur.equipes.get(e) for e in equipes},
+            }))
+        messages.append(("tableau", self.tableau()))
+        return messages
+
+    def diffuser(self, messages):
+        for type_message, donnees in messages:
+            paquet = encoder(type_message, donnees, self.moteur.seq)
+            if type_message == "tableau":
+                self.paquet_tableau = paquet
+            for file in list(self.clients):
+                try:
+                    file.put_nowait(paquet)
+                except asyncio.QueueFull:
+                    # Écran trop lent : on vide sa file et on le déconnecte
+                    self.clients.discard(file)
+                    while not file.empty():
+                        file.get_nowait()
+                    file.put_nowait(None)
+
+    async def suivre(self):
+        boucle = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.intervalle)
+            self.diffuser(await boucle.run_in_executor(None, self.lire))
+
+    # HTTP
+
+    async def servir(self, lecteur, ecrivain):
+        try:
+            requete = await lecteur.readuntil(b"\r\n\r\n")
+            chemin = requete.split(b"\r\n", 1)[0].decode("latin-1").split()[1].split("?")[0]
+            if chemin == "/flux":
+                await self.flux(ecrivain)
+            elif chemin == "/":
+                await self.repondre(ecrivain, "200 OK", "text/html; charset=utf-8", PAGE.encode("utf-8"))
+            elif chemin == "/tableau":
+                donnees = self.paquet_tableau.split(b"data: ", 1)[1].rstrip()
+                await self.repondre(ecrivain, "200 OK", "application/json", donnees)
+            else:
+                await self.repondre(ecrivain, "404 Not Found", "text/plain", b"Introuvable")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, IndexError, ConnectionError):
+            pass
+        finally:
+            ecrivain.close()
+
+    async def repondre(self, ecrivain, statut, type_contenu, corps):
+        ecrivain.write(f"HTTP/1.1 {statut}\r\nContent-Type: {type_contenu}\r\nContent-Length: {len(corps)}\r\n"
+                       "Access-Control-Allow-Origin: *\r\nConnection: close\r\n\r\n".encode("latin-1") + corps)
+        await ecrivain.drain()
+
+    async def flux(self, ecrivain):
+        ecrivain.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+                       b"Access-Control-Allow-Origin: *\r\nConnection: keep-alive\r\n\r\nretry: 2000\n\n")
+        ecrivain.write(self.paquet_tableau)
+        file = asyncio.Queue(ATTENTE_MAX)
+        self.clients.add(file)
+        try:
+            while True:
+                try:
+                    paquet = await asyncio.wait_for(file.get(), BATTEMENT)
+                except asyncio.TimeoutError:
+                    paquet = b": battement\n\n"
+                if paquet is None:
+                    break
+                ecrivain.write(paquet)
+                await ecrivain.drain()
+        finally:
+            self.clients.discard(file)
+
+
+async def simuler(stockage, cadence):
+    """Enregistre un combat aléatoire toutes les ``cadence`` secondes."""
+    boucle = asyncio.get_running_loop()
+    moteur = stockage.charger()
+    for i in range(max(0, 4 - len(moteur))):
+        stockage.enregistrer(moteur, evenements.ajout("SIMULATION", f"SIMULE{i + 1}", 60 + 10 * i))
+    while True:
+        await asyncio.sleep(cadence)
+        joueur1, joueur2 = random.sample(moteur.noms(), 2)
+        vainqueur = random.choice([joueur1, joueur1, joueur2, joueur2, "Égalité"])
+        evenement = evenements.match(joueur1, joueur2, vainqueur, random.choice(list(POINTS_VICTOIRE)))
+        await boucle.run_in_executor(None, stockage.enregistrer, moteur, evenement)
+
+
+def copie_de_simulation(stockage):
+    """Stockage journal temporaire partant de l'état courant : les vraies données ne sont pas touchées."""
+    from championnat.stockage import StockageJournal
+
+    repertoire = tempfile.mkdtemp(prefix="judo_simulation_")
+    journal = Journal(os.path.join(repertoire, JOURNAL_PATH), os.path.join(repertoire, INSTANTANE_PATH))
+    journal.ecrire_instantane(stockage.charger(), 0)
+    return StockageJournal(journal)
+
+
+async def servir(stockage, hote="127.0.0.1", port=8765, intervalle=INTERVALLE, simulation=None):
+    if simulation:
+        stockage = copie_de_simulation(stockage)
+    direct = Direct(stockage, intervalle=intervalle)
+    serveur = await asyncio.start_server(direct.servir, hote, port)
+    taches = [asyncio.create_task(direct.suivre())]
+    if simulation:
+        taches.append(asyncio.create_task(simuler(stockage, simulation)))
+    async with serveur:
+        await asyncio.gather(serveur.serve_forever(), *taches)
+
+
+PAGE = """<!DOCTYPE html>
+<html lang="fr"><head><meta charset="utf-8"><meta name="viewport" content="width=device-width">
+<title>Championnat Marocain de Judo - Direct</title>
+<style>
+body{font-family:sans-serif;background:#10202f;color:#fff;margin:0;padding:1em}
+h1{color:#5dade2;text-align:center;margin:.2em}h2{color:#5dade2;border-bottom:1px solid #2e86c1}
+.grille{display:grid;grid-template-columns:repeat(auto-fit,minmax(320px,1fr));gap:1.5em}
+table{width:100%;border-collapse:collapse}td,th{padding:.3em;text-align:center}tr:nth-child(even){background:#1b3148}
+#resume{text-align:center;font-size:1.2em}#etat{position:fixed;top:.5em;right:.8em;font-size:.8em}
+.nouveau{animation:flash 2s}@keyframes flash{from{background:#f1c40f;color:#000}}
+</style></head><body>
+<div id="etat">connexion...</div><h1>Championnat Marocain de Judo - Direct</h1><div id="resume"></div>
+<div class="grille">
+<div><h2>Joueurs</h2><table id="joueurs"></table></div>
+<div><h2>Équipes</h2><table id="equipes"></table></div>
+<div><h2>Derniers combats</h2><table id="derniers"></table></div>
+</div>
+<script>
+function remplir(id, entete, lignes, nouveau) {
+  const table = document.getElementById(id);
+  table.replaceChildren();
+  const tr = table.insertRow();
+  entete.forEach(t => { const th = document.createElement("th"); th.textContent = t; tr.appendChild(th); });
+  lignes.forEach((l, i) => {
+    const r = table.insertRow();
+    if (nouveau && i === 0) r.className = "nouveau";
+    l.forEach(v => { r.insertCell().textContent = v; });
+  });
+}
+let dernier = null;
+const flux = new EventSource("flux");
+flux.onopen = () => { document.getElementById("etat").textContent = "en direct"; };
+flux.onerror = () => { document.getElementById("etat").textContent = "reconnexion..."; };
+flux.addEventListener("tableau", e => {
+  const t = JSON.parse(e.data), r = t.resume;
+  document.getElementById("resume").textContent =
+    `${r.joueurs} joueurs · ${r.equipes} équipes · ${r.total_combats} combats · ${r.points} points`;
+  remplir("joueurs", ["#", "Joueur", "Équipe", "Points", "Victoires"],
+          t.joueurs.map((j, i) => [i + 1, j.Joueur, j.Equipe, j.Points, j.Victoires]));
+  remplir("equipes", ["#", "Équipe", "Points", "Victoires"],
+          t.equipes.map((q, i) => [i + 1, q.Equipe, q.Points_Totaux, q.Victoires_Totaux]));
+  const premier = t.derniers.length ? t.derniers[0].id : null;
+  remplir("derniers", ["Combat", "Vainqueur", "Technique"],
+          t.derniers.map(c => [`${c.joueur1} - ${c.joueur2}`, c.vainqueur, c.technique]),
+          dernier !== null && premier !== dernier);
+  dernier = premier;
+});
+</script></body></html>
+"""
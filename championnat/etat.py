@@ -0,0 +1,30 @@
+"""État du championnat partagé par toutes les sessions d'un processus.
+
+Un seul moteur vit en mémoire, quel que soit le nombre de spectateurs et
+d'officiels connectés : les sessions lisent ses vues matérialisées (mises
+en cache par version, sans copie) et les écritures passent par un verrou.
+Le couple (identifiant, version) du moteur permet à chaque session de
+savoir si de nouveaux résultats sont arrivés depuis son dernier affichage.
+"""
+from championnat.stockage import ouvrir_stockage
+
+
+class EtatPartage:
+    def __init__(self, stockage=None):
+        self.stockage = stockage or ouvrir_stockage()
+        self.moteur = self.stockage.charger()
+
+    @property
+    def version(self):
+        return (self.moteur.identifiant, self.moteur.version)
+
+    def enregistrer(self, evenement):
+        with self.moteur.verrou:
+            return self.stockage.enregistrer(self.moteur, evenement)
+
+    def rafraichir(self):
+        """Rattrape les événements écrits par un autre processus (CLI, autre serveur)."""
+        if self.stockage.dernier_seq() != self.moteur.seq:
+            with self.moteur.verrou:
+                self.stockage.rattraper(self.moteur)
+        return self.version
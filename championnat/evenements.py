@@ -0,0 +1,58 @@
+"""Constructeurs des événements du journal.
+
+Chaque mutation du championnat est décrite par un dictionnaire sérialisable
+en JSON, appliqué par ``MoteurClassement.appliquer`` et écrit dans le journal.
+"""
+import time
+import uuid
+
+POINTS_VICTOIRE = {"Ippon (10 pts)": 10, "Waza-ari (7 pts)": 7, "Yuko (5 pts)": 5}
+TECHNIQUES = {points: libelle.split(" (")[0] for libelle, points in POINTS_VICTOIRE.items()}
+
+
+def ajout(equipe, joueur, poids, victoires=0, defaites=0):
+    return {"type": "ajout", "equipe": equipe, "joueur": joueur, "poids": int(poids),
+            "victoires": int(victoires), "defaites": int(defaites)}
+
+
+def match(joueur1, joueur2, vainqueur, type_victoire=None, date=None):
+    points = 0 if vainqueur == "Égalité" else POINTS_VICTOIRE[type_victoire]
+    # "date" : moment du combat, distinct du "ts" d'écriture ajouté par le journal
+    return {"type": "match", "id": uuid.uuid4().hex[:12], "joueur1": joueur1, "joueur2": joueur2,
+            "vainqueur": vainqueur, "points": points, "date": date or time.time()}
+
+
+def matchs(lignes):
+    """Lot de combats ; ``lignes`` : colonnes id, joueur1, joueur2, vainqueur, points, date (dict de listes)."""
+    return {"type": "matchs", "lignes": lignes}
+
+
+def annulation(match_id):
+    return {"type": "annulation", "match": match_id}
+
+
+def suppression(joueur):
+    return {"type": "suppression", "joueur": joueur}
+
+
+def modification(joueur, equipe, poids, victoires, defaites):
+    return {"type": "modification", "joueur": joueur, "equipe": equipe, "poids": int(poids),
+            "victoires": int(victoires), "defaites": int(defaites)}
+
+
+def saison(championnat, saison, garder_joueurs=True, apres=0, table_categories=None):
+    """Ouvre une nouvelle saison ; ``apres`` est le dernier événement de la saison archivée.
+
+    ``table_categories`` (clé de ``categories.TABLES``) : table de poids de la
+    nouvelle saison, celle de la saison archivée si absente.
+    """
+    evenement = {"type": "saison", "championnat": championnat, "saison": saison,
+                 "garder_joueurs": bool(garder_joueurs), "apres": apres}
+    if table_categories is not None:
+        evenement["categories"] = list(table_categories)
+    return evenement
+
+
+def importation(lignes):
+    """``lignes`` : colonnes Equipe, Joueur, Poids, Victoires, Defaites et Points (dict de listes)."""
+    return {"type": "import", "lignes": lignes}
@@ -0,0 +1,249 @@
+"""Import CSV par blocs avec validation vectorisée.
+
+Le fichier est lu par blocs de ``TAILLE_BLOC`` lignes en texte brut, puis
+chaque bloc est converti, validé et dédoublonné d'un seul tenant. Les lignes
+acceptées d'un bloc forment un seul événement ``import`` : la mémoire reste
+bornée quelle que soit la taille du fichier.
+
+Les résultats des tapis arrivent par lots (tableau collé, CSV ou JSON du
+logiciel de marque) : ``importer_combats`` les valide d'un bloc et les
+enregistre en un seul événement ``matchs``. Un combat dont l'identifiant est
+déjà connu est ignoré, si bien qu'un fichier renvoyé ne compte rien deux fois.
+"""
+import csv
+import hashlib
+import io
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from championnat import evenements, mesures
+from championnat.evenements import POINTS_VICTOIRE, TECHNIQUES
+from championnat.schema import ENTIERS
+
+COLONNES_REQUISES = ['Equipe', 'Joueur', 'Poids']
+COMPTEURS = ['Victoires', 'Defaites', 'Points']  # facultatifs : un CSV exporté par l'application se réimporte tel quel
+TAILLE_BLOC = 10_000
+MAX_REJETS_DETAILLES = 1000
+POIDS_MIN, POIDS_MAX = 30, 150
+
+
+class RapportImport:
+    COLONNES = ['Ligne', 'Joueur', 'Motif']
+
+    def __init__(self):
+        self.acceptes = 0
+        self.nb_rejets = 0
+        self.rejets = []  # (ligne, Joueur, motif), limité à MAX_REJETS_DETAILLES
+
+    def rejeter(self, lignes, joueurs, motifs):
+        self.nb_rejets += len(lignes)
+        place = MAX_REJETS_DETAILLES - len(self.rejets)
+        self.rejets.extend(zip(lignes[:place], joueurs[:place], motifs[:place]))
+
+    @property
+    def rejets_df(self):
+        return pd.DataFrame(self.rejets, columns=self.COLONNES)
+
+
+def valider_bloc(bloc, deja_vus):
+    """Convertit et valide un bloc ; renvoie (lignes acceptées, masque des rejets, motifs)."""
+    for colonne in ['Equipe', 'Joueur']:
+        bloc[colonne] = bloc[colonne].fillna("").str.strip()
+    bloc['Poids'] = pd.to_numeric(bloc['Poids'], errors="coerce")
+    for colonne in COMPTEURS:
+        # Compteur absent ou vide : 0 ; texte non numérique : rejet
+        valeurs = bloc[colonne] if colonne in bloc else pd.Series("", index=bloc.index)
+        bloc[colonne] = pd.to_numeric(valeurs.fillna("").replace("", "0"), errors="coerce")
+    compteurs = bloc[COMPTEURS]
+
+    existe = np.fromiter((joueur in deja_vus for joueur in bloc['Joueur']), dtype=bool, count=len(bloc))
+    conditions = [
+        (bloc['Joueur'] == "").to_numpy(),
+        (bloc['Equipe'] == "").to_numpy(),
+        bloc['Poids'].isna().to_numpy(),
+        ~bloc['Poids'].between(POIDS_MIN, POIDS_MAX).to_numpy(),
+        (compteurs.isna() | (compteurs < 0) | (compteurs % 1 != 0)
+         | (compteurs > np.iinfo(ENTIERS['Victoires']).max)).any(axis=1).to_numpy(),
+        existe,
+        bloc['Joueur'].duplicated().to_numpy(),
+    ]
+    motifs = np.select(conditions, [
+        "Joueur manquant", "Équipe manquante", "Poids non numérique",
+        f"Poids hors de [{POIDS_MIN}, {POIDS_MAX}] kg", "Victoires/Défaites/Points invalides",
+        "Joueur déjà inscrit", "Joueur en double dans le fichier",
+    ], default="")
+    rejet = motifs != ""
+
+    acceptes = bloc.loc[~rejet, ['Equipe', 'Joueur', 'Poids', *COMPTEURS]]
+    acceptes = acceptes.astype({colonne: ENTIERS[colonne] for colonne in ['Poids', *COMPTEURS]})
+    return acceptes, rejet, motifs
+
+
+@mesures.mesurer("import.csv")
+def importer_csv(fichier, moteur, enregistrer, taille_bloc=TAILLE_BLOC, progression=None):
+    """Importe un CSV de joueurs bloc par bloc.
+
+    ``enregistrer`` reçoit un événement ``import`` par bloc non vide ;
+    ``progression`` (facultatif) reçoit la fraction du fichier déjà lue.
+    """
+    rapport = RapportImport()
+    taille = getattr(fichier, "size", None)
+    blocs = pd.read_csv(fichier, dtype=str, keep_default_na=False, na_values=[""],
+                        skipinitialspace=True, chunksize=taille_bloc)
+    debut = 2  # numéro de ligne du premier enregistrement (après l'en-tête)
+    for bloc in blocs:
+        manquantes = [c for c in COLONNES_REQUISES if c not in bloc.columns]
+        if manquantes:
+            raise ValueError(f"Colonnes manquantes : {', '.join(manquantes)}")
+
+        acceptes, rejet, motifs = valider_bloc(bloc, moteur.index)
+        mesures.compter("import.lignes", len(bloc))
+        if rejet.any():
+            rapport.rejeter((np.flatnonzero(rejet) + debut).tolist(),
+                            bloc['Joueur'].to_numpy()[rejet].tolist(), motifs[rejet].tolist())
+        if not acceptes.empty:
+            enregistrer(evenements.importation(acceptes.to_dict("list")))
+            rapport.acceptes += len(acceptes)
+        debut += len(bloc)
+        if progression is not None and taille:
+            progression(min(fichier.tell() / taille, 1.0))
+    if progression is not None:
+        progression(1.0)
+    return rapport
+
+
+# Combats
+
+COLONNES_COMBATS = ['Joueur1', 'Joueur2', 'Vainqueur']  # requises ; Id, Technique et Date facultatives
+NOMS_COLONNES = {"id": "Id", "combat": "Id", "joueur1": "Joueur1", "joueur 1": "Joueur1",
+                 "joueur2": "Joueur2", "joueur 2": "Joueur2", "vainqueur": "Vainqueur",
+                 "technique": "Technique", "points": "Technique", "date": "Date"}
+EGALITES = {"égalité", "egalite", "nul"}
+# Technique saisie -> points : libellé complet, nom seul ou nombre de points
+TECHNIQUES_SAISIES = {**{libelle.casefold(): points for libelle, points in POINTS_VICTOIRE.items()},
+                      **{nom.casefold(): points for points, nom in TECHNIQUES.items()}}
+
+
+class RapportCombats(RapportImport):
+    COLONNES = ['Ligne', 'Id', 'Motif']
+
+    def __init__(self):
+        super().__init__()
+        self.deja_enregistres = 0  # identifiants déjà connus ou répétés dans le lot
+
+
+def lire_combats(source):
+    """Combats d'un texte ou d'un fichier : JSON (liste ou ``{"combats": [...]}``) ou tableau CSV.
+
+    Le séparateur du tableau (virgule, point-virgule, tabulation d'un tableur
+    collé) est détecté ; toutes les colonnes sont lues en texte brut.
+    """
+    texte = source if isinstance(source, (str, bytes)) else source.read()
+    if isinstance(texte, bytes):
+        texte = texte.decode("utf-8-sig")
+    texte = texte.strip()
+    if not texte:
+        return pd.DataFrame(columns=COLONNES_COMBATS)
+    if texte[0] in "[{":
+        donnees = json.loads(texte)
+        if isinstance(donnees, dict):
+            donnees = donnees.get("combats", [donnees])
+        combats = pd.DataFrame(donnees, dtype=object)
+        combats.attrs["premiere_ligne"] = 1
+    else:
+        try:
+            combats = pd.read_csv(io.StringIO(texte), sep=None, engine="python", dtype=str,
+                                  keep_default_na=False, skipinitialspace=True)
+        except csv.Error as erreur:
+            raise ValueError(f"Tableau illisible : {erreur}") from None
+        combats.attrs["premiere_ligne"] = 2  # après l'en-tête
+    combats = combats.rename(columns=lambda colonne: NOMS_COLONNES.get(str(colonne).strip().casefold(), colonne))
+    manquantes = [c for c in COLONNES_COMBATS if c not in combats.columns]
+    if manquantes:
+        raise ValueError(f"Colonnes manquantes : {', '.join(manquantes)}")
+    return combats
+
+
+def valider_combats(combats, moteur, maintenant=None):
+    """Convertit et valide un lot ; renvoie (colonnes de l'événement ``matchs``, masque des rejets, motifs,
+    masque des combats déjà enregistrés).
+
+    Sans colonne Id, l'identifiant est tiré du contenu de la ligne : recoller
+    le même tableau reste sans effet. Une date absente vaut ``maintenant``.
+    """
+    texte = {colonne: (combats[colonne].fillna("").astype(str).str.strip() if colonne in combats
+                       else pd.Series("", index=combats.index, dtype=object))
+             for colonne in ['Id', 'Joueur1', 'Joueur2', 'Vainqueur', 'Technique', 'Date']}
+    joueur1, joueur2 = texte['Joueur1'], texte['Joueur2']
+    egalite = texte['Vainqueur'].str.casefold().isin(EGALITES)
+    vainqueur = texte['Vainqueur'].mask(egalite, "Égalité")
+
+    technique = texte['Technique'].str.casefold()
+    nombres = pd.to_numeric(technique, errors="coerce")
+    points = technique.map(TECHNIQUES_SAISIES).fillna(nombres.where(nombres.isin(list(POINTS_VICTOIRE.values()))))
+    points = points.mask(egalite, 0)
+
+    date = texte['Date'].replace("", None)
+    secondes = pd.to_numeric(date, errors="coerce")
+    horodatees = pd.to_datetime(date.where(secondes.isna()), errors="coerce", utc=True, format="mixed")
+    secondes = secondes.fillna((horodatees - pd.Timestamp(0, tz="UTC")).dt.total_seconds())
+    secondes = secondes.fillna(maintenant or time.time()).mask(date.notna() & secondes.isna())
+
+    ids = texte['Id'].mask(texte['Id'] == "", pd.Series(
+        [hashlib.sha1("|".join(ligne).encode("utf-8")).hexdigest()[:12]
+         for ligne in zip(joueur1, joueur2, vainqueur, technique, texte['Date'])], index=combats.index, dtype=object))
+
+    connu = np.fromiter((match_id in moteur.combats for match_id in ids), dtype=bool, count=len(ids))
+    inscrit1 = np.fromiter((joueur in moteur for joueur in joueur1), dtype=bool, count=len(ids))
+    inscrit2 = np.fromiter((joueur in moteur for joueur in joueur2), dtype=bool, count=len(ids))
+    conditions = [
+        connu,  # motif vide : un combat déjà enregistré est ignoré, pas rejeté
+        (joueur1 == "").to_numpy() | (joueur2 == "").to_numpy(),
+        ~inscrit1 | ~inscrit2,
+        (joueur1 == joueur2).to_numpy(),
+        ~(egalite | (vainqueur == joueur1) | (vainqueur == joueur2)).to_numpy(),
+        points.isna().to_numpy(),
+        (date.notna() & secondes.isna()).to_numpy(),
+    ]
+    motifs = np.select(conditions, [
+        "", "Joueur manquant", "Joueur inconnu", "Les deux joueurs sont identiques",
+        "Vainqueur ni Joueur1 ni Joueur2", "Technique inconnue", "Date invalide",
+    ], default="")
+    rejet = motifs != ""
+    # Déjà enregistré, ou répété plus haut dans le lot : ignoré sans être rejeté
+    deja = connu.copy()
+    deja[~rejet] |= ids[~rejet].duplicated().to_numpy()
+    retenus = ~rejet & ~deja
+    lignes = {
+        "id": ids[retenus].tolist(),
+        "joueur1": joueur1[retenus].tolist(),
+        "joueur2": joueur2[retenus].tolist(),
+        "vainqueur": vainqueur[retenus].tolist(),
+        "points": points[retenus].astype(int).tolist(),
+        "date": secondes[retenus].tolist(),
+    }
+    return lignes, rejet, motifs, deja
+
+
+@mesures.mesurer("import.combats")
+def importer_combats(source, moteur, enregistrer, maintenant=None):
+    """Importe un lot de combats (voir ``lire_combats``) en un seul événement ``matchs``.
+
+    Les classements ne sont mis à jour qu'une fois pour tout le lot ; sur
+    SQLite, le lot est écrit dans une seule transaction.
+    """
+    rapport = RapportCombats()
+    combats = lire_combats(source)
+    lignes, rejet, motifs, deja = valider_combats(combats, moteur, maintenant)
+    mesures.compter("import.combats", len(combats))
+    if rejet.any():
+        ids = combats['Id'].fillna("").astype(str) if 'Id' in combats else pd.Series("", index=combats.index)
+        rapport.rejeter((np.flatnonzero(rejet) + combats.attrs["premiere_ligne"]).tolist(), ids.to_numpy()[rejet].tolist(), motifs[rejet].tolist())
+    rapport.deja_enregistres = int(deja.sum())
+    if lignes["id"]:
+        enregistrer(evenements.matchs(lignes))
+        rapport.acceptes = len(lignes["id"])
+    return rapport
@@ -0,0 +1,79 @@
+"""Index des joueurs : nom -> position de ligne, équipe -> lignes des membres.
+
+Les positions correspondent aux lignes de la vue ``judo_data`` du moteur ;
+une suppression déplace la dernière ligne dans le trou (O(1)), ce qui garde
+les positions denses et directement utilisables avec ``iloc``.
+"""
+import numpy as np
+import pandas as pd
+
+
+class IndexJoueurs:
+    def __init__(self):
+        self.noms = []        # position -> Joueur
+        self.positions = {}   # Joueur -> position
+        self.membres = {}     # Equipe -> {positions}
+
+    def __len__(self):
+        return len(self.noms)
+
+    def __contains__(self, joueur):
+        return joueur in self.positions
+
+    def position(self, joueur):
+        return self.positions[joueur]
+
+    def lignes_equipe(self, equipe):
+        return sorted(self.membres.get(equipe, ()))
+
+    def ajouter(self, joueur, equipe):
+        if joueur in self.positions:
+            raise ValueError("Ce joueur existe déjà !")
+        position = len(self.noms)
+        self.noms.append(joueur)
+        self.positions[joueur] = position
+        self.membres.setdefault(equipe, set()).add(position)
+        return position
+
+    def ajouter_lot(self, joueurs, equipes):
+        """Ajoute des joueurs nouveaux (et distincts) à la suite."""
+        if len(set(joueurs)) < len(joueurs) or (self.positions and any(joueur in self.positions for joueur in joueurs)):
+            raise ValueError("Ce joueur existe déjà !")
+        debut = len(self.noms)
+        self.noms.extend(joueurs)
+        self.positions.update(zip(joueurs, range(debut, debut + len(joueurs))))
+        # Positions regroupées par équipe avec un tri NumPy plutôt qu'un ajout par joueur
+        codes, noms_equipes = pd.factorize(np.asarray(equipes, dtype=object))
+        ordre = np.argsort(codes, kind="stable") + debut
+        bornes = np.searchsorted(np.sort(codes), np.arange(1, len(noms_equipes)))
+        for equipe, positions in zip(noms_equipes.tolist(), np.split(ordre, bornes)):
+            self.membres.setdefault(equipe, set()).update(positions.tolist())
+
+    def retirer(self, joueur, equipe, equipe_derniere):
+        """Retire un joueur ; renvoie (position libérée, position déplacée).
+
+        ``equipe_derniere`` est l'équipe du joueur occupant la dernière ligne,
+        qui vient prendre la place libérée.
+        """
+        position = self.positions.pop(joueur)
+        derniere = len(self.noms) - 1
+        self._retirer_membre(equipe, position)
+        if position != derniere:
+            deplace = self.noms[derniere]
+            self.noms[position] = deplace
+            self.positions[deplace] = position
+            self.membres[equipe_derniere].discard(derniere)
+            self.membres[equipe_derniere].add(position)
+        self.noms.pop()
+        return position, derniere
+
+    def changer_equipe(self, joueur, ancienne, nouvelle):
+        position = self.positions[joueur]
+        self._retirer_membre(ancienne, position)
+        self.membres.setdefault(nouvelle, set()).add(position)
+
+    def _retirer_membre(self, equipe, position):
+        membres = self.membres[equipe]
+        membres.discard(position)
+        if not membres:
+            del self.membres[equipe]
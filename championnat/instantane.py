@@ -0,0 +1,128 @@
+"""Instantané en colonnes (Arrow IPC), lu par projection en mémoire.
+
+Un instantané est un répertoire. Chaque compaction y écrit une génération
+(``<journal_seq>/``) : ``athletes.arrow`` (la vue typée ``judo_data``, dans
+l'ordre du classement pour que le palmarès se reconstruise sans tri),
+``equipes.arrow`` (classement des équipes), ``combats.arrow`` (le journal des
+combats, annulés compris) et ``meta.json``. Le fichier ``COURANT`` désigne la
+génération valide ; il n'est remplacé (atomiquement) qu'une fois la nouvelle
+génération complète sur disque.
+
+Les fichiers sont ouverts avec ``pa.memory_map`` : la lecture ne copie pas
+les colonnes, et une projection (``colonnes=[...]``) ne touche que les pages
+des colonnes demandées. ``migrer`` convertit une fois l'ancien
+``judo_data.json``.
+"""
+import json
+import os
+import shutil
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.ipc as ipc
+
+FORMAT = 1
+COURANT = "COURANT"
+GENERATIONS_GARDEES = 2  # la précédente reste lisible pour un lecteur en cours
+
+
+def generation(repertoire):
+    """Répertoire de la génération courante, None s'il n'y a pas encore d'instantané."""
+    try:
+        with open(os.path.join(repertoire, COURANT)) as f:
+            return os.path.join(repertoire, f.read().strip())
+    except FileNotFoundError:
+        return None
+
+
+def lire_meta(repertoire):
+    chemin = generation(repertoire)
+    if chemin is None:
+        return {}
+    with open(os.path.join(chemin, "meta.json")) as f:
+        return json.load(f)
+
+
+def lire_table(repertoire, table, colonnes=None):
+    """Table Arrow adossée au fichier projeté en mémoire, éventuellement restreinte à ``colonnes``."""
+    source = pa.memory_map(os.path.join(generation(repertoire), f"{table}.arrow"))
+    lue = ipc.open_file(source).read_all()
+    return lue if colonnes is None else lue.select(colonnes)
+
+
+def charger(repertoire):
+    """Même dictionnaire que l'instantané JSON, avec des tables en colonnes ; {} sans instantané."""
+    meta = lire_meta(repertoire)
+    if not meta:
+        return {}
+    return dict(meta, judo_data=lire_table(repertoire, "athletes").to_pandas(),
+                combats=lire_table(repertoire, "combats"))
+
+
+def classement(repertoire, n, equipes=False):
+    """Haut du classement lu par projection, sans construire le moteur."""
+    if equipes:
+        return lire_table(repertoire, "equipes").slice(0, n).to_pandas()  # écrit dans l'ordre du palmarès
+    table = lire_table(repertoire, "athletes", ['Joueur', 'Equipe', 'Points', 'Victoires', 'Performance'])
+    cles = [('Points', 'descending'), ('Victoires', 'descending'), ('Performance', 'descending'),
+            ('Joueur', 'ascending')]
+    haut = table.take(pc.select_k_unstable(table, min(n, table.num_rows), cles))
+    return haut.select(['Joueur', 'Equipe', 'Points', 'Victoires']).to_pandas()
+
+
+def ecrire_table(chemin, table):
+    with open(chemin, "wb") as f:
+        with ipc.new_file(f, table.schema) as ecrivain:
+            ecrivain.write_table(table)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def ecrire(repertoire, moteur, journal_seq, supplements=None):
+    """Écrit une nouvelle génération puis la désigne comme courante.
+
+    ``supplements`` ajoute des tables (nom -> DataFrame) à la génération.
+    """
+    nom = f"{journal_seq:012d}"
+    temporaire = os.path.join(repertoire, nom + ".tmp")
+    shutil.rmtree(temporaire, ignore_errors=True)
+    os.makedirs(temporaire)
+    with moteur.verrou:
+        ordre = [moteur.index.position(joueur) for joueur in moteur.palmares.noms()]
+        athletes = moteur.judo_data.iloc[ordre]
+    tables = {
+        "athletes": pa.Table.from_pandas(athletes, preserve_index=False),
+        "equipes": pa.Table.from_pandas(moteur.classement_des_equipes(), preserve_index=False),
+        "combats": moteur.combats.vers_arrow(),
+    }
+    tables.update((table, pa.Table.from_pandas(df, preserve_index=False)) for table, df in (supplements or {}).items())
+    for table, donnees in tables.items():
+        ecrire_table(os.path.join(temporaire, f"{table}.arrow"), donnees)
+    with open(os.path.join(temporaire, "meta.json"), "w") as f:
+        json.dump({"format": FORMAT, "journal_seq": journal_seq, "categories": list(moteur.table_categories),
+                   "championnat": moteur.championnat, "saison": moteur.saison}, f, ensure_ascii=False)
+    cible = os.path.join(repertoire, nom)
+    shutil.rmtree(cible, ignore_errors=True)
+    os.replace(temporaire, cible)
+    with open(os.path.join(repertoire, COURANT + ".tmp"), "w") as f:
+        f.write(nom)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(os.path.join(repertoire, COURANT + ".tmp"), os.path.join(repertoire, COURANT))
+    anciennes = sorted(n for n in os.listdir(repertoire) if n.isdigit())[:-GENERATIONS_GARDEES]
+    for ancienne in anciennes:
+        shutil.rmtree(os.path.join(repertoire, ancienne), ignore_errors=True)
+
+
+def migrer(source, repertoire):
+    """Convertit un instantané JSON (``judo_data.json``) ; renvoie False s'il n'existe pas."""
+    from championnat.classements import MoteurClassement
+
+    try:
+        with open(source) as f:
+            donnees = json.load(f)
+    except FileNotFoundError:
+        return False
+    os.makedirs(repertoire, exist_ok=True)
+    ecrire(repertoire, MoteurClassement.depuis_instantane(donnees), donnees.get("journal_seq", 0))
+    return True
@@ -0,0 +1,155 @@
+"""Journal d'événements en ajout seul (write-ahead log).
+
+Chaque mutation (joueur ajouté, match enregistré, modification, suppression,
+import) est écrite sur une ligne JSON compacte puis synchronisée sur disque.
+L'instantané n'est réécrit que lors des compactions ; au démarrage on
+recharge l'instantané puis on rejoue la fin du journal. Il est en colonnes
+(répertoire ``judo_data.arrow``, voir ``championnat.instantane``) ; un chemin
+en ``.json`` garde l'ancien format, et un ``judo_data.json`` trouvé sans
+instantané en colonnes est migré au premier chargement.
+"""
+import json
+import os
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows : pas de verrou inter-processus
+    fcntl = None
+
+from championnat import mesures
+
+INSTANTANE_PATH = "judo_data.arrow"
+INSTANTANE_JSON = "judo_data.json"
+JOURNAL_PATH = "judo_journal.jsonl"
+SEUIL_COMPACTION = 500
+
+
+class Journal:
+    def __init__(self, chemin=JOURNAL_PATH, instantane=INSTANTANE_PATH):
+        self.chemin = chemin
+        self.instantane = instantane
+        self.chemin_verrou = chemin + ".lock"
+        self.colonnes = not instantane.endswith(".json")
+
+    @contextmanager
+    def verrou(self):
+        # Sérialise les écritures de plusieurs officiels (sessions ou processus)
+        with open(self.chemin_verrou, "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def ajouter(self, evenement):
+        """Ajoute un événement au journal et le synchronise sur disque."""
+        with self.verrou():
+            return self.ecrire(evenement)
+
+    @mesures.mesurer("journal.ecrire")
+    def ecrire(self, evenement):
+        """Comme ``ajouter``, pour un appelant qui détient déjà le verrou."""
+        evenement = dict(evenement, seq=self.dernier_seq() + 1, ts=time.time())
+        ligne = json.dumps(evenement, separators=(",", ":"), ensure_ascii=False) + "\n"
+        with open(self.chemin, "a", encoding="utf-8") as f:
+            f.write(ligne)
+            f.flush()
+            os.fsync(f.fileno())
+        return evenement
+
+    def relire(self, depuis=0):
+        """Itère sur les événements dont le numéro de séquence dépasse ``depuis``."""
+        try:
+            f = open(self.chemin, "r", encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with f:
+            for ligne in f:
+                if not ligne.endswith("\n"):
+                    break  # ligne tronquée par un arrêt brutal : ignorée
+                evenement = json.loads(ligne)
+                if evenement["seq"] > depuis:
+                    yield evenement
+
+    def dernier_seq(self):
+        # Lit seulement la fin du fichier pour retrouver le dernier numéro ; la fenêtre
+        # double tant qu'elle ne contient pas une ligne entière (lot de combats, gros import)
+        try:
+            with open(self.chemin, "rb") as f:
+                taille = f.seek(0, os.SEEK_END)
+                fenetre = 65536
+                while True:
+                    debut = max(0, taille - fenetre)
+                    f.seek(debut)
+                    lignes = f.read().split(b"\n")
+                    for ligne in reversed(lignes[1 if debut else 0:-1]):
+                        try:
+                            return json.loads(ligne)["seq"]
+                        except ValueError:
+                            continue
+                    if not debut:
+                        break
+                    fenetre *= 2
+        except FileNotFoundError:
+            pass
+        return self.seq_instantane()
+
+    def taille(self, depuis=0):
+        return sum(1 for _ in self.relire(depuis))
+
+    @mesures.mesurer("instantane.lire")
+    def charger_instantane(self):
+        if self.colonnes:
+            from championnat import instantane
+
+            if instantane.generation(self.instantane) is None:
+                instantane.migrer(os.path.splitext(self.instantane)[0] + ".json", self.instantane)
+            return instantane.charger(self.instantane)
+        try:
+            with open(self.instantane, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def seq_instantane(self):
+        if self.colonnes:
+            from championnat import instantane
+
+            if instantane.generation(self.instantane) is not None:
+                return instantane.lire_meta(self.instantane)["journal_seq"]
+        return self.charger_instantane().get("journal_seq", 0)
+
+    @mesures.mesurer("instantane.ecrire")
+    def ecrire_instantane(self, moteur, journal_seq):
+        if self.colonnes:
+            from championnat import instantane
+
+            os.makedirs(self.instantane, exist_ok=True)
+            instantane.ecrire(self.instantane, moteur, journal_seq)
+            return
+        temporaire = self.instantane + ".tmp"
+        with open(temporaire, "w") as f:
+            json.dump(dict(moteur.exporter(), journal_seq=journal_seq), f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporaire, self.instantane)
+
+    def compacter(self, reconstruire):
+        """Écrit un nouvel instantané et vide le journal.
+
+        ``reconstruire(instantane, evenements)`` doit renvoyer le moteur à
+        sérialiser ; il est appelé sous verrou pour n'oublier aucun événement.
+        """
+        with self.verrou():
+            instantane = self.charger_instantane()
+            seq = instantane.get("journal_seq", 0)
+            evenements = list(self.relire(seq))
+            if not evenements:
+                return
+            self.ecrire_instantane(reconstruire(instantane, evenements), evenements[-1]["seq"])
+            with open(self.chemin, "w") as f:
+                os.fsync(f.fileno())
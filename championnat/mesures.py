@@ -0,0 +1,222 @@
+"""Mesures des traitements : chronomètres, compteurs, profilage et journaux JSON.
+
+``chrono(nom)`` (bloc ``with``) ou ``@mesurer(nom)`` chronomètre un
+traitement, ``compter(nom)`` incrémente un compteur. Les dernières durées de
+chaque mesure sont gardées (fenêtre glissante) pour en tirer p50 et p95.
+
+Un passage est une exécution du script Streamlit : ``commencer_passage``
+puis ``marquer(etape)`` le découpent en étapes (état, page, résumé), et les
+mesures prises pendant le passage, dans le même thread, y sont rattachées.
+Les mesures prises ailleurs (rendu PDF, flux direct) ne comptent que dans
+les statistiques globales.
+
+Avec ``JUDO_LOGS`` (``stderr`` ou un chemin de fichier), chaque mesure et
+chaque passage sont aussi écrits en JSON, un enregistrement par ligne.
+"""
+import cProfile
+import functools
+import io
+import json
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+FENETRE = 1000          # durées gardées par mesure
+PASSAGES_GARDES = 100
+PROFILEURS = ("cProfile", "pyinstrument")
+
+journal = logging.getLogger("championnat.mesures")
+
+
+class FormatJSON(logging.Formatter):
+    def format(self, record):
+        donnees = {"ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+                   "niveau": record.levelname, "message": record.getMessage(), "pid": record.process}
+        donnees.update(getattr(record, "champs", {}))
+        return json.dumps(donnees, ensure_ascii=False, default=str)
+
+
+def configurer_logs(destination=None):
+    """Active les journaux JSON vers ``destination`` (``stderr`` ou un fichier) ; lu dans ``JUDO_LOGS`` si absent."""
+    destination = destination or os.environ.get("JUDO_LOGS")
+    if not destination or journal.handlers:
+        return
+    if destination == "stderr":
+        sortie = logging.StreamHandler(sys.stderr)
+    else:
+        sortie = logging.FileHandler(destination, encoding="utf-8")
+    sortie.setFormatter(FormatJSON())
+    journal.addHandler(sortie)
+    journal.setLevel(logging.INFO)
+    journal.propagate = False
+
+
+class Passage:
+    def __init__(self, nom, **champs):
+        self.nom = nom
+        self.champs = champs
+        self.debut = self._dernier = time.perf_counter()
+        self.duree = None
+        self.etapes = []   # (étape, durée)
+        self.mesures = []  # (mesure, durée), dans l'ordre où elles se terminent
+
+    def marquer(self, etape):
+        """Clôt l'étape ``etape`` : le temps écoulé depuis la marque précédente."""
+        maintenant = time.perf_counter()
+        self.etapes.append((etape, maintenant - self._dernier))
+        self._dernier = maintenant
+
+    def tableau(self):
+        """Décomposition du passage en millisecondes (étapes, puis mesures imbriquées)."""
+        lignes = [("étape", nom, duree) for nom, duree in self.etapes]
+        lignes += [("mesure", nom, duree) for nom, duree in self.mesures]
+        df = pd.DataFrame(lignes, columns=['Type', 'Nom', 'ms'])
+        df['ms'] = (df['ms'] * 1000).round(2)
+        return df
+
+
+class Mesures:
+    def __init__(self, fenetre=FENETRE, passages=PASSAGES_GARDES):
+        self.fenetre = fenetre
+        self._durees = {}     # nom -> deque des dernières durées (secondes)
+        self._appels = {}     # nom -> nombre total d'appels
+        self._compteurs = {}
+        self._verrou = threading.Lock()
+        self._local = threading.local()
+        self.passages = deque(maxlen=passages)
+
+    def _ajouter(self, nom, duree):
+        with self._verrou:
+            durees = self._durees.get(nom)
+            if durees is None:
+                durees = self._durees[nom] = deque(maxlen=self.fenetre)
+            durees.append(duree)
+            self._appels[nom] = self._appels.get(nom, 0) + 1
+
+    def enregistrer(self, nom, duree, **champs):
+        self._ajouter(nom, duree)
+        passage = getattr(self._local, "passage", None)
+        if passage is not None:
+            passage.mesures.append((nom, duree))
+        if journal.isEnabledFor(logging.INFO):
+            journal.info(nom, extra={"champs": dict(champs, type="mesure", nom=nom, duree_ms=round(duree * 1000, 3))})
+
+    @contextmanager
+    def chrono(self, nom, **champs):
+        debut = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.enregistrer(nom, time.perf_counter() - debut, **champs)
+
+    def mesurer(self, nom):
+        """Décorateur : chronomètre chaque appel de la fonction sous ``nom``."""
+        def decorateur(fonction):
+            @functools.wraps(fonction)
+            def chronometree(*args, **kwargs):
+                with self.chrono(nom):
+                    return fonction(*args, **kwargs)
+            return chronometree
+        return decorateur
+
+    def compter(self, nom, n=1):
+        with self._verrou:
+            self._compteurs[nom] = self._compteurs.get(nom, 0) + n
+
+    # Passages
+
+    def commencer_passage(self, nom, **champs):
+        """Ouvre le passage du thread courant (un passage interrompu par ``st.rerun`` est abandonné)."""
+        self._local.passage = Passage(nom, **champs)
+        return self._local.passage
+
+    def marquer(self, etape):
+        passage = getattr(self._local, "passage", None)
+        if passage is not None:
+            passage.marquer(etape)
+
+    def terminer_passage(self):
+        passage = self._local.__dict__.pop("passage", None)
+        if passage is None:
+            return None
+        passage.duree = time.perf_counter() - passage.debut
+        self._ajouter("passage", passage.duree)
+        for etape, duree in passage.etapes:
+            self._ajouter(etape, duree)
+        self.passages.append(passage)
+        if journal.isEnabledFor(logging.INFO):
+            journal.info("passage", extra={"champs": dict(
+                passage.champs, type="passage", nom=passage.nom, duree_ms=round(passage.duree * 1000, 3),
+                etapes={etape: round(duree * 1000, 3) for etape, duree in passage.etapes},
+                mesures=[[nom, round(duree * 1000, 3)] for nom, duree in passage.mesures])})
+        return passage
+
+    # Lecture
+
+    def statistiques(self):
+        """Une ligne par mesure : appels, p50, p95 et maximum (ms) sur la fenêtre, temps total de la fenêtre."""
+        with self._verrou:
+            fenetres = {nom: np.array(durees) for nom, durees in self._durees.items()}
+            appels = dict(self._appels)
+        lignes = [(nom, appels[nom], *(np.percentile(durees, [50, 95]) * 1000), durees.max() * 1000, durees.sum())
+                  for nom, durees in fenetres.items()]
+        df = pd.DataFrame(lignes, columns=['Mesure', 'Appels', 'p50_ms', 'p95_ms', 'Max_ms', 'Total_s'])
+        return df.round({'p50_ms': 2, 'p95_ms': 2, 'Max_ms': 2, 'Total_s': 3}).sort_values(
+            'Total_s', ascending=False, ignore_index=True)
+
+    def compteurs(self):
+        with self._verrou:
+            return pd.DataFrame(sorted(self._compteurs.items()), columns=['Compteur', 'Valeur'])
+
+    def reinitialiser(self):
+        with self._verrou:
+            self._durees.clear()
+            self._appels.clear()
+            self._compteurs.clear()
+            self.passages.clear()
+
+
+class Profil:
+    """Profilage d'un seul passage, avec cProfile ou pyinstrument (s'il est installé)."""
+
+    def __init__(self, outil="cProfile"):
+        if outil not in PROFILEURS:
+            raise ValueError(f"Profileur inconnu : {outil}")
+        self.outil = outil
+        self._profileur = None
+
+    def demarrer(self):
+        if self.outil == "pyinstrument":
+            from pyinstrument import Profiler  # optionnel : ImportError si absent
+
+            self._profileur = Profiler()
+            self._profileur.start()
+        else:
+            self._profileur = cProfile.Profile()
+            self._profileur.enable()
+
+    def arreter(self, lignes=40):
+        """Arrête le profilage ; renvoie le rapport texte."""
+        if self.outil == "pyinstrument":
+            self._profileur.stop()
+            return self._profileur.output_text()
+        self._profileur.disable()
+        texte = io.StringIO()
+        pstats.Stats(self._profileur, stream=texte).sort_stats("cumulative").print_stats(lignes)
+        return texte.getvalue()
+
+
+registre = Mesures()
+chrono = registre.chrono
+mesurer = registre.mesurer
+compter = registre.compter
+marquer = registre.marquer
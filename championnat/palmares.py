@@ -0,0 +1,166 @@
+"""Palmarès ordonnés, tenus à jour à chaque mutation.
+
+Un ``Palmares`` garde les entrées triées (``SortedList``) globalement et par
+groupe (catégorie, équipe) : un match ne déplace que les deux athlètes
+concernés (O(log n)), et le haut du classement, le rang d'un athlète ou une
+page de classement se lisent sans retrier les tables. Les égalités sont
+départagées de façon déterministe : points, puis victoires, puis
+performance, puis nom.
+
+Un palmarès vide rempli d'un bloc (chargement d'un instantané, écrit dans
+l'ordre du classement) est trié en un passage linéaire ; ses listes par
+groupe ne sont construites qu'à leur première utilisation.
+"""
+from operator import neg
+
+from sortedcontainers import SortedList
+
+
+def cle_joueur(joueur, ligne):
+    return (-ligne['Points'], -ligne['Victoires'], -ligne['Performance'], joueur)
+
+
+def cles_joueurs(colonnes):
+    """``cle_joueur`` sur des colonnes entières (listes), sans appel par ligne."""
+    return list(zip(map(neg, colonnes['Points']), map(neg, colonnes['Victoires']), map(neg, colonnes['Performance']),
+                    colonnes['Joueur']))
+
+
+def cle_equipe(equipe, stats):
+    return (-stats['Points_Totaux'], -stats['Victoires_Totaux'], equipe)
+
+
+class Palmares:
+    def __init__(self, cle, groupes=()):
+        self.cle = cle
+        self.groupes = tuple(groupes)     # colonnes de regroupement, ex. ('Categorie', 'Equipe')
+        self.tous = SortedList()
+        self._par_groupe = {groupe: {} for groupe in self.groupes}  # colonne -> valeur -> SortedList
+        self._groupes_differes = False    # listes par groupe pas encore construites
+        self._entrees = {}                # nom -> (clé, valeurs des groupes)
+
+    def __len__(self):
+        return len(self.tous)
+
+    def __contains__(self, nom):
+        return nom in self._entrees
+
+    @property
+    def par_groupe(self):
+        if self._groupes_differes:
+            listes = {}
+            for cle in self.tous:  # parcours dans l'ordre : chaque liste de groupe sort déjà triée
+                for cle_groupe in zip(self.groupes, self._entrees[cle[-1]][1]):
+                    listes.setdefault(cle_groupe, []).append(cle)
+            for (groupe, valeur), cles in listes.items():
+                self._par_groupe[groupe][valeur] = SortedList(cles)
+            self._groupes_differes = False
+        return self._par_groupe
+
+    def placer(self, nom, ligne):
+        """Insère ou repositionne une entrée après une modification de ``ligne``."""
+        par_groupe = self.par_groupe  # listes différées construites avant toute modification
+        self.retirer(nom)
+        cle = self.cle(nom, ligne)
+        valeurs = tuple(ligne[groupe] for groupe in self.groupes)
+        self.tous.add(cle)
+        for groupe, valeur in zip(self.groupes, valeurs):
+            par_groupe[groupe].setdefault(valeur, SortedList()).add(cle)
+        self._entrees[nom] = (cle, valeurs)
+
+    def placer_lot(self, lignes):
+        """Insère d'un bloc des entrées (``nom -> ligne``) : un tri puis une fusion par liste."""
+        if not self._entrees:
+            self.charger(list(lignes), [self.cle(nom, ligne) for nom, ligne in lignes.items()],
+                         [tuple([ligne[groupe] for groupe in self.groupes]) for ligne in lignes.values()])
+            return
+        par_groupe = self.par_groupe
+        cles, nouvelles = [], {}
+        for nom, ligne in lignes.items():
+            if nom in self._entrees:
+                self.retirer(nom)
+            cle = self.cle(nom, ligne)
+            valeurs = tuple([ligne[groupe] for groupe in self.groupes])
+            self._entrees[nom] = (cle, valeurs)
+            cles.append(cle)
+            for cle_groupe in zip(self.groupes, valeurs):
+                nouvelles.setdefault(cle_groupe, []).append(cle)
+        self.tous.update(cles)
+        for (groupe, valeur), cles_groupe in nouvelles.items():
+            par_groupe[groupe].setdefault(valeur, SortedList()).update(cles_groupe)
+
+    def charger(self, noms, cles, valeurs):
+        """Remplit un palmarès vide : ``cles`` et ``valeurs`` (des groupes) alignées sur ``noms``."""
+        self._entrees = dict(zip(noms, zip(cles, valeurs)))
+        self.tous = SortedList(cles)
+        self._groupes_differes = bool(self.groupes) and bool(self._entrees)
+
+    def retirer(self, nom):
+        if nom not in self._entrees:
+            return
+        par_groupe = self.par_groupe
+        cle, valeurs = self._entrees.pop(nom)
+        self.tous.remove(cle)
+        for groupe, valeur in zip(self.groupes, valeurs):
+            liste = par_groupe[groupe][valeur]
+            liste.remove(cle)
+            if not liste:
+                del par_groupe[groupe][valeur]
+
+    def _liste(self, filtres):
+        """Liste triée correspondant aux filtres (``colonne -> valeur``, None = tous)."""
+        filtres = {groupe: valeur for groupe, valeur in filtres.items() if valeur is not None}
+        if not filtres:
+            return self.tous
+        listes = [self.par_groupe[groupe].get(valeur, ()) for groupe, valeur in filtres.items()]
+        if len(listes) == 1:
+            return listes[0]
+        # Plusieurs filtres : on parcourt la plus petite liste en vérifiant les autres groupes
+        plus_petite = min(listes, key=len)
+        positions = {groupe: self.groupes.index(groupe) for groupe in filtres}
+        return [cle for cle in plus_petite
+                if all(self._entrees[cle[-1]][1][positions[g]] == v for g, v in filtres.items())]
+
+    def noms(self, debut=0, taille=None, **filtres):
+        """Noms classés de ``debut`` à ``debut + taille`` (tout le reste si ``taille`` vaut None)."""
+        liste = self._liste(filtres)
+        fin = None if taille is None else debut + taille
+        return [cle[-1] for cle in liste[debut:fin]]
+
+    def page(self, debut=0, taille=None, recherche=None, tri="rang", **filtres):
+        """(nombre d'entrées retenues, [(rang, nom)]) pour une page du classement filtré.
+
+        ``recherche`` garde les noms contenant ce texte (sans tenir compte de la
+        casse) ; ``tri`` vaut "rang", "inverse" (du dernier au premier) ou "nom".
+        Le rang reste celui du classement filtré. Sans recherche ni tri par nom,
+        seule la page est lue.
+        """
+        liste = self._liste(filtres)
+        total = len(liste)
+        fin = total if taille is None else min(debut + taille, total)
+        if not recherche and tri == "rang":
+            return total, [(debut + i + 1, cle[-1]) for i, cle in enumerate(liste[debut:fin])]
+        if not recherche and tri == "inverse":
+            return total, [(total - i, liste[total - 1 - i][-1]) for i in range(debut, fin)]
+        texte = (recherche or "").casefold()
+        lignes = [(rang, cle[-1]) for rang, cle in enumerate(liste, 1) if texte in cle[-1].casefold()]
+        if tri == "nom":
+            lignes.sort(key=lambda ligne: ligne[1])
+        elif tri == "inverse":
+            lignes.reverse()
+        return len(lignes), lignes[debut:None if taille is None else debut + taille]
+
+    def top(self, k, **filtres):
+        return self.noms(0, k, **filtres)
+
+    def compter(self, **filtres):
+        return len(self._liste(filtres))
+
+    def rang(self, nom, **filtres):
+        """Rang (1 = premier) de ``nom`` dans le classement filtré, None s'il n'y figure pas."""
+        if nom not in self._entrees:
+            return None
+        cle, valeurs = self._entrees[nom]
+        if any(filtres.get(groupe) not in (None, valeur) for groupe, valeur in zip(self.groupes, valeurs)):
+            return None
+        return self._liste(filtres).index(cle) + 1  # O(log n) sur une SortedList
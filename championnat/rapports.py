@@ -0,0 +1,124 @@
+"""Génération des rapports PDF, à la demande et hors du thread Streamlit.
+
+Un rendu n'est lancé que lorsqu'un utilisateur le demande ; il s'exécute
+dans un pool de threads et son résultat est mis en cache sous l'empreinte
+du contenu (titre, statistiques, tableau). Un rendu en échec peut être
+redemandé : l'erreur est oubliée et le rendu relancé.
+
+Les grands tableaux sont découpés en ``LongTable`` de ``LIGNES_PAR_TABLE``
+lignes dont l'en-tête se répète à chaque page, ce qui accélère la mise en
+page. La mémoire n'est pas bornée pour autant : toutes les tables sont
+construites avant ``doc.build``.
+"""
+import hashlib
+import io
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from championnat import mesures
+from championnat.cache import CacheLRU
+
+LIGNES_PAR_TABLE = 1000
+
+
+@mesures.mesurer("export.pdf")
+def export_to_pdf(title, stats, table_data):
+    # ReportLab n'est chargé qu'au premier rendu
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import LongTable, Paragraph, SimpleDocTemplate, Spacer
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    styles = getSampleStyleSheet()
+    elements = []
+
+    elements.append(Paragraph(title, styles['Title']))
+    elements.append(Spacer(1, 12))
+
+    if stats:
+        elements.append(Paragraph("Statistiques", styles['Heading2']))
+        for label, value in stats.items():
+            elements.append(Paragraph(f"{label}: {value}", styles['Normal']))
+        elements.append(Spacer(1, 12))
+
+    if table_data is not None and not table_data.empty:
+        elements.append(Paragraph("Détails", styles['Heading2']))
+        entete = table_data.columns.tolist()
+        for debut in range(0, len(table_data), LIGNES_PAR_TABLE):
+            bloc = table_data.iloc[debut:debut + LIGNES_PAR_TABLE]
+            table = LongTable([entete] + bloc.astype(object).values.tolist(), repeatRows=1)
+            table.setStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ])
+            elements.append(table)
+
+    doc.build(elements)
+    buffer.seek(0)
+    return buffer
+
+
+def empreinte(title, stats, table_data):
+    h = hashlib.sha256()
+    h.update(title.encode())
+    h.update(json.dumps(stats, sort_keys=True, default=str).encode())
+    if table_data is not None:
+        h.update(json.dumps(table_data.columns.tolist()).encode())
+        h.update(pd.util.hash_pandas_object(table_data, index=False).values.tobytes())
+    return h.hexdigest()
+
+
+class ServiceRendu:
+    def __init__(self, travailleurs=2, taille_cache=16):
+        self._pool = ThreadPoolExecutor(max_workers=travailleurs, thread_name_prefix="rendu-pdf")
+        self._en_cours = {}
+        self._erreurs = CacheLRU(taille_cache)
+        self._resultats = CacheLRU(taille_cache)
+        self._verrou = threading.Lock()
+
+    def demander(self, title, stats, table_data):
+        """Lance le rendu s'il n'est ni en cache ni en cours (un échec précédent est oublié) ; renvoie sa clé."""
+        cle = empreinte(title, stats, table_data)
+        with self._verrou:
+            if cle in self._resultats or cle in self._en_cours:
+                return cle
+            self._erreurs.retirer(cle)
+            futur = self._pool.submit(lambda: export_to_pdf(title, stats, table_data).getvalue())
+            self._en_cours[cle] = futur
+        futur.add_done_callback(lambda f: self._terminer(cle, f))
+        return cle
+
+    def _terminer(self, cle, futur):
+        if futur.exception() is not None:
+            self._erreurs.ajouter(cle, futur.exception())
+        else:
+            self._resultats.ajouter(cle, futur.result())
+        with self._verrou:
+            self._en_cours.pop(cle, None)
+
+    def etat(self, cle):
+        """'pret', 'en_cours', 'erreur' ou 'inconnu' (jamais demandé ou évincé)."""
+        if cle in self._resultats:
+            return "pret"
+        with self._verrou:
+            if cle in self._en_cours:
+                return "en_cours"
+        return "erreur" if cle in self._erreurs else "inconnu"
+
+    def resultat(self, cle):
+        return self._resultats.lire(cle)
+
+    def erreur(self, cle):
+        return self._erreurs.lire(cle)
+
+
+service = ServiceRendu()
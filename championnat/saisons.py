@@ -0,0 +1,260 @@
+"""Archives des saisons et statistiques de carrière.
+
+Clôturer une saison l'archive puis ouvre la suivante dans le même stockage
+(événement ``saison`` : combats effacés, joueurs gardés avec des compteurs
+nuls, ou retirés). Chaque championnat (ligue régionale, etc.) a ses
+saisons ; une saison archivée est un instantané en colonnes en lecture seule
+(``<racine>/<championnat>/<saison>/``, voir ``championnat.instantane``)
+accompagné de ses cumuls : une ligne par joueur, par équipe et par
+catégorie, avec le rang final.
+
+Les cumuls de toutes les saisons sont regroupés dans ``<racine>/cumuls/`` à
+chaque archivage, avec les carrières des joueurs et les dynasties d'équipes
+déjà agrégées par championnat. Les requêtes sur plusieurs saisons ne lisent
+que ces tables, par projection, sans rouvrir les combats ni les instantanés
+des saisons ; la saison en cours peut s'y ajouter à la volée.
+"""
+import os
+import re
+import shutil
+import stat
+from datetime import datetime
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.ipc as ipc
+
+from championnat import evenements, instantane
+from championnat.classements import MoteurClassement
+
+ARCHIVES_PATH = "archives"
+CUMULS = "cumuls"
+TABLES_CUMULS = ("saisons", "joueurs", "equipes", "categories")
+
+
+def dossier(nom):
+    """Nom de répertoire sûr pour un championnat ou une saison."""
+    return re.sub(r"[^\w.-]+", "_", nom).strip("_") or "_"
+
+
+def chemin_saison(racine, championnat, saison):
+    return os.path.join(racine, dossier(championnat), dossier(saison))
+
+
+# Cumuls d'une saison
+
+def cumuls(moteur):
+    """Tables de cumuls (nom -> DataFrame) d'une saison, calculées sur le moteur."""
+    cle = {'Championnat': moteur.championnat, 'Saison': moteur.saison}
+    judo_data = moteur.judo_data
+    rangs = {joueur: rang for rang, joueur in enumerate(moteur.palmares.noms(), 1)}
+    joueurs = judo_data[['Joueur', 'Equipe', 'Categorie', 'Victoires', 'Defaites', 'Points']].assign(
+        Rang=judo_data['Joueur'].map(rangs).astype('int32')).sort_values('Rang', ignore_index=True)
+    equipes = moteur.classement_des_equipes()
+    membres = judo_data.groupby('Equipe', observed=True).size()
+    equipes = equipes.assign(Membres=equipes['Equipe'].map(membres).fillna(0).astype('int32'),
+                             Rang=pd.RangeIndex(1, len(equipes) + 1, dtype='int32'))
+    categories = judo_data.groupby('Categorie', observed=True).agg(
+        Athletes=('Joueur', 'size'), Victoires=('Victoires', 'sum'), Defaites=('Defaites', 'sum'),
+        Points=('Points', 'sum')).reset_index()
+    categories['Performance'] = (categories['Victoires'] / (categories['Victoires'] + categories['Defaites'])).fillna(0)
+    saisons = pd.DataFrame([{'Joueurs': len(moteur), 'Equipes': len(moteur.equipes), 'Combats': len(moteur.matchs),
+                             'Points': int(judo_data['Points'].sum()),
+                             'Archivee': datetime.now().isoformat(timespec="seconds")}])
+    tables = {"saisons": saisons, "joueurs": joueurs, "equipes": equipes, "categories": categories}
+    # Chaînes simples plutôt que catégories : les saisons n'ont pas les mêmes équipes
+    return {nom: _texte(df.assign(**cle)[['Championnat', 'Saison', *df.columns]]) for nom, df in tables.items()}
+
+
+def _texte(df):
+    return df.astype({colonne: str for colonne in ('Equipe', 'Categorie') if colonne in df.columns})
+
+
+# Archivage
+
+def archiver(moteur, racine=ARCHIVES_PATH):
+    """Archive la saison du moteur (instantané + cumuls) en lecture seule ; ValueError si elle l'est déjà."""
+    repertoire = chemin_saison(racine, moteur.championnat, moteur.saison)
+    if instantane.generation(repertoire) is not None:
+        raise ValueError(f"La saison {moteur.saison} ({moteur.championnat}) est déjà archivée.")
+    os.makedirs(repertoire, exist_ok=True)
+    instantane.ecrire(repertoire, moteur, moteur.seq,
+                      {f"cumul_{nom}": df for nom, df in cumuls(moteur).items()})
+    for dossier_courant, _, fichiers in os.walk(repertoire):
+        for fichier in fichiers:
+            os.chmod(os.path.join(dossier_courant, fichier), stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+    consolider(racine)
+    return repertoire
+
+
+def nouvelle_saison(stockage, championnat, saison, garder_joueurs=True, racine=ARCHIVES_PATH, table_categories=None):
+    """Archive la saison en cours puis ouvre ``saison`` dans le même stockage.
+
+    ``table_categories`` : table de poids de la nouvelle saison (la même si absente).
+    """
+    moteur = stockage.charger()
+    if (championnat, saison) == (moteur.championnat, moteur.saison) or \
+            instantane.generation(chemin_saison(racine, championnat, saison)) is not None:
+        raise ValueError(f"La saison {saison} ({championnat}) existe déjà.")
+    repertoire = archiver(moteur, racine)
+    try:
+        # Refusé par le moteur si d'autres événements sont arrivés depuis l'archivage
+        evenement = stockage.enregistrer(moteur, evenements.saison(championnat, saison, garder_joueurs, moteur.seq,
+                                                                   table_categories))
+    except Exception:
+        shutil.rmtree(repertoire, ignore_errors=True)  # archive incomplète : la clôture pourra être relancée
+        consolider(racine)
+        raise
+    stockage.compacter()
+    return evenement
+
+
+def saisons_archivees(racine=ARCHIVES_PATH):
+    """(championnat, saison, répertoire) des saisons archivées, d'après leurs métadonnées."""
+    trouvees = []
+    if not os.path.isdir(racine):
+        return trouvees
+    for championnat in sorted(os.listdir(racine)):
+        if championnat == CUMULS or not os.path.isdir(os.path.join(racine, championnat)):
+            continue
+        for saison in sorted(os.listdir(os.path.join(racine, championnat))):
+            repertoire = os.path.join(racine, championnat, saison)
+            meta = instantane.lire_meta(repertoire) if os.path.isdir(repertoire) else {}
+            if meta:
+                trouvees.append((meta["championnat"], meta["saison"], repertoire))
+    return trouvees
+
+
+def version_archives(racine=ARCHIVES_PATH):
+    """Change à chaque consolidation des cumuls (clé de cache)."""
+    try:
+        return os.stat(os.path.join(racine, CUMULS)).st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+
+def consolider(racine=ARCHIVES_PATH):
+    """Regroupe les cumuls de toutes les saisons archivées dans ``<racine>/cumuls/``.
+
+    Les carrières et les dynasties y sont aussi précalculées, par championnat.
+    """
+    archivees = saisons_archivees(racine)
+    repertoire = os.path.join(racine, CUMULS)
+    if not archivees:
+        shutil.rmtree(repertoire, ignore_errors=True)
+        return
+    tables = {nom: pa.concat_tables([instantane.lire_table(chemin, f"cumul_{nom}") for _, _, chemin in archivees],
+                                    promote_options="default") for nom in TABLES_CUMULS}
+    joueurs, equipes = tables["joueurs"].to_pandas(), tables["equipes"].to_pandas()
+    tables["carrieres"] = _agreger(_carriere(joueurs), ['Championnat', 'Joueur'], CARRIERE)
+    tables["dynasties"] = _agreger(_dynastie(equipes), ['Championnat', 'Equipe'], DYNASTIE)
+    os.makedirs(repertoire, exist_ok=True)
+    for nom, table in tables.items():
+        if isinstance(table, pd.DataFrame):
+            table = pa.Table.from_pandas(table, preserve_index=False)
+        chemin = os.path.join(repertoire, f"{nom}.arrow")
+        instantane.ecrire_table(chemin + ".tmp", table)
+        os.replace(chemin + ".tmp", chemin)
+
+
+# Carrières et dynasties : une ligne par saison, puis des sommes (et un minimum pour le rang)
+
+CARRIERE = {'Saisons': 'sum', 'Victoires': 'sum', 'Defaites': 'sum', 'Points': 'sum', 'Meilleur_Rang': 'min',
+            'Equipe': 'last'}
+DYNASTIE = {'Saisons': 'sum', 'Titres': 'sum', 'Podiums': 'sum', 'Points_Totaux': 'sum', 'Victoires_Totaux': 'sum'}
+
+
+def _carriere(joueurs):
+    # Un rang sans aucun point (saison blanche, ordre alphabétique) ne compte pas
+    rang = joueurs['Rang'].where(joueurs['Points'] > 0).astype('Int32')
+    return joueurs.assign(Saisons=1, Meilleur_Rang=rang)[['Championnat', 'Joueur', *CARRIERE]]
+
+
+def _dynastie(equipes):
+    classees = equipes['Points_Totaux'] > 0  # une saison sans points ne donne ni titre ni podium
+    rang = equipes['Rang'].fillna(0)         # 0 : saison en cours, pas encore de rang final
+    return equipes.assign(Saisons=1, Titres=(classees & (rang == 1)).astype('int32'),
+                          Podiums=(classees & rang.between(1, 3)).astype('int32'))[['Championnat', 'Equipe', *DYNASTIE]]
+
+
+def _agreger(df, cles, agregats):
+    return df.groupby(cles, sort=False).agg(agregats).reset_index()
+
+
+# Lecture
+
+def ouvrir(championnat, saison, racine=ARCHIVES_PATH):
+    """Moteur complet d'une saison archivée (à ne pas rattacher à un stockage)."""
+    return MoteurClassement.depuis_instantane(instantane.charger(chemin_saison(racine, championnat, saison)))
+
+
+def lire(championnat, saison, table="cumul_joueurs", colonnes=None, racine=ARCHIVES_PATH):
+    """Une table d'une saison archivée, lue par projection ; ``cumul_joueurs`` est déjà dans l'ordre du classement."""
+    return instantane.lire_table(chemin_saison(racine, championnat, saison), table, colonnes).to_pandas()
+
+
+def _en_cours(moteur, table):
+    courant = cumuls(moteur)[table]
+    if 'Rang' in courant:  # saison en cours : pas encore de rang final (ni titre, ni podium)
+        courant = courant.assign(Rang=pd.array([pd.NA] * len(courant), dtype='Int32'))
+    return courant
+
+
+def lire_cumuls(table, colonnes=None, championnat=None, racine=ARCHIVES_PATH, en_cours=None):
+    """Cumuls de toutes les saisons archivées (et de ``en_cours``, un moteur, s'il est donné)."""
+    chemin = os.path.join(racine, CUMULS, f"{table}.arrow")
+    morceaux = []
+    if os.path.exists(chemin):
+        lue = ipc.open_file(pa.memory_map(chemin)).read_all()
+        if championnat is not None:
+            lue = lue.filter(pc.equal(lue['Championnat'], championnat))
+        morceaux.append(lue.select(colonnes).to_pandas() if colonnes else lue.to_pandas())
+    if en_cours is not None and championnat in (None, en_cours.championnat):
+        courant = _en_cours(en_cours, table)
+        morceaux.append(courant[colonnes] if colonnes else courant)
+    if not morceaux:
+        return pd.DataFrame(columns=colonnes)
+    return pd.concat(morceaux, ignore_index=True)
+
+
+def _bilans(table, cle, agregats, partiel, table_saison, championnat, racine, en_cours):
+    """Bilans précalculés, complétés par la saison en cours et regroupés entre championnats si besoin."""
+    bilan = lire_cumuls(table, championnat=championnat, racine=racine)
+    if en_cours is not None and championnat in (None, en_cours.championnat):
+        bilan = pd.concat([bilan, partiel(_en_cours(en_cours, table_saison))], ignore_index=True)
+    if cle not in bilan:
+        return pd.DataFrame(columns=[cle, *agregats])
+    if not bilan[cle].is_unique:  # plusieurs championnats, ou la saison en cours
+        return _agreger(bilan, [cle], agregats)
+    return bilan.drop(columns='Championnat')
+
+
+def carrieres(championnat=None, racine=ARCHIVES_PATH, en_cours=None):
+    """Bilan de carrière par joueur : saisons, victoires, défaites, points, meilleur rang, dernière équipe."""
+    bilan = _bilans("carrieres", 'Joueur', CARRIERE, _carriere, "joueurs", championnat, racine, en_cours)
+    bilan['Performance'] = (bilan['Victoires'] / (bilan['Victoires'] + bilan['Defaites'])).fillna(0)
+    return bilan.sort_values(['Victoires', 'Points', 'Joueur'], ascending=[False, False, True], ignore_index=True)
+
+
+def dynasties(championnat=None, racine=ARCHIVES_PATH, en_cours=None):
+    """Équipes sur plusieurs saisons : titres (1re place), podiums, points et victoires cumulés."""
+    bilan = _bilans("dynasties", 'Equipe', DYNASTIE, _dynastie, "equipes", championnat, racine, en_cours)
+    return bilan.sort_values(['Titres', 'Podiums', 'Points_Totaux', 'Equipe'], ascending=[False, False, False, True],
+                             ignore_index=True)
+
+
+def evolution_categories(mesure="Performance", championnat=None, racine=ARCHIVES_PATH, en_cours=None):
+    """Une ligne par catégorie, une colonne par saison (``mesure`` : Performance, Points, Athletes...)."""
+    sommes = ['Victoires', 'Defaites'] if mesure == 'Performance' else [mesure]
+    categories = lire_cumuls("categories", ['Saison', 'Categorie', *sommes], championnat, racine, en_cours)
+    if categories.empty:
+        return pd.DataFrame()
+    # Plusieurs championnats sur une même saison : on additionne avant de recalculer la performance
+    totaux = categories.groupby(['Categorie', 'Saison'], sort=False)[sommes].sum()
+    if mesure == 'Performance':
+        valeurs = (totaux['Victoires'] / (totaux['Victoires'] + totaux['Defaites'])).fillna(0)
+    else:
+        valeurs = totaux[mesure]
+    tableau = valeurs.unstack('Saison')
+    return tableau.reindex(index=pd.unique(categories['Categorie']), columns=sorted(tableau.columns))
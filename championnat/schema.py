@@ -0,0 +1,78 @@
+"""Schéma typé des tables du moteur.
+
+Un DataFrame relu depuis du JSON (ou créé vide avec ``columns=[...]``) n'a
+que des colonnes ``object`` et un index de chaînes. Les vues du moteur sont
+donc toujours converties à ce schéma : compteurs en int32, poids en int16,
+performance en float32, équipes et catégories en ``category``, un
+identifiant entier interne (``Id``) distinct du nom affiché et un
+``RangeIndex``. Les mêmes bornes filtrent les valeurs à l'import et à
+chaque mutation.
+"""
+import numpy as np
+import pandas as pd
+
+from championnat.categories import TABLE_PAR_DEFAUT, type_categorie
+
+ENTIERS = {
+    'Id': np.int32, 'Poids': np.int16, 'Victoires': np.int32, 'Defaites': np.int32, 'Points': np.int32,
+    'Points_Totaux': np.int32, 'Victoires_Totaux': np.int32,
+}
+OCTETS_PAR_ATHLETE_MAX = 64  # cible de judo_data (noms de 13 caractères), vérifiée par python -m benchmarks
+
+
+def types(table=TABLE_PAR_DEFAUT):
+    return dict(ENTIERS, Equipe='category', Joueur='str', Performance=np.float32, Categorie=type_categorie(table))
+
+
+def typer(df, table=TABLE_PAR_DEFAUT):
+    """Convertit les colonnes présentes aux types du schéma, avec un RangeIndex."""
+    df = df.astype({colonne: type_ for colonne, type_ in types(table).items() if colonne in df.columns})
+    return df.reset_index(drop=True)
+
+
+def construire(colonnes, table=TABLE_PAR_DEFAUT):
+    """DataFrame typé depuis des listes Python par colonne, sans passer par des colonnes ``object``."""
+    schema = types(table)
+    typees = {}
+    for colonne, valeurs in colonnes.items():
+        type_ = schema[colonne]
+        if isinstance(type_, pd.CategoricalDtype):
+            typees[colonne] = categoriel(valeurs, type_)
+        elif type_ == 'category':
+            typees[colonne] = categoriel(valeurs)
+        elif type_ == 'str':
+            typees[colonne] = pd.array(valeurs, dtype='str')
+        else:
+            typees[colonne] = np.array(valeurs, dtype=type_)
+    return pd.DataFrame(typees)
+
+
+def categoriel(valeurs, type_=None):
+    """Codage par dictionnaire : plus rapide que ``pd.Categorical`` sur une liste de chaînes."""
+    if type_ is None:
+        type_ = pd.CategoricalDtype(sorted(set(valeurs)))
+    codes = {categorie: code for code, categorie in enumerate(type_.categories)}
+    return pd.Categorical.from_codes([codes.get(valeur, -1) for valeur in valeurs], dtype=type_)
+
+
+def borner(colonne, valeur):
+    """Valeur entière d'une colonne ; ValueError si elle sort de son type."""
+    valeur = int(valeur)
+    limites = np.iinfo(ENTIERS[colonne])
+    if not limites.min <= valeur <= limites.max:
+        raise ValueError(f"{colonne} hors limites : {valeur}")
+    return valeur
+
+
+def verifier_bornes(df):
+    """Contrôle vectorisé de ``borner`` sur les colonnes entières présentes."""
+    for colonne, type_ in ENTIERS.items():
+        if colonne in df.columns and len(df):
+            limites = np.iinfo(type_)
+            if not df[colonne].between(limites.min, limites.max).all():
+                raise ValueError(f"{colonne} hors limites")
+
+
+def octets_par_ligne(df):
+    """Mémoire occupée par ligne, chaînes comprises."""
+    return df.memory_usage(deep=True).sum() / max(len(df), 1)
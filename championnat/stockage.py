@@ -0,0 +1,349 @@
+"""Chargement et enregistrement du championnat.
+
+Deux implémentations partagent la même interface (``charger``,
+``enregistrer``, ``compacter``) :
+
+* ``StockageJournal`` : instantané en colonnes ``judo_data.arrow`` + journal
+  d'événements ;
+* ``StockageSQLite`` : base SQLite en mode WAL, tables indexées et une
+  transaction par mutation, pour plusieurs officiels en parallèle.
+
+Avant d'appliquer une mutation, chaque stockage rattrape, sous verrou, les
+événements écrits entre-temps par d'autres sessions ou processus.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+from championnat import mesures
+from championnat.classements import MoteurClassement
+from championnat.journal import SEUIL_COMPACTION, Journal
+
+STOCKAGE_PAR_DEFAUT = "json"
+
+
+def reconstruire(instantane, evenements):
+    return MoteurClassement.recalculer(instantane, evenements)
+
+
+def ouvrir_stockage(url=None, journal=None):
+    """``json`` (défaut) ou ``sqlite:chemin.db`` ; lu dans ``JUDO_STOCKAGE`` si absent.
+
+    Une base SQLite vide importe le championnat JSON historique (``journal``).
+    """
+    url = url or os.environ.get("JUDO_STOCKAGE", STOCKAGE_PAR_DEFAUT)
+    if url == "json":
+        return StockageJournal(journal)
+    if url.startswith("sqlite:"):
+        return StockageSQLite(url[len("sqlite:"):], legacy=StockageJournal(journal))
+    raise ValueError(f"Stockage inconnu : {url}")
+
+
+class StockageJournal:
+    """Instantané (``judo_data.arrow``) + journal d'événements en ajout seul."""
+
+    def __init__(self, journal=None):
+        self.journal = journal or Journal()
+
+    @mesures.mesurer("stockage.charger")
+    def charger(self):
+        instantane = self.journal.charger_instantane()
+        return MoteurClassement.recalculer(instantane, self.journal.relire(instantane.get("journal_seq", 0)))
+
+    @mesures.mesurer("stockage.enregistrer")
+    def enregistrer(self, moteur, evenement):
+        with self.journal.verrou():
+            self._rattraper(moteur)
+            # Applique la mutation au moteur puis l'ajoute au journal (une ligne, fsync)
+            moteur.appliquer(evenement)
+            evenement = self.journal.ecrire(evenement)
+            moteur.seq = evenement["seq"]
+        if evenement["seq"] % SEUIL_COMPACTION == 0:
+            self.compacter()
+        return evenement
+
+    def dernier_seq(self):
+        return self.journal.dernier_seq()
+
+    @mesures.mesurer("stockage.rattraper")
+    def rattraper(self, moteur):
+        """Applique au moteur les événements écrits par d'autres processus."""
+        with self.journal.verrou():
+            self._rattraper(moteur)
+
+    def evenements_depuis(self, seq):
+        """Événements postérieurs à ``seq`` ; None si une compaction en a absorbé une partie."""
+        manquants = list(self.journal.relire(seq))
+        if manquants and manquants[0]["seq"] == seq + 1:
+            return manquants
+        if manquants or self.journal.dernier_seq() != seq:
+            return None
+        return []
+
+    def _rattraper(self, moteur):
+        manquants = self.evenements_depuis(moteur.seq)
+        if manquants is None:
+            moteur.remplacer(self.charger())
+        for evenement in manquants or []:
+            moteur.appliquer(evenement)
+
+    @mesures.mesurer("stockage.compacter")
+    def compacter(self):
+        self.journal.compacter(reconstruire)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS equipes (
+    nom TEXT PRIMARY KEY,
+    points_totaux INTEGER NOT NULL,
+    victoires_totaux INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS athletes (
+    nom TEXT PRIMARY KEY,
+    id INTEGER NOT NULL,
+    equipe TEXT NOT NULL,
+    poids INTEGER NOT NULL,
+    victoires INTEGER NOT NULL,
+    defaites INTEGER NOT NULL,
+    points INTEGER NOT NULL,
+    performance REAL NOT NULL,
+    categorie TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS athletes_equipe ON athletes (equipe);
+CREATE INDEX IF NOT EXISTS athletes_categorie ON athletes (categorie, points DESC);
+CREATE INDEX IF NOT EXISTS athletes_points ON athletes (points DESC);
+CREATE TABLE IF NOT EXISTS matchs (
+    id TEXT PRIMARY KEY,
+    joueur1 TEXT NOT NULL,
+    joueur2 TEXT NOT NULL,
+    vainqueur TEXT NOT NULL,
+    points INTEGER NOT NULL,
+    annule INTEGER NOT NULL DEFAULT 0,
+    ts REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS matchs_joueur1 ON matchs (joueur1);
+CREATE INDEX IF NOT EXISTS matchs_joueur2 ON matchs (joueur2);
+CREATE INDEX IF NOT EXISTS matchs_ts ON matchs (ts);
+CREATE TABLE IF NOT EXISTS evenements (
+    seq INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    evenement TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    cle TEXT PRIMARY KEY,
+    valeur TEXT NOT NULL
+);
+"""
+
+
+class StockageSQLite:
+    """Base SQLite (WAL) : athlètes, équipes, matchs et événements indexés."""
+
+    def __init__(self, chemin="judo.db", legacy=None):
+        self.chemin = chemin
+        # Une connexion partagée par les threads de Streamlit, protégée par un verrou
+        self.connexion = sqlite3.connect(chemin, isolation_level=None, check_same_thread=False, timeout=30)
+        self.connexion.execute("PRAGMA journal_mode=WAL")
+        self.connexion.execute("PRAGMA synchronous=NORMAL")
+        self.connexion.executescript(SCHEMA)
+        self._migrer()
+        self._verrou = threading.RLock()
+        if self._vide():
+            self.importer_legacy(legacy or StockageJournal())
+
+    def _migrer(self):
+        colonnes = {ligne[1] for ligne in self.connexion.execute("PRAGMA table_info(athletes)")}
+        if "id" not in colonnes:
+            # Base antérieure à l'Id persistant : on fige les Id attribués jusqu'ici (ordre des lignes)
+            self.connexion.executescript("""
+                BEGIN IMMEDIATE;
+                ALTER TABLE athletes ADD COLUMN id INTEGER NOT NULL DEFAULT 0;
+                UPDATE athletes SET id = (SELECT rang FROM (
+                    SELECT rowid AS ligne, ROW_NUMBER() OVER (ORDER BY rowid) - 1 AS rang FROM athletes)
+                    WHERE ligne = athletes.rowid);
+                COMMIT;
+            """)
+
+    def _vide(self):
+        return self.connexion.execute("SELECT NOT EXISTS (SELECT 1 FROM athletes) "
+                                      "AND NOT EXISTS (SELECT 1 FROM evenements)").fetchone()[0]
+
+    @contextmanager
+    def _transaction(self):
+        with self._verrou:
+            self.connexion.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.connexion
+            except BaseException:
+                self.connexion.execute("ROLLBACK")
+                raise
+            self.connexion.execute("COMMIT")
+
+    @mesures.mesurer("stockage.charger")
+    def charger(self):
+        with self._verrou:
+            judo_data = pd.read_sql_query(
+                "SELECT id AS Id, equipe AS Equipe, nom AS Joueur, poids AS Poids, victoires AS Victoires, "
+                "defaites AS Defaites, points AS Points FROM athletes "
+                # Ordre du classement : le palmarès se reconstruit sans tri
+                "ORDER BY points DESC, victoires DESC, performance DESC, nom", self.connexion)
+            # Les annulés aussi : un identifiant annulé ne doit pas être réenregistré par un lot renvoyé
+            matchs = pd.read_sql_query(
+                "SELECT id, joueur1, joueur2, vainqueur, points, ts AS date, annule FROM matchs ORDER BY rowid",
+                self.connexion)
+            meta = self.connexion.execute("SELECT cle, valeur FROM meta").fetchall()
+            seq = self.connexion.execute("SELECT COALESCE(MAX(seq), 0) FROM evenements").fetchone()[0]
+        instantane = {"judo_data": judo_data.to_dict(), "matchs": matchs.to_dict("records"), "journal_seq": seq}
+        instantane.update((cle, json.loads(valeur)) for cle, valeur in meta)  # categories, championnat, saison
+        moteur = MoteurClassement.depuis_instantane(instantane)
+        moteur.prendre_modifications()
+        return moteur
+
+    @mesures.mesurer("stockage.enregistrer")
+    def enregistrer(self, moteur, evenement):
+        """Applique et persiste une mutation dans une seule transaction."""
+        try:
+            with self._transaction() as connexion:
+                self._rattraper(moteur, connexion)
+                moteur.appliquer(evenement)
+                evenement = dict(evenement, ts=time.time())
+                curseur = connexion.execute("INSERT INTO evenements (ts, evenement) VALUES (?, ?)",
+                                            (evenement["ts"], json.dumps(evenement, ensure_ascii=False)))
+                evenement["seq"] = moteur.seq = curseur.lastrowid
+                self._ecrire_matchs(connexion, evenement)
+                if evenement["type"] == "saison":
+                    self._ecrire_meta(connexion, moteur)
+                self._ecrire_modifications(connexion, moteur)
+        except Exception:
+            moteur.remplacer(self.charger())  # le moteur ne doit pas diverger de la base
+            raise
+        if evenement["seq"] % SEUIL_COMPACTION == 0:
+            self.compacter()
+        return evenement
+
+    def dernier_seq(self):
+        with self._verrou:
+            return self.connexion.execute("SELECT COALESCE(MAX(seq), 0) FROM evenements").fetchone()[0]
+
+    @mesures.mesurer("stockage.rattraper")
+    def rattraper(self, moteur):
+        """Applique au moteur les événements écrits par d'autres processus."""
+        with self._verrou:
+            self._rattraper(moteur, self.connexion)
+
+    def evenements_depuis(self, seq):
+        """Événements postérieurs à ``seq`` ; None si une compaction en a absorbé une partie."""
+        with self._verrou:
+            return self._evenements_depuis(self.connexion, seq)
+
+    def _evenements_depuis(self, connexion, seq):
+        manquants = connexion.execute("SELECT seq, evenement FROM evenements WHERE seq > ? ORDER BY seq",
+                                      (seq,)).fetchall()
+        if manquants and manquants[0][0] != seq + 1:
+            return None
+        return [dict(json.loads(evenement), seq=n) for n, evenement in manquants]
+
+    def _rattraper(self, moteur, connexion):
+        manquants = self._evenements_depuis(connexion, moteur.seq)
+        if manquants is None:
+            moteur.remplacer(self.charger())
+        for evenement in manquants or []:
+            moteur.appliquer(evenement)
+        moteur.prendre_modifications()  # déjà en base
+
+    def _ecrire_matchs(self, connexion, evenement):
+        if evenement["type"] == "match":
+            connexion.execute("INSERT INTO matchs (id, joueur1, joueur2, vainqueur, points, ts) VALUES (?, ?, ?, ?, ?, ?)",
+                              (evenement["id"], evenement["joueur1"], evenement["joueur2"],
+                               evenement["vainqueur"], evenement["points"], evenement.get("date", evenement["ts"])))
+        elif evenement["type"] == "matchs":
+            lignes = evenement["lignes"]
+            # Identifiants déjà en base ignorés : un lot renvoyé ne compte pas deux fois
+            connexion.executemany(
+                "INSERT OR IGNORE INTO matchs (id, joueur1, joueur2, vainqueur, points, ts) VALUES (?, ?, ?, ?, ?, ?)",
+                zip(lignes["id"], lignes["joueur1"], lignes["joueur2"], lignes["vainqueur"], lignes["points"],
+                    [date or evenement["ts"] for date in lignes["date"]]))
+        elif evenement["type"] == "annulation":
+            connexion.execute("UPDATE matchs SET annule = 1 WHERE id = ?", (evenement["match"],))
+        elif evenement["type"] == "saison":
+            connexion.execute("DELETE FROM matchs")
+
+    def _ecrire_meta(self, connexion, moteur):
+        connexion.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", [
+            ("categories", json.dumps(list(moteur.table_categories))),
+            ("championnat", json.dumps(moteur.championnat, ensure_ascii=False)),
+            ("saison", json.dumps(moteur.saison, ensure_ascii=False)),
+        ])
+
+    def _ecrire_modifications(self, connexion, moteur):
+        joueurs, equipes = moteur.prendre_modifications()
+        presents = [moteur.joueur(j) for j in sorted((j for j in joueurs if j in moteur), key=moteur.index.position)]
+        connexion.executemany("DELETE FROM athletes WHERE nom = ?", [(j,) for j in joueurs if j not in moteur])
+        connexion.executemany(
+            "INSERT INTO athletes (nom, id, equipe, poids, victoires, defaites, points, performance, categorie) "
+            "VALUES (:Joueur, :Id, :Equipe, :Poids, :Victoires, :Defaites, :Points, :Performance, :Categorie) "
+            "ON CONFLICT (nom) DO UPDATE SET id = excluded.id, equipe = excluded.equipe, poids = excluded.poids, "
+            "victoires = excluded.victoires, defaites = excluded.defaites, points = excluded.points, "
+            "performance = excluded.performance, categorie = excluded.categorie", presents)
+        connexion.executemany("DELETE FROM equipes WHERE nom = ?", [(e,) for e in equipes if e not in moteur.equipes])
+        connexion.executemany(
+            "INSERT INTO equipes (nom, points_totaux, victoires_totaux) VALUES (?, ?, ?) "
+            "ON CONFLICT (nom) DO UPDATE SET points_totaux = excluded.points_totaux, "
+            "victoires_totaux = excluded.victoires_totaux",
+            [(e, moteur.equipes[e]['Points_Totaux'], moteur.equipes[e]['Victoires_Totaux'])
+             for e in equipes if e in moteur.equipes])
+
+    def importer_legacy(self, stockage):
+        """Importe un championnat au format JSON historique dans une base vide."""
+        moteur = stockage.charger()
+        if not len(moteur) and not moteur.matchs:
+            return
+        with self._transaction() as connexion:
+            self._ecrire_meta(connexion, moteur)
+            connexion.executemany(
+                "INSERT INTO matchs (id, joueur1, joueur2, vainqueur, points, ts, annule) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(m["id"], m["joueur1"], m["joueur2"], m["vainqueur"], m["points"], m["date"], m["annule"])
+                 for m in moteur.combats.matchs(annules=True)])
+            self._ecrire_modifications(connexion, moteur)  # un moteur rechargé marque tout comme modifié
+
+    @mesures.mesurer("stockage.compacter")
+    def compacter(self):
+        """Supprime les événements déjà reflétés dans les tables, puis vide le WAL.
+
+        Le dernier événement est gardé : ``seq`` continue de croître (clé
+        entière réattribuée à partir du maximum) et un lecteur en retard
+        constate le trou et recharge depuis les tables.
+        """
+        with self._transaction() as connexion:
+            connexion.execute("DELETE FROM evenements WHERE seq < (SELECT MAX(seq) FROM evenements)")
+        with self._verrou:
+            self.connexion.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    # Requêtes indexées
+
+    def classement_joueurs(self, categorie=None, equipe=None, limite=None):
+        conditions, parametres = [], []
+        if categorie is not None:
+            conditions.append("categorie = ?")
+            parametres.append(categorie)
+        if equipe is not None:
+            conditions.append("equipe = ?")
+            parametres.append(equipe)
+        requete = ("SELECT nom AS Joueur, equipe AS Equipe, points AS Points, victoires AS Victoires FROM athletes"
+                   + (" WHERE " + " AND ".join(conditions) if conditions else "")
+                   + " ORDER BY points DESC" + (" LIMIT ?" if limite else ""))
+        if limite:
+            parametres.append(limite)
+        with self._verrou:
+            return pd.read_sql_query(requete, self.connexion, params=parametres)
+
+    def classement_equipes(self, limite=None):
+        requete = ("SELECT nom AS Equipe, points_totaux AS Points_Totaux, victoires_totaux AS Victoires_Totaux "
+                   "FROM equipes ORDER BY points_totaux DESC" + (" LIMIT ?" if limite else ""))
+        with self._verrou:
+            return pd.read_sql_query(requete, self.connexion, params=[limite] if limite else [])
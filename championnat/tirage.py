@@ -0,0 +1,211 @@
+"""Tirage au sort par catégorie de poids et planification sur les tapis.
+
+Les athlètes d'une catégorie sont classés comme au palmarès (têtes de
+série). Au-delà de ``SEUIL_POULE`` athlètes on construit un tableau à
+élimination directe avec repêchage (format IJF : les perdants des quarts
+s'affrontent par moitié de tableau, puis rencontrent pour le bronze le
+perdant de la demi-finale opposée) ; en dessous, une poule où chacun
+rencontre tous les autres. Les coéquipiers sont placés de façon à se
+rencontrer le plus tard possible.
+
+Un combat référence ses participants par nom, ou par ``("V", id)`` /
+``("P", id)`` : vainqueur ou perdant d'un combat précédent. La planification
+répartit ensuite tous les combats sur K tapis (ordonnancement de liste, par
+chemin critique) en respectant un temps de repos minimal entre deux combats
+d'un même athlète.
+"""
+import heapq
+
+import pandas as pd
+
+SEUIL_POULE = 5
+DUREE_COMBAT = 6   # minutes, combat de 4 min + golden score et changement de tapis
+REPOS_MIN = 10     # minutes entre deux combats d'un même athlète
+
+
+def classer(athletes):
+    """Ordre des têtes de série : celui du palmarès (points, victoires, performance, nom)."""
+    return athletes.sort_values(by=['Points', 'Victoires', 'Performance', 'Joueur'],
+                                ascending=[False, False, False, True])
+
+
+def ordre_tableau(taille):
+    """Positions des têtes de série 1..taille (la 1 et la 2 ne se croisent qu'en finale)."""
+    ordre = [0]
+    while len(ordre) < taille:
+        n = 2 * len(ordre)
+        ordre = [p for position in ordre for p in (position, n - 1 - position)]
+    # ordre[k] est le rang de la tête de série placée en position k ; on l'inverse
+    positions = [0] * taille
+    for position, rang in enumerate(ordre):
+        positions[rang] = position
+    return positions
+
+
+def tour_de_rencontre(position1, position2):
+    """Tour (1 = premier) où deux positions du tableau peuvent se rencontrer."""
+    return (position1 ^ position2).bit_length()
+
+
+def placer(athletes):
+    """Place les athlètes classés dans le tableau ; ``None`` marque une exemption."""
+    n = len(athletes)
+    taille = 1 << max(n - 1, 1).bit_length()
+    libres = ordre_tableau(taille)[:n]  # les exemptions reviennent aux meilleures têtes de série
+    tableau = [None] * taille
+    positions_equipe = {}
+    for joueur, equipe in zip(athletes['Joueur'], athletes['Equipe']):
+        coequipiers = positions_equipe.setdefault(equipe, [])
+        # Première position libre (dans l'ordre des têtes de série) éloignant le plus des coéquipiers
+        meilleure = max(libres, key=lambda p: min((tour_de_rencontre(p, q) for q in coequipiers), default=taille))
+        libres.remove(meilleure)
+        tableau[meilleure] = joueur
+        coequipiers.append(meilleure)
+    # Coéquipiers encore face à face au premier tour : l'un est échangé avec un athlète d'une autre équipe
+    # dont l'adversaire n'est pas de la leur (rencontres du premier tour d'abord, puis exemptions, en partant
+    # des plus faibles têtes de série). Impossible seulement si l'équipe compte plus de taille / 2 athlètes.
+    equipe_de = dict(zip(athletes['Joueur'], athletes['Equipe']))
+    par_rang = [position for position in reversed(ordre_tableau(taille)) if tableau[position] is not None]
+    candidats = ([p for p in par_rang if tableau[p ^ 1] is not None]
+                 + [p for p in par_rang if tableau[p ^ 1] is None])
+    for i in range(0, taille, 2):
+        if tableau[i] is None or tableau[i + 1] is None or equipe_de[tableau[i]] != equipe_de[tableau[i + 1]]:
+            continue
+        equipe = equipe_de[tableau[i]]
+        for k in candidats:
+            adversaire = tableau[k ^ 1]
+            if k // 2 != i // 2 and equipe_de[tableau[k]] != equipe and (
+                    adversaire is None or equipe_de[adversaire] != equipe):
+                tableau[i + 1], tableau[k] = tableau[k], tableau[i + 1]
+                break
+    return tableau
+
+
+class _Combats:
+    def __init__(self, categorie):
+        self.categorie = categorie
+        self.liste = []
+
+    def ajouter(self, tour, rouge, bleu):
+        """Renvoie (vainqueur, perdant) ; une exemption qualifie l'adversaire sans combat."""
+        if rouge is None or bleu is None:
+            return (bleu if rouge is None else rouge), None
+        combat_id = f"{self.categorie}/{len(self.liste) + 1}"
+        self.liste.append({
+            "id": combat_id, "categorie": self.categorie, "tour": tour, "rouge": rouge, "bleu": bleu,
+            "depend": [p[1] for p in (rouge, bleu) if isinstance(p, tuple)],
+        })
+        return ("V", combat_id), ("P", combat_id)
+
+
+def tableau(categorie, athletes):
+    combats = _Combats(categorie)
+    tour = placer(athletes)
+    quarts, demis = [], []
+    while len(tour) > 1:
+        nom = {2: "Finale", 4: "Demi-finale", 8: "Quart de finale"}.get(len(tour), f"1/{len(tour) // 2} de finale")
+        resultats = [combats.ajouter(nom, tour[i], tour[i + 1]) for i in range(0, len(tour), 2)]
+        if len(tour) == 8:
+            quarts = [perdant for _, perdant in resultats]
+        elif len(tour) == 4:
+            demis = [perdant for _, perdant in resultats]
+        tour = [vainqueur for vainqueur, _ in resultats]
+    if quarts:
+        haut, _ = combats.ajouter("Repêchage", quarts[0], quarts[1])
+        bas, _ = combats.ajouter("Repêchage", quarts[2], quarts[3])
+        combats.ajouter("Bronze", haut, demis[1])
+        combats.ajouter("Bronze", bas, demis[0])
+    return combats.liste
+
+
+def poule(categorie, athletes):
+    """Toutes les rencontres, par tours (méthode du cercle) pour étaler les combats."""
+    combats = _Combats(categorie)
+    joueurs = list(athletes['Joueur'])
+    if len(joueurs) % 2:
+        joueurs.append(None)
+    n = len(joueurs)
+    for numero in range(n - 1):
+        for i in range(n // 2):
+            combats.ajouter(f"Poule - tour {numero + 1}", joueurs[i], joueurs[n - 1 - i])
+        joueurs = [joueurs[0], joueurs[-1]] + joueurs[1:-1]
+    return combats.liste
+
+
+def tirer(judo_data, categorie):
+    """Tirage d'une catégorie : format, athlètes classés et combats."""
+    athletes = classer(judo_data[judo_data['Categorie'] == categorie])
+    if len(athletes) > SEUIL_POULE:
+        format_tirage, combats = "tableau", tableau(categorie, athletes)
+    else:
+        format_tirage, combats = "poule", poule(categorie, athletes)
+    return {"categorie": categorie, "format": format_tirage,
+            "athletes": athletes[['Joueur', 'Equipe', 'Points']], "combats": combats}
+
+
+def tirer_tout(judo_data):
+    categories = judo_data['Categorie'].cat.remove_unused_categories().cat.categories
+    return [tirer(judo_data, categorie) for categorie in categories]
+
+
+def libelle(participant):
+    if isinstance(participant, tuple):
+        return f"{'Vainqueur' if participant[0] == 'V' else 'Perdant'} {participant[1]}"
+    return participant
+
+
+def planifier(tirages, tapis=8, duree=DUREE_COMBAT, repos=REPOS_MIN):
+    """Affecte chaque combat à un tapis et une heure (minutes depuis le début).
+
+    À chaque libération de tapis on choisit, parmi les combats dont les
+    prédécesseurs sont planifiés, celui qui peut commencer au plus tôt, à
+    égalité le plus long chemin restant jusqu'à la fin de sa catégorie.
+    """
+    combats = {c["id"]: c for t in tirages for c in t["combats"]}
+    suivants = {combat_id: [] for combat_id in combats}
+    for combat in combats.values():
+        for precedent in combat["depend"]:
+            suivants[precedent].append(combat["id"])
+    # Chemin critique : durée restante en comptant le combat lui-même
+    priorite = {}
+    for combat_id in reversed(list(combats)):  # un combat suit toujours ses prédécesseurs
+        priorite[combat_id] = duree + max((priorite[s] for s in suivants[combat_id]), default=0)
+    for t in tirages:
+        if t["format"] == "poule":
+            for i, combat in enumerate(t["combats"]):
+                priorite[combat["id"]] = duree * (len(t["combats"]) - i)
+
+    attente = {combat_id: len(c["depend"]) for combat_id, c in combats.items()}
+    prets = [combat_id for combat_id, n in attente.items() if n == 0]
+    fin = {}
+    disponible = {}  # athlète nommé -> fin de son dernier combat
+    tapis_libres = [(0, numero) for numero in range(1, tapis + 1)]
+    planning = []
+
+    def debut_possible(combat):
+        debut = max((fin[p] + repos for p in combat["depend"]), default=0)
+        for participant in (combat["rouge"], combat["bleu"]):
+            if not isinstance(participant, tuple) and participant in disponible:
+                debut = max(debut, disponible[participant] + repos)
+        return debut
+
+    while prets:
+        libre, numero = heapq.heappop(tapis_libres)
+        choix = min(prets, key=lambda c: (max(debut_possible(combats[c]), libre), -priorite[c]))
+        prets.remove(choix)
+        combat = combats[choix]
+        debut = max(debut_possible(combat), libre)
+        fin[choix] = debut + duree
+        for participant in (combat["rouge"], combat["bleu"]):
+            if not isinstance(participant, tuple):
+                disponible[participant] = fin[choix]
+        heapq.heappush(tapis_libres, (fin[choix], numero))
+        planning.append({"Tapis": numero, "Debut": debut, "Fin": fin[choix], "Categorie": combat["categorie"],
+                         "Tour": combat["tour"], "Combat": choix,
+                         "Rouge": libelle(combat["rouge"]), "Bleu": libelle(combat["bleu"])})
+        for suivant in suivants[choix]:
+            attente[suivant] -= 1
+            if attente[suivant] == 0:
+                prets.append(suivant)
+    colonnes = ["Tapis", "Debut", "Fin", "Categorie", "Tour", "Combat", "Rouge", "Bleu"]
+    return pd.DataFrame(planning, columns=colonnes).sort_values(["Debut", "Tapis"], ignore_index=True)
@@ -1,97 +1,110 @@
+import os
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import numpy as np
 from datetime import datetime
-import json
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet
-import io
+from championnat import analyses, evenements, mesures, rapports, saisons, tirage
+from championnat.categories import TABLES, libelle_table
+from championnat.evenements import POINTS_VICTOIRE
+from championnat.importation import importer_combats, importer_csv
+from championnat.etat import EtatPartage
 
 # Configuration initiale
 st.set_page_config(page_title="Championnat Marocain de Judo - Tableau de Bord", layout="wide", page_icon="🥋")
-st.markdown("<h1 style='text-align: center; color: #2E86C1;'>Championnat Marocain de Judo 2024-2025</h1>", unsafe_allow_html=True)
+ADMIN = os.environ.get("JUDO_ADMIN") == "1"
 
-# Fonctions utilitaires
-def categorie_poids(poids):
-    if poids <= 60: return "-60 kg"
-    elif poids <= 66: return "-66 kg"
-    elif poids <= 73: return "-73 kg"
-    elif poids <= 81: return "-81 kg"
-    elif poids <= 90: return "-90 kg"
-    elif poids <= 100: return "-100 kg"
-    else: return "+100 kg"
-
-def save_data():
-    with open("judo_data.json", "w") as f:
-        json.dump({
-            "judo_data": st.session_state.judo_data.to_dict(),
-            "classement_equipes": st.session_state.classement_equipes.to_dict(),
-            "classement_joueurs": st.session_state.classement_joueurs.to_dict()
-        }, f)
-
-def load_data():
+# Chaque exécution du script est un passage mesuré, découpé en étapes
+passage = mesures.registre.commencer_passage(st.session_state.get("nav_select"))
+# Un profil resté actif (passage interrompu par st.rerun ou une exception) est arrêté ici
+profil = st.session_state.pop("profil_en_cours", None)
+if profil is not None:
+    st.session_state.profil_resultat = profil.arreter()
+    profil = None
+if ADMIN and "profil_demande" in st.session_state:
+    profil = mesures.Profil(st.session_state.pop("profil_demande"))
     try:
-        with open("judo_data.json", "r") as f:
-            data = json.load(f)
-            st.session_state.judo_data = pd.DataFrame(data["judo_data"])
-            st.session_state.classement_equipes = pd.DataFrame(data["classement_equipes"])
-            st.session_state.classement_joueurs = pd.DataFrame(data["classement_joueurs"])
-    except FileNotFoundError:
-        st.session_state.judo_data = pd.DataFrame(columns=['Equipe', 'Joueur', 'Poids', 'Victoires', 'Defaites', 'Points', 'Performance', 'Categorie'])
-        st.session_state.classement_equipes = pd.DataFrame(columns=['Equipe', 'Points_Totaux', 'Victoires_Totaux'])
-        st.session_state.classement_joueurs = pd.DataFrame(columns=['Joueur', 'Equipe', 'Points', 'Victoires'])
-
-# Charger les données au démarrage
-if 'judo_data' not in st.session_state:
-    load_data()
+        profil.demarrer()
+    except ImportError:
+        st.session_state.profil_resultat = "pyinstrument n'est pas installé (pip install pyinstrument)."
+        profil = None
+    except ValueError:  # Python 3.12+ : un seul profileur actif par processus (autre session en cours ?)
+        st.session_state.profil_resultat = "Un autre profileur est déjà actif : réessayez plus tard."
+        profil = None
+    else:
+        st.session_state.profil_en_cours = profil
+
+# Fonctions utilitaires
+@st.cache_resource
+def etat_partage():
+    # Un seul moteur (et un seul stockage) pour toutes les sessions du processus
+    mesures.configurer_logs()
+    return EtatPartage()
+
+etat = etat_partage()
+etat.rafraichir()
+moteur = etat.moteur
+mesures.marquer("etat")
+st.markdown(f"<h1 style='text-align: center; color: #2E86C1;'>{moteur.championnat} {moteur.saison}</h1>", unsafe_allow_html=True)
+
+def enregistrer_evenement(evenement):
+    etat.enregistrer(evenement)
 
 # Sidebar pour la navigation
 st.sidebar.markdown("<h2 style='color: #2E86C1;'>Gestion de la Compétition</h2>", unsafe_allow_html=True)
 option = st.sidebar.selectbox("Choisir une action", [
     "Ajouter Équipe/Joueur", "Enregistrer un Match", "Supprimer Données", "Modifier Données", 
-    "Voir Classements", "Analyser Performances", "Exporter/Importer Données", "Podium"
+    "Voir Classements", "Analyser Performances", "Exporter/Importer Données", "Podium",
+    "Historique des Combats", "Tirage et Planning", "Saisons et Carrières"
 ], key="nav_select")
+passage.nom = option
 
 # Fonction pour ajouter un séparateur stylisé
 def add_separator():
     st.markdown("<hr style='border: 1px solid #2E86C1;'>", unsafe_allow_html=True)
 
-# Fonction pour exporter en PDF
-def export_to_pdf(title, stats, table_data):
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter)
-    styles = getSampleStyleSheet()
-    elements = []
-    
-    elements.append(Paragraph(title, styles['Title']))
-    elements.append(Spacer(1, 12))
-    
-    if stats:
-        elements.append(Paragraph("Statistiques", styles['Heading2']))
-        for label, value in stats.items():
-            elements.append(Paragraph(f"{label}: {value}", styles['Normal']))
-        elements.append(Spacer(1, 12))
-    
-    if table_data is not None and not table_data.empty:
-        elements.append(Paragraph("Détails", styles['Heading2']))
-        table = Table([table_data.columns.tolist()] + table_data.values.tolist())
-        table.setStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ])
-        elements.append(table)
-    
-    doc.build(elements)
-    buffer.seek(0)
-    return buffer
+# Export PDF à la demande : le rendu tourne en arrière-plan et n'est lancé qu'au clic
+def bouton_export_pdf(nom, signature, title, stats, table_data, label, file_name):
+    demande = st.session_state.get(f"pdf_{nom}")
+    if demande is None or demande["signature"] != signature or rapports.service.etat(demande["cle"]) == "inconnu":
+        if not st.button("Générer le PDF", key=f"preparer_{nom}"):
+            return
+        demande = {"signature": signature, "cle": rapports.service.demander(title, stats, table_data)}
+        st.session_state[f"pdf_{nom}"] = demande
+
+    etat_rapport = rapports.service.etat(demande["cle"])
+    if etat_rapport == "pret":
+        st.download_button(label=label, data=rapports.service.resultat(demande["cle"]), file_name=file_name,
+                           mime="application/pdf", type="primary")
+    elif etat_rapport == "erreur":
+        st.error(f"Échec de la génération du PDF : {rapports.service.erreur(demande['cle'])}")
+        if st.button("Réessayer", key=f"reessayer_{nom}"):
+            rapports.service.demander(title, stats, table_data)
+            st.rerun()
+    else:
+        attendre_pdf(demande["cle"])
+
+@st.fragment(run_every=1)
+def attendre_pdf(cle):
+    if rapports.service.etat(cle) != "en_cours":
+        st.rerun()
+    st.info("Génération du PDF en cours...", icon="⏳")
+
+# Classement paginé : seule la page affichée est construite et envoyée au navigateur
+TRIS = {"rang": "Rang", "inverse": "Rang (du dernier)", "nom": "Nom"}
+
+def classement_pagine(cle, lire):
+    """``lire(debut, taille)`` renvoie (nombre de lignes retenues, page)."""
+    taille = st.session_state.get(f"taille_{cle}", 25)
+    numero = st.session_state.get(f"page_{cle}", 1)
+    total, page = lire((numero - 1) * taille, taille)
+    pages = max(1, -(-total // taille))
+    if numero > pages:  # filtre plus restrictif : on revient à la dernière page
+        st.session_state[f"page_{cle}"] = numero = pages
+        total, page = lire((numero - 1) * taille, taille)
+    st.dataframe(page, hide_index=True, use_container_width=True)
+    col1, col2, col3 = st.columns([2, 2, 3])
+    col1.number_input("Page", min_value=1, max_value=pages, step=1, key=f"page_{cle}")
+    col2.selectbox("Lignes par page", [25, 50, 100], key=f"taille_{cle}")
+    col3.caption(f"{total} résultat(s) · page {numero} / {pages}")
 
 # 1. Ajout d'équipes et de joueurs
 if option == "Ajouter Équipe/Joueur":
@@ -111,43 +124,17 @@ if option == "Ajouter Équipe/Joueur":
         submit = st.form_submit_button("Ajouter", type="primary")
         
         if submit and equipe and joueur:
-            if joueur in st.session_state.judo_data['Joueur'].values:
+            if joueur in moteur:
                 st.error("Ce joueur existe déjà !")
             else:
-                new_data = pd.DataFrame({
-                    'Equipe': [equipe],
-                    'Joueur': [joueur],
-                    'Poids': [poids],
-                    'Victoires': [victoires],
-                    'Defaites': [defaites],
-                    'Points': [0],
-                    'Performance': [victoires / (victoires + defaites) if (victoires + defaites) > 0 else 0],
-                    'Categorie': [categorie_poids(poids)]
-                })
-                st.session_state.judo_data = pd.concat([st.session_state.judo_data, new_data], ignore_index=True)
-                
-                if equipe not in st.session_state.classement_equipes['Equipe'].values:
-                    st.session_state.classement_equipes = pd.concat([st.session_state.classement_equipes, 
-                                                                  pd.DataFrame({'Equipe': [equipe], 'Points_Totaux': [0], 'Victoires_Totaux': [victoires]})], 
-                                                                  ignore_index=True)
-                else:
-                    st.session_state.classement_equipes.loc[st.session_state.classement_equipes['Equipe'] == equipe, 'Victoires_Totaux'] += victoires
-                
-                if joueur not in st.session_state.classement_joueurs['Joueur'].values:
-                    st.session_state.classement_joueurs = pd.concat([st.session_state.classement_joueurs, 
-                                                                  pd.DataFrame({'Joueur': [joueur], 'Equipe': [equipe], 'Points': [0], 'Victoires': [victoires]})], 
-                                                                  ignore_index=True)
-                else:
-                    st.session_state.classement_joueurs.loc[st.session_state.classement_joueurs['Joueur'] == joueur, 'Victoires'] += victoires
-                
-                save_data()
+                enregistrer_evenement(evenements.ajout(equipe, joueur, poids, victoires, defaites))
                 st.success(f"Équipe/Joueur {joueur} ajouté avec succès !", icon="✅")
 
 # 2. Enregistrer un match
 if option == "Enregistrer un Match":
     st.subheader("Enregistrer un Match")
     add_separator()
-    joueurs = st.session_state.judo_data['Joueur'].tolist()
+    joueurs = moteur.noms()
     
     if not joueurs:
         st.warning("Aucun joueur disponible. Ajoutez des joueurs d'abord !")
@@ -161,10 +148,10 @@ if option == "Enregistrer un Match":
         with col2:
             joueur2 = st.selectbox("Joueur 2", joueurs, index=1 if len(joueurs) > 1 else 0, key="joueur2")
         
-        vainqueur = st.selectbox("Vainqueur", ["Égalité"] + joueurs, key="vainqueur_select")
+        vainqueur = st.selectbox("Vainqueur", ["Égalité", joueur1, joueur2], key="vainqueur_select")
         st.session_state.vainqueur_key = vainqueur
         is_egalite = (st.session_state.vainqueur_key == "Égalité")
-        type_victoire = st.selectbox("Type de victoire", ["Ippon (10 pts)", "Waza-ari (7 pts)", "Yuko (5 pts)"], 
+        type_victoire = st.selectbox("Type de victoire", list(POINTS_VICTOIRE), 
                                      disabled=is_egalite, key="type_victoire")
         
         with st.form("match_form"):
@@ -174,82 +161,79 @@ if option == "Enregistrer un Match":
                 if joueur1 == joueur2:
                     st.error("Les deux joueurs doivent être différents !")
                 else:
-                    points_gagnes = 0
-                    if not is_egalite:
-                        if type_victoire == "Ippon (10 pts)": points_gagnes = 10
-                        elif type_victoire == "Waza-ari (7 pts)": points_gagnes = 7
-                        elif type_victoire == "Yuko (5 pts)": points_gagnes = 5
-                    
-                    if vainqueur == joueur1:
-                        st.session_state.judo_data.loc[st.session_state.judo_data['Joueur'] == joueur1, 'Victoires'] += 1
-                        st.session_state.judo_data.loc[st.session_state.judo_data['Joueur'] == joueur1, 'Points'] += points_gagnes
-                        st.session_state.judo_data.loc[st.session_state.judo_data['Joueur'] == joueur2, 'Defaites'] += 1
-                        equipe1 = st.session_state.judo_data.loc[st.session_state.judo_data['Joueur'] == joueur1, 'Equipe'].values[0]
-                        st.session_state.classement_equipes.loc[st.session_state.classement_equipes['Equipe'] == equipe1, 'Points_Totaux'] += points_gagnes
-                        st.session_state.classement_equipes.loc[st.session_state.classement_equipes['Equipe'] == equipe1, 'Victoires_Totaux'] += 1
-                        st.session_state.classement_joueurs.loc[st.session_state.classement_joueurs['Joueur'] == joueur1, 'Points'] += points_gagnes
-                        st.session_state.classement_joueurs.loc[st.session_state.classement_joueurs['Joueur'] == joueur1, 'Victoires'] += 1
-                    elif vainqueur == joueur2:
-                        st.session_state.judo_data.loc[st.session_state.judo_data['Joueur'] == joueur2, 'Victoires'] += 1
-                        st.session_state.judo_data.loc[st.session_state.judo_data['Joueur'] == joueur2, 'Points'] += points_gagnes
-                        st.session_state.judo_data.loc[st.session_state.judo_data['Joueur'] == joueur1, 'Defaites'] += 1
-                        equipe2 = st.session_state.judo_data.loc[st.session_state.judo_data['Joueur'] == joueur2, 'Equipe'].values[0]
-                        st.session_state.classement_equipes.loc[st.session_state.classement_equipes['Equipe'] == equipe2, 'Points_Totaux'] += points_gagnes
-                        st.session_state.classement_equipes.loc[st.session_state.classement_equipes['Equipe'] == equipe2, 'Victoires_Totaux'] += 1
-                        st.session_state.classement_joueurs.loc[st.session_state.classement_joueurs['Joueur'] == joueur2, 'Points'] += points_gagnes
-                        st.session_state.classement_joueurs.loc[st.session_state.classement_joueurs['Joueur'] == joueur2, 'Victoires'] += 1
-                    elif vainqueur != "Égalité":
-                        st.session_state.judo_data.loc[st.session_state.judo_data['Joueur'] == vainqueur, 'Victoires'] += 1
-                        st.session_state.judo_data.loc[st.session_state.judo_data['Joueur'] == vainqueur, 'Points'] += points_gagnes
-                        st.session_state.judo_data.loc[st.session_state.judo_data['Joueur'] == joueur1, 'Defaites'] += 1
-                        st.session_state.judo_data.loc[st.session_state.judo_data['Joueur'] == joueur2, 'Defaites'] += 1
-                        equipe_v = st.session_state.judo_data.loc[st.session_state.judo_data['Joueur'] == vainqueur, 'Equipe'].values[0]
-                        st.session_state.classement_equipes.loc[st.session_state.classement_equipes['Equipe'] == equipe_v, 'Points_Totaux'] += points_gagnes
-                        st.session_state.classement_equipes.loc[st.session_state.classement_equipes['Equipe'] == equipe_v, 'Victoires_Totaux'] += 1
-                        st.session_state.classement_joueurs.loc[st.session_state.classement_joueurs['Joueur'] == vainqueur, 'Points'] += points_gagnes
-                        st.session_state.classement_joueurs.loc[st.session_state.classement_joueurs['Joueur'] == vainqueur, 'Victoires'] += 1
-                    
-                    for joueur in [joueur1, joueur2] + ([vainqueur] if vainqueur not in [joueur1, joueur2, "Égalité"] else []):
-                        v = st.session_state.judo_data.loc[st.session_state.judo_data['Joueur'] == joueur, 'Victoires'].values[0]
-                        d = st.session_state.judo_data.loc[st.session_state.judo_data['Joueur'] == joueur, 'Defaites'].values[0]
-                        st.session_state.judo_data.loc[st.session_state.judo_data['Joueur'] == joueur, 'Performance'] = v / (v + d) if (v + d) > 0 else 0
-                    
-                    save_data()
+                    enregistrer_evenement(evenements.match(joueur1, joueur2, vainqueur, type_victoire))
                     st.success(f"Match {joueur1} vs {joueur2} enregistré !", icon="✅")
 
+        # Annulation exacte d'un match déjà enregistré
+        # Copie lue sous verrou : une autre session peut annuler ou ajouter un match pendant le rendu
+        matchs = {match['id']: match for match in moteur.liste_matchs()}
+        if matchs:
+            with st.expander("Annuler un match"):
+                with st.form("annulation_form"):
+                    match_a_annuler = st.selectbox("Match", list(matchs), format_func=lambda m: (
+                        f"{matchs[m]['joueur1']} vs {matchs[m]['joueur2']} — "
+                        f"vainqueur : {matchs[m]['vainqueur']} ({matchs[m]['points']} pts)"))
+                    if st.form_submit_button("Annuler le match"):
+                        match = matchs[match_a_annuler]
+                        try:
+                            enregistrer_evenement(evenements.annulation(match_a_annuler))
+                        except ValueError as erreur:
+                            st.error(f"Annulation impossible : {erreur}")
+                        else:
+                            st.success(f"Match {match['joueur1']} vs {match['joueur2']} annulé !", icon="✅")
+
+    # Saisie par lot : tableau collé ou fichier déposé par le logiciel de marque des tapis
+    st.markdown("### Saisie par lot")
+    st.caption("Colonnes : Joueur1, Joueur2, Vainqueur (ou « Égalité »), Technique (Ippon, Waza-ari, Yuko "
+               "ou points), Id et Date facultatifs. Un combat déjà enregistré (même Id) est ignoré.")
+    lot = None
+    onglet_colle, onglet_fichier = st.tabs(["Tableau collé", "Fichier CSV ou JSON"])
+    with onglet_colle:
+        with st.form("lot_form", clear_on_submit=True):
+            tableau_colle = st.text_area("Coller les lignes (avec l'en-tête)", height=200)
+            if st.form_submit_button("Enregistrer le lot", type="primary") and tableau_colle.strip():
+                lot = tableau_colle
+    with onglet_fichier:
+        fichier_combats = st.file_uploader("Fichier de résultats", type=["csv", "json", "txt"], key="fichier_combats")
+        # Même précaution que l'import des joueurs : un fichier n'est traité qu'une fois
+        if fichier_combats and st.session_state.get("dernier_lot") != fichier_combats.file_id:
+            st.session_state.dernier_lot = fichier_combats.file_id
+            lot = fichier_combats
+    if lot is not None:
+        try:
+            rapport = importer_combats(lot, moteur, enregistrer_evenement)
+        except ValueError as erreur:
+            st.error(f"Lot refusé : {erreur}")
+        else:
+            st.success(f"{rapport.acceptes} combat(s) enregistré(s), {rapport.deja_enregistres} déjà connu(s) ignoré(s).",
+                       icon="✅")
+            if rapport.nb_rejets:
+                st.warning(f"{rapport.nb_rejets} ligne(s) rejetée(s).")
+                st.dataframe(rapport.rejets_df, use_container_width=True, hide_index=True)
+
 # 3. Supprimer des données
 if option == "Supprimer Données":
     st.subheader("Supprimer des Données")
     add_separator()
     with st.form("supprimer_form"):
-        joueur_a_supprimer = st.selectbox("Joueur à supprimer", st.session_state.judo_data['Joueur'].tolist())
+        joueur_a_supprimer = st.selectbox("Joueur à supprimer", moteur.noms())
         submit_supprimer = st.form_submit_button("Supprimer", type="primary")
         
         if submit_supprimer:
-            equipe = st.session_state.judo_data.loc[st.session_state.judo_data['Joueur'] == joueur_a_supprimer, 'Equipe'].values[0]
-            points = st.session_state.judo_data.loc[st.session_state.judo_data['Joueur'] == joueur_a_supprimer, 'Points'].values[0]
-            victoires = st.session_state.judo_data.loc[st.session_state.judo_data['Joueur'] == joueur_a_supprimer, 'Victoires'].values[0]
-            
-            st.session_state.judo_data = st.session_state.judo_data[st.session_state.judo_data['Joueur'] != joueur_a_supprimer]
-            st.session_state.classement_equipes.loc[st.session_state.classement_equipes['Equipe'] == equipe, 'Points_Totaux'] -= points
-            st.session_state.classement_equipes.loc[st.session_state.classement_equipes['Equipe'] == equipe, 'Victoires_Totaux'] -= victoires
-            st.session_state.classement_joueurs = st.session_state.classement_joueurs[st.session_state.classement_joueurs['Joueur'] != joueur_a_supprimer]
-            
-            if equipe not in st.session_state.judo_data['Equipe'].values:
-                st.session_state.classement_equipes = st.session_state.classement_equipes[st.session_state.classement_equipes['Equipe'] != equipe]
-            
-            save_data()
+            enregistrer_evenement(evenements.suppression(joueur_a_supprimer))
             st.success(f"Joueur {joueur_a_supprimer} supprimé avec succès !", icon="✅")
 
 # 4. Modifier des données
 if option == "Modifier Données":
     st.subheader("Modifier des Données")
     add_separator()
-    joueurs = st.session_state.judo_data['Joueur'].tolist()
+    joueurs = moteur.noms()
     if joueurs:
         with st.form("modifier_form"):
             joueur_a_modifier = st.selectbox("Joueur à modifier", joueurs)
-            joueur_data = st.session_state.judo_data[st.session_state.judo_data['Joueur'] == joueur_a_modifier].iloc[0]
+            joueur_data = moteur.fiche(joueur_a_modifier)
+            if joueur_data is None:  # supprimé entre-temps par une autre session
+                st.rerun()
             
             col1, col2 = st.columns(2)
             with col1:
@@ -262,27 +246,7 @@ if option == "Modifier Données":
             submit_modifier = st.form_submit_button("Modifier", type="primary")
             
             if submit_modifier:
-                ancienne_equipe = joueur_data['Equipe']
-                st.session_state.judo_data.loc[st.session_state.judo_data['Joueur'] == joueur_a_modifier, 'Equipe'] = equipe
-                st.session_state.judo_data.loc[st.session_state.judo_data['Joueur'] == joueur_a_modifier, 'Poids'] = poids
-                st.session_state.judo_data.loc[st.session_state.judo_data['Joueur'] == joueur_a_modifier, 'Victoires'] = victoires
-                st.session_state.judo_data.loc[st.session_state.judo_data['Joueur'] == joueur_a_modifier, 'Defaites'] = defaites
-                st.session_state.judo_data.loc[st.session_state.judo_data['Joueur'] == joueur_a_modifier, 'Performance'] = victoires / (victoires + defaites) if (victoires + defaites) > 0 else 0
-                st.session_state.judo_data.loc[st.session_state.judo_data['Joueur'] == joueur_a_modifier, 'Categorie'] = categorie_poids(poids)
-                
-                st.session_state.classement_joueurs.loc[st.session_state.classement_joueurs['Joueur'] == joueur_a_modifier, 'Equipe'] = equipe
-                st.session_state.classement_joueurs.loc[st.session_state.classement_joueurs['Joueur'] == joueur_a_modifier, 'Victoires'] = victoires
-                
-                if ancienne_equipe != equipe:
-                    st.session_state.classement_equipes.loc[st.session_state.classement_equipes['Equipe'] == ancienne_equipe, 'Victoires_Totaux'] -= joueur_data['Victoires']
-                    if equipe not in st.session_state.classement_equipes['Equipe'].values:
-                        st.session_state.classement_equipes = pd.concat([st.session_state.classement_equipes, 
-                                                                      pd.DataFrame({'Equipe': [equipe], 'Points_Totaux': [joueur_data['Points']], 'Victoires_Totaux': [victoires]})], 
-                                                                      ignore_index=True)
-                    else:
-                        st.session_state.classement_equipes.loc[st.session_state.classement_equipes['Equipe'] == equipe, 'Victoires_Totaux'] += victoires
-                
-                save_data()
+                enregistrer_evenement(evenements.modification(joueur_a_modifier, equipe, poids, victoires, defaites))
                 st.success(f"Joueur {joueur_a_modifier} modifié avec succès !", icon="✅")
     else:
         st.warning("Aucun joueur à modifier.")
@@ -295,25 +259,29 @@ if option == "Voir Classements":
     
     with col1:
         st.markdown("### Classement des Équipes")
-        filtre_equipe = st.selectbox("Filtrer par catégorie", ["Toutes"] + st.session_state.judo_data['Categorie'].unique().tolist(), key="filtre_equipe")
-        classement_equipes = st.session_state.classement_equipes.sort_values(by='Points_Totaux', ascending=False)
-        st.table(classement_equipes[['Equipe', 'Points_Totaux', 'Victoires_Totaux']].style.set_properties(**{'text-align': 'center'}))
+        filtre_equipe = st.selectbox("Filtrer par catégorie", ["Toutes"] + moteur.categories(), key="filtre_equipe")
+        recherche_equipe = st.text_input("Rechercher une équipe", key="recherche_equipe")
+        tri_equipe = st.selectbox("Trier par", list(TRIS), format_func=TRIS.get, key="tri_equipe")
+        # Avec une catégorie, les totaux ne comptent que les membres de cette catégorie
+        classement_pagine("equipes", lambda debut, taille: moteur.page_classement_equipes(
+            debut, taille, categorie=None if filtre_equipe == "Toutes" else filtre_equipe,
+            recherche=recherche_equipe, tri=tri_equipe))
     
     with col2:
         st.markdown("### Classement des Joueurs")
-        filtre_joueur = st.selectbox("Filtrer par catégorie", ["Toutes"] + st.session_state.judo_data['Categorie'].unique().tolist(), key="filtre_joueur")
-        classement_joueurs = st.session_state.classement_joueurs.sort_values(by='Points', ascending=False)
-        if filtre_joueur != "Toutes":
-            classement_joueurs = classement_joueurs[classement_joueurs['Joueur'].isin(
-                st.session_state.judo_data[st.session_state.judo_data['Categorie'] == filtre_joueur]['Joueur']
-            )]
-        st.table(classement_joueurs[['Joueur', 'Equipe', 'Points', 'Victoires']].style.set_properties(**{'text-align': 'center'}))
+        filtre_joueur = st.selectbox("Filtrer par catégorie", ["Toutes"] + moteur.categories(), key="filtre_joueur")
+        equipe_joueur = st.selectbox("Filtrer par équipe", ["Toutes"] + moteur.noms_equipes(), key="equipe_joueur")
+        recherche_joueur = st.text_input("Rechercher un joueur", key="recherche_joueur")
+        tri_joueur = st.selectbox("Trier par", list(TRIS), format_func=TRIS.get, key="tri_joueur")
+        classement_pagine("joueurs", lambda debut, taille: moteur.page_classement(
+            debut, taille, categorie=None if filtre_joueur == "Toutes" else filtre_joueur,
+            equipe=None if equipe_joueur == "Toutes" else equipe_joueur, recherche=recherche_joueur, tri=tri_joueur))
 
 # 6. Analyser les performances (niveau olympique avec export PDF)
 if option == "Analyser Performances":
     st.subheader("Analyse des Performances - Niveau Olympique")
     add_separator()
-    df = st.session_state.judo_data
+    df = moteur.judo_data
     
     if df.empty:
         st.warning("Aucune donnée disponible pour l'analyse.")
@@ -322,89 +290,42 @@ if option == "Analyser Performances":
         st.markdown("### Filtres")
         col1, col2 = st.columns(2)
         with col1:
-            categorie = st.selectbox("Catégorie de poids", ["Toutes"] + sorted(df['Categorie'].unique().tolist()), key="categorie_filter")
+            categorie = st.selectbox("Catégorie de poids", ["Toutes"] + moteur.categories(), key="categorie_filter")
         with col2:
-            equipe_filter = st.selectbox("Équipe", ["Toutes"] + sorted(df['Equipe'].unique().tolist()), key="equipe_filter")
+            equipe_filter = st.selectbox("Équipe", ["Toutes"] + moteur.noms_equipes(), key="equipe_filter")
         
-        filtered_df = df
-        if categorie != "Toutes":
-            filtered_df = filtered_df[filtered_df['Categorie'] == categorie]
-        if equipe_filter != "Toutes":
-            filtered_df = filtered_df[filtered_df['Equipe'] == equipe_filter]
+        filtered_df = analyses.filtrer(moteur, categorie, equipe_filter)
+        stats = analyses.statistiques(moteur, categorie, equipe_filter)
+        fig1, fig2, fig3, fig4 = analyses.figures(moteur, categorie, equipe_filter)
         
         # Statistiques avancées
         st.markdown("### Statistiques Avancées")
-        col_stats1, col_stats2, col_stats3, col_stats4 = st.columns(4)
-        with col_stats1:
-            total_combats = int(filtered_df['Victoires'].sum() + filtered_df['Defaites'].sum())
-            st.metric("Total Combats", total_combats)
-        with col_stats2:
-            total_points = int(filtered_df['Points'].sum())
-            st.metric("Points Totaux", total_points)
-        with col_stats3:
-            ratio = f"{filtered_df['Points'].sum() / filtered_df['Victoires'].sum():.2f}" if filtered_df['Victoires'].sum() > 0 else "N/A"
-            st.metric("Ratio Points/Victoire", ratio)
-        with col_stats4:
-            perf_moyenne = f"{filtered_df['Performance'].mean():.2%}"
-            st.metric("Performance Moyenne", perf_moyenne)
+        for colonne, (label, valeur) in zip(st.columns(4), stats.items()):
+            with colonne:
+                st.metric(label, valeur)
         
         # Visualisations olympiques
         st.markdown("### Visualisations")
         tab1, tab2, tab3, tab4 = st.tabs(["Classement par Points", "Performance par Équipe/Catégorie", "Top Joueurs (Radar)", "Victoires par Équipe"])
         
         with tab1:
-            fig1 = px.bar(filtered_df.sort_values('Points', ascending=False), x='Joueur', y='Points', color='Equipe', 
-                          title="Classement par Points", text=filtered_df['Points'].astype(int), height=500)
-            fig1.update_traces(textposition='outside')
-            fig1.update_layout(xaxis_title="Joueur", yaxis_title="Points", bargap=0.2, showlegend=True)
             st.plotly_chart(fig1, use_container_width=True)
         
         with tab2:
-            heatmap_data = filtered_df.pivot_table(values='Performance', index='Equipe', columns='Categorie', aggfunc='mean').fillna(0)
-            fig2 = go.Figure(data=go.Heatmap(
-                z=heatmap_data.values,
-                x=heatmap_data.columns,
-                y=heatmap_data.index,
-                colorscale='Viridis',
-                text=heatmap_data.values.round(2),
-                texttemplate="%{text}",
-                textfont={"size": 12}
-            ))
-            fig2.update_layout(title="Performance Moyenne par Équipe et Catégorie", height=500)
             st.plotly_chart(fig2, use_container_width=True)
         
         with tab3:
-            top_5 = filtered_df.sort_values('Points', ascending=False).head(5)
-            if len(top_5) >= 1:
-                fig3 = go.Figure()
-                categories = ['Victoires', 'Points', 'Performance']
-                for _, row in top_5.iterrows():
-                    fig3.add_trace(go.Scatterpolar(
-                        r=[row['Victoires'], row['Points'] / 10, row['Performance'] * 100],  # Normalisation pour lisibilité
-                        theta=categories,
-                        fill='toself',
-                        name=f"{row['Joueur']} ({row['Equipe']})"
-                    ))
-                fig3.update_layout(
-                    polar=dict(radialaxis=dict(visible=True, range=[0, max(top_5['Points'].max() / 10, top_5['Victoires'].max(), top_5['Performance'].max() * 100)])),
-                    showlegend=True,
-                    title="Comparaison des Top 5 Joueurs (Radar)",
-                    height=500
-                )
+            if fig3 is not None:
                 st.plotly_chart(fig3, use_container_width=True)
             else:
                 st.info("Pas assez de joueurs pour afficher un radar.")
         
         with tab4:
-            victoires_par_equipe = filtered_df.groupby('Equipe')['Victoires'].sum().reset_index()
-            fig4 = px.pie(victoires_par_equipe, names='Equipe', values='Victoires', 
-                          title="Répartition des Victoires par Équipe", hole=0.3, height=500)
-            fig4.update_traces(textinfo='percent+label', pull=[0.1 if i == 0 else 0 for i in range(len(victoires_par_equipe))])
             st.plotly_chart(fig4, use_container_width=True)
         
         # Tableau interactif détaillé
         st.markdown("### Tableau des Performances")
-        st.dataframe(filtered_df[['Joueur', 'Equipe', 'Categorie', 'Poids', 'Victoires', 'Defaites', 'Points', 'Performance']], 
+        st.dataframe(filtered_df, 
                      column_config={
                          "Performance": st.column_config.NumberColumn(format="%.2f"),
                          "Points": st.column_config.NumberColumn(format="%d"),
@@ -413,20 +334,10 @@ if option == "Analyser Performances":
                      }, use_container_width=True)
         
         # Bouton d'exportation en PDF
-        stats = {
-            "Total Combats": total_combats,
-            "Points Totaux": total_points,
-            "Ratio Points/Victoire": ratio,
-            "Performance Moyenne": perf_moyenne
-        }
-        pdf_buffer = export_to_pdf("Analyse des Performances - Championnat Marocain de Judo", stats, filtered_df[['Joueur', 'Equipe', 'Categorie', 'Poids', 'Victoires', 'Defaites', 'Points', 'Performance']])
-        st.download_button(
-            label="Exporter l'Analyse en PDF",
-            data=pdf_buffer,
-            file_name=f"analyse_performances_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
-            mime="application/pdf",
-            type="primary"
-        )
+        bouton_export_pdf("analyse", (moteur.identifiant, moteur.version, categorie, equipe_filter),
+                          "Analyse des Performances - Championnat Marocain de Judo", stats, filtered_df,
+                          "Exporter l'Analyse en PDF",
+                          f"analyse_performances_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf")
 
 # 7. Exporter/Importer Données
 if option == "Exporter/Importer Données":
@@ -434,16 +345,25 @@ if option == "Exporter/Importer Données":
     add_separator()
     
     uploaded_file = st.file_uploader("Importer un fichier CSV", type="csv")
-    if uploaded_file:
-        imported_data = pd.read_csv(uploaded_file)
-        imported_data['Categorie'] = imported_data['Poids'].apply(categorie_poids)
-        imported_data['Performance'] = imported_data['Victoires'] / (imported_data['Victoires'] + imported_data['Defaites']).fillna(0)
-        st.session_state.judo_data = pd.concat([st.session_state.judo_data, imported_data], ignore_index=True)
-        save_data()
-        st.success("Données importées avec succès !", icon="✅")
+    # Un fichier reste attaché au widget entre les reruns : on ne l'importe qu'une fois
+    if uploaded_file and st.session_state.get("dernier_import") != uploaded_file.file_id:
+        barre = st.progress(0.0, text="Import en cours...")
+        try:
+            rapport = importer_csv(uploaded_file, moteur, enregistrer_evenement,
+                                   progression=lambda fraction: barre.progress(fraction, text="Import en cours..."))
+        except ValueError as erreur:
+            st.error(f"Import impossible : {erreur}")
+        else:
+            st.session_state.dernier_import = uploaded_file.file_id
+            st.success(f"{rapport.acceptes} joueur(s) importé(s) avec succès !", icon="✅")
+            if rapport.nb_rejets:
+                st.warning(f"{rapport.nb_rejets} ligne(s) rejetée(s).")
+                st.dataframe(rapport.rejets_df, use_container_width=True, hide_index=True)
+        barre.empty()
     
-    if not st.session_state.judo_data.empty:
-        csv = st.session_state.judo_data.to_csv(index=False)
+    if not moteur.judo_data.empty:
+        with mesures.chrono("export.csv"):
+            csv = moteur.judo_data.to_csv(index=False)
         st.download_button(
             label="Télécharger les données en CSV",
             data=csv,
@@ -459,7 +379,7 @@ if option == "Podium":
     st.subheader("Podium Officiel")
     add_separator()
     
-    if st.session_state.judo_data.empty:
+    if moteur.judo_data.empty:
         st.warning("Aucune donnée disponible pour établir un podium.")
     else:
         st.markdown("### Podium des Équipes et Joueurs")
@@ -467,7 +387,7 @@ if option == "Podium":
         
         with col1:
             st.markdown("#### Équipes")
-            top_3_equipes = st.session_state.classement_equipes.sort_values(by='Points_Totaux', ascending=False).head(3)
+            top_3_equipes = moteur.podium_equipes()
             if not top_3_equipes.empty:
                 podium_colors = ['#FFD700', '#C0C0C0', '#CD7F32']  # Or, Argent, Bronze
                 for i, (index, row) in enumerate(top_3_equipes.iterrows()):
@@ -483,7 +403,7 @@ if option == "Podium":
         
         with col2:
             st.markdown("#### Joueurs")
-            top_3_joueurs = st.session_state.classement_joueurs.sort_values(by='Points', ascending=False).head(3)
+            top_3_joueurs = moteur.podium_joueurs()
             if not top_3_joueurs.empty:
                 for i, (index, row) in enumerate(top_3_joueurs.iterrows()):
                     if i == 0:
@@ -500,33 +420,199 @@ if option == "Podium":
         podium_equipes = top_3_equipes[['Equipe', 'Points_Totaux', 'Victoires_Totaux']] if not top_3_equipes.empty else pd.DataFrame(columns=['Equipe', 'Points_Totaux', 'Victoires_Totaux'])
         podium_joueurs = top_3_joueurs[['Joueur', 'Equipe', 'Points', 'Victoires']] if not top_3_joueurs.empty else pd.DataFrame(columns=['Joueur', 'Equipe', 'Points', 'Victoires'])
         combined_podium = pd.concat([podium_equipes, podium_joueurs], axis=1)
-        pdf_buffer = export_to_pdf("Podium Officiel - Championnat Marocain de Judo", None, combined_podium)
-        st.download_button(
-            label="Exporter le Podium en PDF",
-            data=pdf_buffer,
-            file_name=f"podium_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
-            mime="application/pdf",
-            type="primary"
+        bouton_export_pdf("podium", (moteur.identifiant, moteur.version),
+                          "Podium Officiel - Championnat Marocain de Judo", None, combined_podium,
+                          "Exporter le Podium en PDF",
+                          f"podium_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf")
+
+# 9. Historique des combats
+if option == "Historique des Combats":
+    st.subheader("Historique des Combats")
+    add_separator()
+    combats = moteur.combats
+    with moteur.verrou:  # le journal des combats grandit pendant que d'autres sessions saisissent
+        joueurs = sorted(set(combats.noms))
+        nombre = len(combats)
+    
+    if not nombre:
+        st.warning("Aucun combat enregistré pour le moment.")
+    else:
+        st.markdown("### Face-à-face")
+        col1, col2 = st.columns(2)
+        with col1:
+            athlete1 = st.selectbox("Athlète 1", joueurs, key="h2h_1")
+        with col2:
+            athlete2 = st.selectbox("Athlète 2", joueurs, index=1 if len(joueurs) > 1 else 0, key="h2h_2")
+        with moteur.verrou:
+            bilan = combats.face_a_face(athlete1, athlete2)
+        col1, col2, col3 = st.columns(3)
+        col1.metric(athlete1, bilan["victoires"][athlete1])
+        col2.metric("Égalités", bilan["nuls"])
+        col3.metric(athlete2, bilan["victoires"][athlete2])
+        st.dataframe(bilan["combats"], use_container_width=True, hide_index=True)
+        add_separator()
+        
+        st.markdown("### Forme et techniques")
+        col1, col2 = st.columns([1, 3])
+        with col1:
+            athlete = st.selectbox("Athlète", joueurs, key="forme_athlete")
+            n = st.number_input("Derniers combats", min_value=1, max_value=50, value=5, step=1)
+        with col2:
+            with moteur.verrou:
+                forme = combats.forme(athlete, n)
+                techniques = combats.techniques(athlete)
+            st.markdown(" ".join({"V": "🟢", "D": "🔴", "N": "⚪"}[r] for r in forme['Resultat']) or "—")
+            st.dataframe(forme, use_container_width=True, hide_index=True)
+        st.dataframe(techniques, use_container_width=True, hide_index=True)
+        add_separator()
+        
+        st.markdown("### Classement à une date")
+        date = st.date_input("Date", value=datetime.now().date(), key="date_classement")
+        st.dataframe(moteur.classement_au(datetime.combine(date, datetime.max.time())),
+                     use_container_width=True, hide_index=True)
+
+# 10. Tirage au sort et planning des tapis
+if option == "Tirage et Planning":
+    st.subheader("Tirage au Sort et Planning des Tapis")
+    add_separator()
+    
+    if moteur.judo_data.empty:
+        st.warning("Aucun joueur inscrit : impossible d'établir un tirage.")
+    else:
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            nb_tapis = st.number_input("Nombre de tapis", min_value=1, max_value=16, value=4, step=1)
+        with col2:
+            duree = st.number_input("Durée d'un combat (min)", min_value=1, max_value=20, value=tirage.DUREE_COMBAT, step=1)
+        with col3:
+            repos = st.number_input("Repos minimal (min)", min_value=0, max_value=60, value=tirage.REPOS_MIN, step=1)
+        with col4:
+            heure_debut = st.time_input("Début de la compétition", value=datetime.now().replace(hour=9, minute=0).time())
+        
+        # Le tirage ne dépend que des classements : recalculé seulement quand la version change
+        cle = (moteur.identifiant, moteur.version, "tirage")
+        tirages = analyses.cache.obtenir(cle, lambda: tirage.tirer_tout(moteur.judo_data))
+        planning = analyses.cache.obtenir(cle + (nb_tapis, duree, repos),
+                                          lambda: tirage.planifier(tirages, nb_tapis, duree, repos))
+        
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Catégories", len(tirages))
+        col2.metric("Combats", len(planning))
+        col3.metric("Durée totale", f"{int(planning['Fin'].max() // 60)} h {int(planning['Fin'].max() % 60):02d}" if len(planning) else "—")
+        
+        st.markdown("### Tirages par catégorie")
+        for t in tirages:
+            with st.expander(f"{t['categorie']} — {'Tableau avec repêchage' if t['format'] == 'tableau' else 'Poule'} ({len(t['athletes'])} athlètes)"):
+                col1, col2 = st.columns([1, 2])
+                with col1:
+                    st.dataframe(t['athletes'], use_container_width=True, hide_index=True)
+                with col2:
+                    st.dataframe(pd.DataFrame([{"Combat": c['id'], "Tour": c['tour'], "Rouge": tirage.libelle(c['rouge']),
+                                                "Bleu": tirage.libelle(c['bleu'])} for c in t['combats']],
+                                              columns=["Combat", "Tour", "Rouge", "Bleu"]),
+                                 use_container_width=True, hide_index=True)
+        
+        st.markdown("### Planning des tapis")
+        origine = datetime.combine(datetime.now().date(), heure_debut)
+        affichage = planning.assign(
+            Debut=(origine + pd.to_timedelta(planning['Debut'], unit='min')).dt.strftime('%H:%M'),
+            Fin=(origine + pd.to_timedelta(planning['Fin'], unit='min')).dt.strftime('%H:%M'),
         )
+        st.dataframe(affichage, use_container_width=True, hide_index=True)
+        st.download_button("Télécharger le planning (CSV)", affichage.to_csv(index=False).encode('utf-8'),
+                           file_name="planning_tapis.csv", mime="text/csv")
+
+# 11. Saisons archivées et statistiques de carrière
+if option == "Saisons et Carrières":
+    st.subheader("Saisons et Carrières")
+    add_separator()
+    if "saison_ouverte" in st.session_state:
+        st.success(st.session_state.pop("saison_ouverte"), icon="✅")
+    archivees = saisons.saisons_archivees()
+    championnats = sorted({championnat for championnat, _, _ in archivees} | {moteur.championnat})
+    col1, col2 = st.columns(2)
+    with col1:
+        filtre_championnat = st.selectbox("Championnat", ["Tous"] + championnats, key="filtre_championnat")
+    with col2:
+        inclure = st.checkbox(f"Inclure la saison en cours ({moteur.saison})", value=True)
+    championnat = None if filtre_championnat == "Tous" else filtre_championnat
+    # Requêtes sur les cumuls : recalculées quand les archives ou (si incluse) la saison en cours changent
+    cle = (saisons.version_archives(), championnat) + ((moteur.identifiant, moteur.version) if inclure else ())
+    en_cours = moteur if inclure else None
+    
+    onglets = st.tabs(["Carrières", "Dynasties", "Catégories", "Saisons archivées", "Nouvelle saison"])
+    with onglets[0]:
+        carrieres = analyses.cache.obtenir(cle + ("carrieres",), lambda: saisons.carrieres(championnat, en_cours=en_cours))
+        recherche = st.text_input("Rechercher un joueur", key="recherche_carriere")
+        if recherche:
+            carrieres = carrieres[carrieres['Joueur'].str.contains(recherche, case=False, regex=False)]
+        st.dataframe(carrieres.head(500), use_container_width=True, hide_index=True)
+        st.caption(f"{len(carrieres)} joueur(s)")
+    with onglets[1]:
+        st.dataframe(analyses.cache.obtenir(cle + ("dynasties",), lambda: saisons.dynasties(championnat, en_cours=en_cours)),
+                     use_container_width=True, hide_index=True)
+    with onglets[2]:
+        mesure = st.selectbox("Mesure", ["Performance", "Points", "Victoires", "Athletes"], key="mesure_categories")
+        evolution = analyses.cache.obtenir(cle + ("categories", mesure),
+                                           lambda: saisons.evolution_categories(mesure, championnat, en_cours=en_cours))
+        if evolution.empty:
+            st.warning("Aucune saison à comparer.")
+        else:
+            st.dataframe(evolution, use_container_width=True)
+            st.line_chart(evolution.T)
+    with onglets[3]:
+        if not archivees:
+            st.warning("Aucune saison archivée.")
+        else:
+            choix = st.selectbox("Saison", archivees, format_func=lambda s: f"{s[0]} {s[1]}", key="saison_archivee")
+            # Lecture seule : seules les tables de cumuls de la saison sont ouvertes
+            st.markdown("### Classement final des joueurs")
+            st.dataframe(saisons.lire(choix[0], choix[1]), use_container_width=True, hide_index=True)
+            st.markdown("### Classement final des équipes")
+            st.dataframe(saisons.lire(choix[0], choix[1], "cumul_equipes"), use_container_width=True, hide_index=True)
+    with onglets[4]:
+        st.markdown(f"La saison **{moteur.saison}** ({moteur.championnat}) sera archivée en lecture seule ; "
+                    "la nouvelle saison repart sans combats.")
+        with st.form("nouvelle_saison"):
+            nouveau_championnat = st.text_input("Championnat", value=moteur.championnat)
+            nouvelle = st.text_input("Nouvelle saison", placeholder="Ex: 2025-2026")
+            table_categories = st.selectbox("Catégories de poids", list(TABLES),
+                                            index=list(TABLES).index(moteur.table_categories),
+                                            format_func=libelle_table)
+            garder = st.checkbox("Garder les joueurs inscrits (compteurs remis à zéro)", value=True)
+            confirmer = st.checkbox("Je confirme la clôture de la saison en cours")
+            if st.form_submit_button("Clôturer et ouvrir la saison", type="primary") and nouvelle and confirmer:
+                try:
+                    saisons.nouvelle_saison(etat.stockage, nouveau_championnat, nouvelle, garder,
+                                            table_categories=table_categories)
+                except ValueError as erreur:
+                    st.error(f"Clôture impossible : {erreur}")
+                else:
+                    st.session_state.saison_ouverte = f"Saison {moteur.saison} archivée, saison {nouvelle} ouverte."
+                    etat.rafraichir()
+                    st.rerun()
 
 # Résumé rapide (version pro)
+mesures.marquer(f"page.{option}")
+
 st.sidebar.markdown("<h2 style='color: #2E86C1; text-align: center;'>Résumé Rapide</h2>", unsafe_allow_html=True)
 st.sidebar.markdown("<div style='background-color: #F5F6F5; padding: 10px; border-radius: 5px;'>", unsafe_allow_html=True)
 
 # Stats principales
-if not st.session_state.judo_data.empty:
-    total_combats = int(st.session_state.judo_data['Victoires'].sum() + st.session_state.judo_data['Defaites'].sum())
-    top_player = st.session_state.classement_joueurs.loc[st.session_state.classement_joueurs['Points'].idxmax()] if not st.session_state.classement_joueurs.empty else None
-    top_team = st.session_state.classement_equipes.loc[st.session_state.classement_equipes['Points_Totaux'].idxmax()] if not st.session_state.classement_equipes.empty else None
+resume = moteur.resume()
+if resume["joueurs"]:
+    total_combats = resume["total_combats"]
+    top_player = resume["meilleur_joueur"]
+    top_team = resume["meilleure_equipe"]
     
     st.sidebar.markdown("<p style='font-weight: bold; color: #2E86C1;'>Participants</p>", unsafe_allow_html=True)
-    st.sidebar.write(f"🏋️‍♂️ Joueurs inscrits : <strong>{len(st.session_state.judo_data)}</strong>", unsafe_allow_html=True)
-    st.sidebar.write(f"🤼 Équipes participantes : <strong>{len(st.session_state.classement_equipes)}</strong>", unsafe_allow_html=True)
+    st.sidebar.write(f"🏋️‍♂️ Joueurs inscrits : <strong>{resume['joueurs']}</strong>", unsafe_allow_html=True)
+    st.sidebar.write(f"🤼 Équipes participantes : <strong>{resume['equipes']}</strong>", unsafe_allow_html=True)
     st.sidebar.markdown("<hr style='border: 0.5px solid #D3D3D3;'>", unsafe_allow_html=True)
     
     st.sidebar.markdown("<p style='font-weight: bold; color: #2E86C1;'>Activité</p>", unsafe_allow_html=True)
     st.sidebar.write(f"🥊 Total matchs : <strong>{total_combats}</strong>", unsafe_allow_html=True)
-    st.sidebar.write(f"🎯 Points attribués : <strong>{int(st.session_state.judo_data['Points'].sum())}</strong>", unsafe_allow_html=True)
+    st.sidebar.write(f"🎯 Points attribués : <strong>{resume['points']}</strong>", unsafe_allow_html=True)
     st.sidebar.markdown("<hr style='border: 0.5px solid #D3D3D3;'>", unsafe_allow_html=True)
     
     st.sidebar.markdown("<p style='font-weight: bold; color: #2E86C1;'>Leaders</p>", unsafe_allow_html=True)
@@ -542,3 +628,50 @@ else:
     st.sidebar.write("Aucune donnée disponible pour le résumé.", unsafe_allow_html=True)
 
 st.sidebar.markdown("</div>", unsafe_allow_html=True)
+
+# Notification des nouveaux résultats saisis par d'autres officiels
+@st.fragment(run_every=5)
+def nouveaux_resultats():
+    if etat.rafraichir() != st.session_state.get("version_vue"):
+        st.info("Nouveaux résultats disponibles.")
+        if st.button("Actualiser", key="actualiser"):
+            st.rerun()
+
+with st.sidebar:
+    nouveaux_resultats()
+st.session_state.version_vue = etat.version
+mesures.marquer("resume")
+
+if st.session_state.pop("profil_en_cours", None) is not None:
+    st.session_state.profil_resultat = profil.arreter()
+
+# Panneau d'administration (JUDO_ADMIN=1) : décomposition des passages, p50/p95 et profilage
+if ADMIN:
+    with st.expander("Mesures et profilage"):
+        dernier = st.session_state.get("dernier_passage")
+        if dernier is not None:
+            st.markdown(f"**Passage précédent** ({dernier.nom}) : {dernier.duree * 1000:.1f} ms")
+            st.dataframe(dernier.tableau(), use_container_width=True, hide_index=True)
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.markdown("**Mesures** (fenêtre glissante, en ms)")
+            st.dataframe(mesures.registre.statistiques(), use_container_width=True, hide_index=True)
+        with col2:
+            st.markdown("**Compteurs**")
+            st.dataframe(mesures.registre.compteurs(), use_container_width=True, hide_index=True)
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            outil = st.selectbox("Profileur", mesures.PROFILEURS, key="profileur")
+        with col2:
+            if st.button("Profiler le prochain passage"):
+                st.session_state.profil_demande = outil
+                st.rerun()
+        with col3:
+            if st.button("Réinitialiser les mesures"):
+                mesures.registre.reinitialiser()
+        if "profil_resultat" in st.session_state:
+            st.code(st.session_state.profil_resultat, language=None)
+            st.download_button("Télécharger le profil", st.session_state.profil_resultat.encode("utf-8"),
+                               file_name=f"profil_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt", mime="text/plain")
+
+st.session_state.dernier_passage = mesures.registre.terminer_passage()
@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from championnat.journal import Journal  # noqa: E402
+from championnat.stockage import StockageJournal, StockageSQLite  # noqa: E402
+
+
+@pytest.fixture(params=["journal", "sqlite"])
+def stockage(request, tmp_path):
+    """Les deux stockages, chacun dans un répertoire vide."""
+    journal = Journal(str(tmp_path / "judo_journal.jsonl"), str(tmp_path / "judo_data.arrow"))
+    if request.param == "journal":
+        return StockageJournal(journal)
+    return StockageSQLite(str(tmp_path / "judo.db"), legacy=StockageJournal(journal))
@@ -0,0 +1,43 @@
+from championnat import analyses, evenements
+from championnat.classements import MoteurClassement
+
+
+def moteur_de_test():
+    moteur = MoteurClassement()
+    for equipe, joueur, poids in [("E1", "A", 60), ("E1", "B", 90), ("E2", "C", 60), ("E2", "D", 95)]:
+        moteur.appliquer(evenements.ajout(equipe, joueur, poids))
+    moteur.appliquer(evenements.match("A", "C", "A", "Ippon (10 pts)"))
+    moteur.appliquer(evenements.match("B", "D", "D", "Yuko (5 pts)"))
+    return moteur
+
+
+def test_filtres_et_statistiques():
+    moteur = moteur_de_test()
+    assert sorted(analyses.filtrer(moteur, "Toutes", "E1")['Joueur']) == ["A", "B"]
+    assert analyses.filtrer(moteur, "-60 kg", "Toutes")['Joueur'].tolist() == ["A", "C"]
+    assert analyses.statistiques(moteur, "Toutes", "Toutes") == {
+        "Total Combats": 4, "Points Totaux": 15, "Ratio Points/Victoire": "7.50", "Performance Moyenne": "50.00%"}
+    assert analyses.statistiques(moteur, "-60 kg", "E2")["Ratio Points/Victoire"] == "N/A"
+
+
+def test_cache_invalide_par_une_mutation():
+    moteur = moteur_de_test()
+    premier = analyses.statistiques(moteur, "Toutes", "Toutes")
+    assert analyses.statistiques(moteur, "Toutes", "Toutes") is premier
+    moteur.appliquer(evenements.match("A", "B", "A", "Waza-ari (7 pts)"))
+    second = analyses.statistiques(moteur, "Toutes", "Toutes")
+    assert second is not premier and second["Points Totaux"] == 22
+    # Deux moteurs à la même version ne partagent pas leurs résultats
+    autre = MoteurClassement()
+    autre.version = moteur.version
+    assert analyses.filtrer(autre, "Toutes", "Toutes").empty
+
+
+def test_figures():
+    moteur = moteur_de_test()
+    barres, carte, radar, camembert = analyses.figures(moteur, "Toutes", "Toutes")
+    # Une trace par équipe, joueurs dans l'ordre du palmarès
+    assert [list(trace.x) for trace in barres.data] == [["A", "B"], ["D", "C"]] and len(radar.data) == 4
+    assert analyses.figures(moteur, "Toutes", "E1")[2] is not None
+    vide = MoteurClassement()
+    assert analyses.figures(vide, "Toutes", "Toutes")[2] is None
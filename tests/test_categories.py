@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from championnat.categories import TABLES, categorie_poids, categoriser, libelles
+
+
+@pytest.mark.parametrize("table", list(TABLES))
+def test_categoriser_comme_categorie_poids(table):
+    poids = np.arange(30, 151)
+    obtenu = categoriser(poids, table)
+    assert list(obtenu.categories) == libelles(table) and obtenu.ordered
+    assert [str(categorie) for categorie in obtenu] == [categorie_poids(p, table) for p in poids]
+
+
+def test_bornes_et_poids_manquants():
+    obtenu = categoriser([60, 61, 100, 101, np.nan])
+    assert [str(c) for c in obtenu[:4]] == ["-60 kg", "-66 kg", "-100 kg", "+100 kg"]
+    assert obtenu.isna().tolist() == [False] * 4 + [True]
+    assert categoriser([48, 49, 79], ("F", "senior")).tolist() == ["-48 kg", "-52 kg", "+78 kg"]
+
+
+def test_categorie_inconnue_refusee():
+    with pytest.raises(KeyError):
+        categoriser([60], ("X", "senior"))
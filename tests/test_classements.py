@@ -0,0 +1,223 @@
+import random
+import threading
+
+import pandas as pd
+import pytest
+
+from championnat import evenements
+from championnat.categories import categorie_poids
+from championnat.classements import MoteurClassement
+
+
+def moteur_de(joueurs):
+    moteur = MoteurClassement()
+    for i, joueur in enumerate(joueurs):
+        moteur.appliquer(evenements.ajout(f"E{i % 3}", joueur, 60 + i))
+    return moteur
+
+
+def test_lectures_pendant_les_ecritures():
+    joueurs = [f"J{i}" for i in range(20)]
+    moteur = moteur_de(joueurs)
+    fini = threading.Event()
+
+    def saisir():
+        for i in range(2000):
+            evenement = evenements.match(joueurs[i % 20], joueurs[(i + 1) % 20], joueurs[i % 20], "Ippon (10 pts)")
+            moteur.appliquer(evenement)
+            if i % 3 == 0:
+                moteur.appliquer(evenements.annulation(evenement["id"]))
+        fini.set()
+
+    ecrivain = threading.Thread(target=saisir)
+    ecrivain.start()
+    while not fini.is_set():
+        matchs = moteur.liste_matchs()
+        assert all(match["id"] for match in matchs)
+        moteur.page_classement(0, 10)
+        moteur.page_classement_equipes(0, 10)
+        moteur.noms_equipes()
+    ecrivain.join()
+    assert moteur.verifier() == []
+
+
+def test_liste_matchs_et_fiche_sont_des_copies():
+    moteur = moteur_de(["A", "B"])
+    premier = evenements.match("A", "B", "A", "Ippon (10 pts)")
+    second = evenements.match("A", "B", "B", "Yuko (5 pts)")
+    moteur.appliquer(premier)
+    moteur.appliquer(second)
+    assert [match["id"] for match in moteur.liste_matchs()] == [second["id"], premier["id"]]
+    moteur.liste_matchs()[0]["points"] = 0
+    assert moteur.matchs[second["id"]]["points"] == 5
+    fiche = moteur.fiche("A")
+    moteur.appliquer(evenements.suppression("A"))
+    assert fiche["Joueur"] == "A" and moteur.fiche("A") is None
+
+
+def test_match_puis_annulation():
+    moteur = moteur_de(["A", "B", "C"])
+    evenement = evenements.match("A", "B", "A", "Waza-ari (7 pts)")
+    moteur.appliquer(evenement)
+    assert (moteur.joueur("A")['Points'], moteur.joueur("A")['Victoires'], moteur.joueur("B")['Defaites']) == (7, 1, 1)
+    assert moteur.equipes["E0"]['Points_Totaux'] == 7
+    assert moteur.verifier() == []
+    moteur.appliquer(evenements.annulation(evenement["id"]))
+    assert (moteur.joueur("A")['Points'], moteur.joueur("B")['Defaites']) == (0, 0)
+    assert moteur.equipes["E0"]['Points_Totaux'] == 0
+    assert moteur.verifier() == []
+
+
+def test_suppression():
+    moteur = moteur_de(["A", "B", "C", "D"])
+    evenement = evenements.match("A", "B", "A", "Ippon (10 pts)")
+    moteur.appliquer(evenement)
+    moteur.appliquer(evenements.suppression("A"))
+    assert "A" not in moteur and moteur.noms() == ["D", "B", "C"]
+    assert moteur.equipes["E0"]['Points_Totaux'] == 0 and moteur.verifier() == []
+    # La contribution du joueur supprimé est déjà partie : l'annulation ne touche que l'adversaire
+    moteur.appliquer(evenements.annulation(evenement["id"]))
+    assert moteur.joueur("B")['Defaites'] == 0 and moteur.verifier() == []
+    moteur.appliquer(evenements.suppression("C"))
+    assert "E2" not in moteur.equipes and moteur.verifier() == []
+
+
+def test_changement_d_equipe_et_de_categorie():
+    moteur = moteur_de(["A", "B", "C"])
+    moteur.appliquer(evenements.match("A", "B", "A", "Ippon (10 pts)"))
+    moteur.appliquer(evenements.modification("A", "E1", 95, 1, 0))
+    assert moteur.joueur("A")['Categorie'] == "-100 kg"
+    assert "E0" not in moteur.equipes
+    assert moteur.equipes["E1"] == {'Points_Totaux': 10, 'Victoires_Totaux': 1}
+    assert moteur.classement_des_equipes(categorie="-100 kg")['Equipe'].tolist() == ["E1"]
+    assert moteur.verifier() == []
+
+
+def test_scenario_aleatoire_contre_recalcul_pandas():
+    """Événements tirés au hasard ; totaux et classements comparés à un recalcul complet avec pandas."""
+    hasard = random.Random(7)
+    moteur = MoteurClassement()
+    joueurs, matchs = {}, {}  # modèle de référence : nom -> [Equipe, Poids, Victoires, Defaites, Points]
+
+    def compter(match, signe):
+        if match["vainqueur"] == "Égalité":
+            return
+        for joueur in (match["joueur1"], match["joueur2"]):
+            if joueur in joueurs:
+                if joueur == match["vainqueur"]:
+                    joueurs[joueur][2] += signe
+                    joueurs[joueur][4] += signe * match["points"]
+                else:
+                    joueurs[joueur][3] += signe
+
+    def combat():
+        joueur1, joueur2 = hasard.sample(sorted(joueurs), 2)
+        vainqueur = hasard.choice([joueur1, joueur2, "Égalité"])
+        return evenements.match(joueur1, joueur2, vainqueur, hasard.choice(list(evenements.POINTS_VICTOIRE)))
+
+    for n in range(1500):
+        tirage = hasard.random()
+        if len(joueurs) < 4 or tirage < 0.15:
+            nom, equipe, poids = f"J{n}", f"E{hasard.randrange(6)}", hasard.randrange(45, 120)
+            evenement = evenements.ajout(equipe, nom, poids, hasard.randrange(3), hasard.randrange(3))
+            joueurs[nom] = [equipe, poids, evenement["victoires"], evenement["defaites"], 0]
+        elif tirage < 0.55:
+            evenement = combat()
+            matchs[evenement["id"]] = evenement
+            compter(evenement, 1)
+        elif tirage < 0.65:
+            lot = [combat() for _ in range(hasard.randrange(1, 6))]
+            evenement = evenements.matchs({colonne: [match[colonne] for match in lot]
+                                           for colonne in ("id", "joueur1", "joueur2", "vainqueur", "points", "date")})
+            for match in lot:
+                matchs[match["id"]] = match
+                compter(match, 1)
+        elif tirage < 0.75 and matchs:
+            match = matchs.pop(hasard.choice(sorted(matchs)))
+            evenement = evenements.annulation(match["id"])
+            compter(match, -1)
+        elif tirage < 0.82:
+            nom = hasard.choice(sorted(joueurs))
+            evenement = evenements.suppression(nom)
+            del joueurs[nom]
+        else:
+            nom = hasard.choice(sorted(joueurs))
+            ligne = joueurs[nom]
+            # Compteurs jamais en dessous des combats encore comptés : une annulation ne les rend pas négatifs
+            ligne[:4] = [f"E{hasard.randrange(6)}", hasard.randrange(45, 120),
+                         ligne[2] + hasard.randrange(3), ligne[3] + hasard.randrange(3)]
+            evenement = evenements.modification(nom, *ligne[:4])
+        moteur.appliquer(evenement)
+        if n % 250 == 0:
+            assert moteur.verifier() == []
+
+    assert moteur.verifier() == []
+    attendu = pd.DataFrame([[nom, *ligne] for nom, ligne in joueurs.items()],
+                           columns=['Joueur', 'Equipe', 'Poids', 'Victoires', 'Defaites', 'Points'])
+    attendu['Performance'] = (attendu['Victoires'] / (attendu['Victoires'] + attendu['Defaites'])).fillna(0)
+    attendu['Categorie'] = [categorie_poids(poids) for poids in attendu['Poids']]
+    attendu = attendu.sort_values(['Points', 'Victoires', 'Performance', 'Joueur'],
+                                  ascending=[False, False, False, True], ignore_index=True)
+    obtenu = moteur.classement()
+    assert obtenu['Joueur'].tolist() == attendu['Joueur'].tolist()
+    assert obtenu['Points'].tolist() == attendu['Points'].tolist()
+    assert obtenu['Victoires'].tolist() == attendu['Victoires'].tolist()
+
+    def equipes_attendues(lignes):
+        totaux = lignes.groupby('Equipe', as_index=False)[['Points', 'Victoires']].sum()
+        totaux = totaux.sort_values(['Points', 'Victoires', 'Equipe'], ascending=[False, False, True])
+        return list(zip(totaux['Equipe'], totaux['Points'], totaux['Victoires']))
+
+    def equipes_obtenues(classement):
+        return list(zip(classement['Equipe'].astype(str), classement['Points_Totaux'], classement['Victoires_Totaux']))
+
+    assert equipes_obtenues(moteur.classement_des_equipes()) == equipes_attendues(attendu)
+    for categorie, lignes in attendu.groupby('Categorie'):
+        assert equipes_obtenues(moteur.classement_des_equipes(categorie=categorie)) == equipes_attendues(lignes)
+        noms = lignes['Joueur'].tolist()
+        assert moteur.classement(categorie=categorie)['Joueur'].tolist() == noms
+
+
+def test_annulation_apres_modification_ne_rend_pas_negatif():
+    moteur = moteur_de(["A", "B"])
+    evenement = evenements.match("A", "B", "A", "Ippon (10 pts)")
+    moteur.appliquer(evenement)
+    moteur.appliquer(evenements.modification("A", "E0", 60, 0, 0))
+    moteur.appliquer(evenements.modification("B", "E1", 61, 0, 0))
+    moteur.appliquer(evenements.annulation(evenement["id"]))
+    a, b = moteur.joueur("A"), moteur.joueur("B")
+    assert (a['Victoires'], a['Points'], b['Defaites']) == (0, 0, 0)
+    assert moteur.equipes["E0"] == {'Points_Totaux': 0, 'Victoires_Totaux': 0}
+    assert moteur.verifier() == []
+
+
+def test_annulation_d_un_combat_inconnu():
+    moteur = moteur_de(["A", "B"])
+    evenement = evenements.match("A", "B", "A", "Ippon (10 pts)")
+    moteur.appliquer(evenement)
+    moteur.appliquer(evenements.annulation(evenement["id"]))
+    for match_id in (evenement["id"], "inconnu"):
+        with pytest.raises(ValueError, match=match_id):
+            moteur.appliquer(evenements.annulation(match_id))
+    assert moteur.joueur("A")['Points'] == 0 and moteur.verifier() == []
+
+
+def test_page_classement():
+    moteur = moteur_de([f"Athlete{i}" for i in range(30)])
+    for i in range(0, 30, 2):
+        moteur.appliquer(evenements.match(f"Athlete{i}", f"Athlete{i + 1}", f"Athlete{i}", "Ippon (10 pts)"))
+    total, page = moteur.page_classement(0, 5)
+    assert total == 30 and page['Rang'].tolist() == [1, 2, 3, 4, 5]
+    assert page['Joueur'].tolist() == moteur.classement()['Joueur'].head(5).tolist()
+    total, page = moteur.page_classement(0, 3, tri="inverse")
+    assert page['Rang'].tolist() == [30, 29, 28] and page['Joueur'].tolist() == moteur.classement()['Joueur'].tolist()[::-1][:3]
+    total, page = moteur.page_classement(0, 50, equipe="E1", recherche="athlete1", tri="nom")
+    assert page['Joueur'].tolist() == ["Athlete1", "Athlete10", "Athlete13", "Athlete16", "Athlete19"]
+    # Le rang reste celui du classement de l'équipe, pas celui de la recherche
+    rangs = {nom: rang for rang, nom in enumerate(moteur.classement(equipe="E1")['Joueur'], 1)}
+    assert total == 5 and page['Rang'].tolist() == [rangs[nom] for nom in page['Joueur']]
+    total, page = moteur.page_classement(0, 5, recherche="introuvable")
+    assert total == 0 and page.empty and list(page.columns)[:2] == ['Rang', 'Joueur']
+    total, page = moteur.page_classement_equipes(0, 2)
+    assert total == 3 and page['Rang'].tolist() == [1, 2]
+    assert page['Equipe'].tolist() == moteur.classement_des_equipes()['Equipe'].head(2).tolist()
@@ -0,0 +1,64 @@
+import pandas as pd
+import pytest
+
+from championnat.__main__ import main
+
+JOUEURS = "Equipe,Joueur,Poids\nFRMJ,A,60\nFRMJ,B,66\nWAC,C,60\nWAC,D,90\nWAC,D,91\n"
+COMBATS = "Id,Joueur1,Joueur2,Vainqueur,Technique\nK1,A,C,A,Ippon\nK2,B,D,D,Yuko\nK3,A,Z,A,Ippon\n"
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def cli(request, tmp_path, capsys):
+    options = ["--journal", str(tmp_path / "journal.jsonl"), "--instantane", str(tmp_path / "data.arrow"),
+               "--archives", str(tmp_path / "archives")]
+    if request.param == "sqlite":
+        options += ["--stockage", f"sqlite:{tmp_path / 'judo.db'}"]
+
+    def lancer(*args):
+        code = main([*options, *map(str, args)])
+        sortie = capsys.readouterr()
+        return code, sortie.out, sortie.err
+    return lancer
+
+
+def test_import_combats_classement_export(cli, tmp_path):
+    (tmp_path / "joueurs.csv").write_text(JOUEURS)
+    (tmp_path / "combats.csv").write_text(COMBATS)
+    code, sortie, erreurs = cli("importer", tmp_path / "joueurs.csv")
+    assert code == 0 and "4 joueur(s) importé(s), 1 ligne(s) rejetée(s)" in sortie
+    assert "Joueur en double dans le fichier" in erreurs
+    code, sortie, erreurs = cli("combats", tmp_path / "combats.csv")
+    assert "2 combat(s) enregistré(s), 0 déjà connu(s), 1 ligne(s) rejetée(s)" in sortie
+    assert "déjà connu" in cli("combats", tmp_path / "combats.csv")[1]
+
+    code, sortie, _ = cli("recalculer", "--verifier")
+    assert code == 0 and "4 joueurs, 2 équipes, 2 matchs" in sortie and "Classements cohérents." in sortie
+    for commande in (["classement", "-n", 2], ["compacter"], ["classement", "-n", 2]):
+        code, sortie, _ = cli(*commande)
+        assert code == 0
+    assert sortie.splitlines()[1].split()[:2] == ["A", "FRMJ"]
+    assert cli("classement", "--equipes")[1].splitlines()[1].split()[:2] == ["FRMJ", "10"]
+
+    cli("exporter", "csv", tmp_path / "combats_export.csv", "--table", "combats")
+    assert sorted(pd.read_csv(tmp_path / "combats_export.csv")["Id"]) == ["K1", "K2"]
+    cli("exporter", "csv", tmp_path / "joueurs_export.csv")
+    assert len(pd.read_csv(tmp_path / "joueurs_export.csv")) == 4
+
+
+def test_saison_et_archives(cli, tmp_path):
+    (tmp_path / "joueurs.csv").write_text(JOUEURS)
+    cli("importer", tmp_path / "joueurs.csv")
+    code, sortie, _ = cli("saison", "2030", "--table", "M-cadet")
+    assert code == 0 and "saison 2030 ouverte" in sortie
+    code, _, erreurs = cli("saison", "2030")
+    assert code == 1 and erreurs
+    assert "D" in cli("archives", "carrieres", "--en-cours")[1]
+
+
+def test_planning(cli, tmp_path):
+    (tmp_path / "joueurs.csv").write_text(JOUEURS)
+    cli("importer", tmp_path / "joueurs.csv")
+    code, _, erreurs = cli("planning", "--tapis", 2, tmp_path / "planning.csv")
+    assert code == 0 and "combats sur 2 tapis" in erreurs
+    assert set(pd.read_csv(tmp_path / "planning.csv")["Tapis"]) <= {1, 2}
+
@@ -0,0 +1,19 @@
+from championnat.combats import JournalCombats
+
+
+def lot(prefixe, paires, debut=0):
+    return [{"id": f"{prefixe}{i}", "joueur1": a, "joueur2": b, "vainqueur": a, "points": 10, "date": debut + i}
+            for i, (a, b) in enumerate(paires)]
+
+
+def test_index_par_joueur_prolonge_par_un_lot():
+    journal = JournalCombats()
+    journal.ajouter_lot(lot("a", [("A", "B"), ("B", "C"), ("C", "A")]))
+    assert journal.combats_de("A").tolist() == [0, 2]
+    journal.ajouter_lot(lot("b", [("A", "C"), ("D", "B")], debut=10))
+    assert journal._par_joueur is not None  # pas de reconstruction complète
+    index = {code: list(lignes) for code, lignes in journal._par_joueur.items()}
+    journal._par_joueur = None
+    assert journal._lignes_par_joueur() == index
+    assert journal.combats_de("A").tolist() == [0, 2, 3]
+    assert journal.combats_de("D").tolist() == [4]
@@ -0,0 +1,138 @@
+import asyncio
+import inspect
+import json
+
+from championnat import direct, evenements
+from championnat.__main__ import main
+
+
+def lire_paquets(donnees):
+    """Messages SSE d'un flux : [(type, id, données)]."""
+    paquets = []
+    for bloc in donnees.decode("utf-8").split("\n\n"):
+        champs = dict(ligne.split(": ", 1) for ligne in bloc.splitlines() if ": " in ligne and not ligne.startswith(":"))
+        if "event" in champs:
+            paquets.append((champs["event"], int(champs["id"]), json.loads(champs["data"])))
+    return paquets
+
+
+def inscrire(stockage):
+    moteur = stockage.charger()
+    for equipe, joueur in [("E1", "A"), ("E1", "B"), ("E2", "C"), ("E2", "D")]:
+        stockage.enregistrer(moteur, evenements.ajout(equipe, joueur, 70))
+    return moteur
+
+
+def test_lire_diffuse_combats_diff_et_tableau(stockage):
+    moteur = inscrire(stockage)
+    flux = direct.Direct(stockage, taille=3)
+    assert flux.lire() == []
+    premier = evenements.match("A", "C", "A", "Ippon (10 pts)")
+    stockage.enregistrer(moteur, premier)
+    stockage.enregistrer(moteur, evenements.match("B", "D", "D", "Yuko (5 pts)"))
+    messages = flux.lire()
+    assert [type_message for type_message, _ in messages] == ["match", "match", "diff", "tableau"]
+    assert messages[0][1]["technique"] == "Ippon" and messages[1][1]["vainqueur"] == "D"
+    diff = messages[2][1]
+    assert diff["seq"] == moteur.seq and set(diff["joueurs"]) == {"A", "B", "C", "D"}
+    assert diff["joueurs"]["A"]["Points"] == 10 and diff["equipes"]["E2"]["Points_Totaux"] == 5
+    tableau = messages[3][1]
+    assert [j["Joueur"] for j in tableau["joueurs"]] == ["A", "D", "B"]
+    assert [c["id"] for c in tableau["derniers"]][1] == premier["id"]
+
+    stockage.enregistrer(moteur, evenements.annulation(premier["id"]))
+    annulation, _, tableau = flux.lire()
+    assert annulation == ("annulation", {"id": premier["id"]})
+    assert premier["id"] not in [c["id"] for c in tableau[1]["derniers"]]
+
+
+def test_lire_recharge_apres_compaction(stockage):
+    moteur = inscrire(stockage)
+    flux = direct.Direct(stockage)
+    stockage.enregistrer(moteur, evenements.match("A", "C", "A", "Ippon (10 pts)"))
+    stockage.enregistrer(moteur, evenements.match("B", "D", "D", "Yuko (5 pts)"))
+    stockage.compacter()
+    messages = flux.lire()
+    assert [type_message for type_message, _ in messages] == ["tableau"]
+    assert flux.moteur.seq == moteur.seq and messages[0][1]["resume"]["points"] == 15
+
+
+def test_flux_sse_et_rattrapage_des_nouveaux_ecrans(stockage):
+    moteur = inscrire(stockage)
+
+    async def scenario():
+        flux = direct.Direct(stockage)
+        serveur = await asyncio.start_server(flux.servir, "127.0.0.1", 0)
+        port = serveur.sockets[0].getsockname()[1]
+
+        async def ecran():
+            lecteur, ecrivain = await asyncio.open_connection("127.0.0.1", port)
+            ecrivain.write(b"GET /flux HTTP/1.1\r\nHost: test\r\n\r\n")
+            entete = await lecteur.readuntil(b"\r\n\r\n")
+            assert b"text/event-stream" in entete
+            return lecteur, ecrivain
+
+        async def suivants(lecteur, n):
+            paquets = []
+            while len(paquets) < n:
+                paquets += lire_paquets(await asyncio.wait_for(lecteur.readuntil(b"\n\n"), 5))
+            return paquets
+
+        async def attendre_abonnes(n):
+            while len(flux.clients) < n:
+                await asyncio.sleep(0.01)
+
+        async with serveur:
+            lecteur1, ecrivain1 = await ecran()
+            assert [t for t, _, _ in await suivants(lecteur1, 1)] == ["tableau"]
+            await attendre_abonnes(1)
+
+            stockage.enregistrer(moteur, evenements.match("A", "C", "A", "Ippon (10 pts)"))
+            flux.diffuser(flux.lire())
+            paquets = await suivants(lecteur1, 3)
+            assert [(t, seq) for t, seq, _ in paquets] == [("match", moteur.seq), ("diff", moteur.seq),
+                                                           ("tableau", moteur.seq)]
+
+            # Un écran qui arrive après coup reçoit d'emblée le tableau courant
+            lecteur2, ecrivain2 = await ecran()
+            (type_message, seq, tableau), = await suivants(lecteur2, 1)
+            assert (type_message, seq) == ("tableau", moteur.seq)
+            assert tableau["joueurs"][0]["Joueur"] == "A" and tableau["derniers"][0]["vainqueur"] == "A"
+            await attendre_abonnes(2)
+
+            stockage.enregistrer(moteur, evenements.match("B", "D", "D", "Yuko (5 pts)"))
+            flux.diffuser(flux.lire())
+            for lecteur in (lecteur1, lecteur2):
+                assert [t for t, _, _ in await suivants(lecteur, 3)] == ["match", "diff", "tableau"]
+
+            # /tableau renvoie le même dernier tableau en JSON
+            lecteur3, ecrivain3 = await asyncio.open_connection("127.0.0.1", port)
+            ecrivain3.write(b"GET /tableau HTTP/1.1\r\n\r\n")
+            reponse = await lecteur3.read()
+            assert json.loads(reponse.split(b"\r\n\r\n", 1)[1])["seq"] == moteur.seq
+            for ecrivain in (ecrivain1, ecrivain2, ecrivain3):
+                ecrivain.close()
+
+    asyncio.run(scenario())
+
+
+def test_ecran_trop_lent_deconnecte(stockage):
+    flux = direct.Direct(stockage)
+    lent = asyncio.Queue(direct.ATTENTE_MAX)
+    flux.clients.add(lent)
+    flux.diffuser([("tableau", flux.tableau())] * (direct.ATTENTE_MAX + 1))
+    assert lent not in flux.clients and lent.get_nowait() is None
+
+
+def test_ecoute_locale_par_defaut(monkeypatch, tmp_path):
+    assert inspect.signature(direct.servir).parameters["hote"].default == "127.0.0.1"
+    appels = []
+
+    async def servir(stockage, hote, port, intervalle, simulation):
+        appels.append(hote)
+
+    monkeypatch.setattr(direct, "servir", servir)
+    options = ["--journal", str(tmp_path / "journal.jsonl"), "--instantane", str(tmp_path / "data.arrow"), "direct"]
+    main(options)
+    main([*options, "--hote", "0.0.0.0"])
+    assert appels == ["127.0.0.1", "0.0.0.0"]
@@ -0,0 +1,74 @@
+import io
+
+from championnat import evenements
+from championnat.classements import MoteurClassement
+from championnat.importation import importer_csv
+
+CSV = """Equipe,Joueur,Poids,Victoires,Defaites,Points
+FRMJ,A,60,2,1,17
+FRMJ,B,66,,,
+ASFAR,C,abc,0,0,0
+ASFAR,,73,0,0,0
+WAC,D,200,0,0,0
+WAC,E,81,-1,0,0
+WAC,F,90,0,0,1.5
+RAJA,A,60,0,0,0
+RAJA,G,100,1,0,10
+"""
+
+
+def importer(stockage, moteur, texte=CSV, taille_bloc=3):
+    return importer_csv(io.StringIO(texte), moteur, lambda evenement: stockage.enregistrer(moteur, evenement),
+                        taille_bloc=taille_bloc)
+
+
+def test_import_par_blocs_et_rejets(stockage):
+    moteur = stockage.charger()
+    evenements_import = []
+
+    def enregistrer(evenement):
+        evenements_import.append(evenement)
+        stockage.enregistrer(moteur, evenement)
+
+    rapport = importer_csv(io.StringIO(CSV), moteur, enregistrer, taille_bloc=3)
+    # Un événement par bloc non vide ; A, déjà importé par le premier bloc, est rejeté dans le dernier
+    assert [evenement["lignes"]["Joueur"] for evenement in evenements_import] == [["A", "B"], ["G"]]
+    assert (rapport.acceptes, rapport.nb_rejets) == (3, 6)
+    assert rapport.rejets == [
+        (4, "C", "Poids non numérique"),
+        (5, "", "Joueur manquant"),
+        (6, "D", "Poids hors de [30, 150] kg"),
+        (7, "E", "Victoires/Défaites/Points invalides"),
+        (8, "F", "Victoires/Défaites/Points invalides"),
+        (9, "A", "Joueur déjà inscrit"),
+    ]
+
+
+def test_doublons_dans_le_fichier_et_deja_inscrits(stockage):
+    moteur = stockage.charger()
+    stockage.enregistrer(moteur, evenements.ajout("FRMJ", "X", 60))
+    texte = "Equipe,Joueur,Poids\nFRMJ,Y,60\nFRMJ,Y,61\nFRMJ,X,62\n"
+    rapport = importer(stockage, moteur, texte, taille_bloc=10)
+    assert rapport.acceptes == 1
+    assert [motif for _, _, motif in rapport.rejets] == ["Joueur en double dans le fichier", "Joueur déjà inscrit"]
+    assert moteur.joueur("Y")['Poids'] == 60 and moteur.joueur("X")['Poids'] == 60
+    assert importer(stockage, moteur, texte).acceptes == 0
+
+
+def test_points_reimportes_depuis_l_export(stockage):
+    moteur = stockage.charger()
+    importer(stockage, moteur)
+    assert (moteur.joueur("A")['Points'], moteur.joueur("B")['Points'], moteur.joueur("G")['Points']) == (17, 0, 10)
+    assert moteur.equipes["FRMJ"]['Points_Totaux'] == 17 and moteur.verifier() == []
+    colonnes = ['Joueur', 'Equipe', 'Poids', 'Victoires', 'Defaites', 'Points']
+
+    def joueurs(moteur):
+        return moteur.judo_data[colonnes].sort_values('Joueur', ignore_index=True)
+
+    # Le rechargement rejoue l'import avec les points
+    assert joueurs(stockage.charger()).equals(joueurs(moteur))
+
+    copie = MoteurClassement()
+    rapport = importer_csv(io.StringIO(moteur.judo_data.to_csv(index=False)), copie, copie.appliquer)
+    assert (rapport.acceptes, rapport.nb_rejets) == (3, 0)
+    assert joueurs(copie).equals(joueurs(moteur))
@@ -0,0 +1,22 @@
+from championnat import evenements
+from championnat.journal import Journal
+
+
+def test_numeros_de_sequence_croissants(tmp_path):
+    journal = Journal(str(tmp_path / "journal.jsonl"), str(tmp_path / "instantane.arrow"))
+    seqs = [journal.ajouter(evenements.ajout("E", f"J{i}", 70))["seq"] for i in range(3)]
+    assert seqs == [1, 2, 3]
+    assert journal.dernier_seq() == 3
+
+
+def test_ligne_plus_longue_que_la_fenetre(tmp_path):
+    # Un gros import tient sur une ligne de plusieurs centaines de Ko
+    journal = Journal(str(tmp_path / "journal.jsonl"), str(tmp_path / "instantane.arrow"))
+    n = 12_000
+    lignes = {"Equipe": ["CLUB"] * n, "Joueur": [f"IMPORT{i:06d}" for i in range(n)], "Poids": [70] * n,
+              "Victoires": [0] * n, "Defaites": [0] * n}
+    journal.ajouter(evenements.importation(lignes))
+    assert (tmp_path / "journal.jsonl").stat().st_size > 65536
+    assert journal.dernier_seq() == 1
+    assert journal.ajouter(evenements.ajout("E", "SUIVANT", 70))["seq"] == 2
+    assert [evenement["seq"] for evenement in journal.relire()] == [1, 2]
@@ -0,0 +1,65 @@
+from championnat import evenements
+from championnat.importation import importer_combats
+
+LOT = """Id,Joueur1,Joueur2,Vainqueur,Technique
+L1,A,B,A,Ippon
+L2,C,D,Égalité,
+L3,B,C,C,Yuko
+"""
+
+
+def inscrire(stockage, moteur):
+    for joueur, poids in zip("ABCD", (60, 66, 73, 81)):
+        stockage.enregistrer(moteur, evenements.ajout("CLUB", joueur, poids))
+
+
+def importer(stockage, moteur, texte=LOT):
+    return importer_combats(texte, moteur, lambda evenement: stockage.enregistrer(moteur, evenement))
+
+
+def test_lot_renvoye_ignore(stockage):
+    moteur = stockage.charger()
+    inscrire(stockage, moteur)
+    rapport = importer(stockage, moteur)
+    assert (rapport.acceptes, rapport.deja_enregistres, rapport.nb_rejets) == (3, 0, 0)
+    rapport = importer(stockage, moteur)
+    assert (rapport.acceptes, rapport.deja_enregistres) == (0, 3)
+    assert moteur.joueur("A")['Points'] == 10
+    assert moteur.verifier() == []
+
+
+def test_lot_renvoye_apres_annulation_et_rechargement(stockage):
+    moteur = stockage.charger()
+    inscrire(stockage, moteur)
+    importer(stockage, moteur)
+    stockage.enregistrer(moteur, evenements.annulation("L1"))
+    moteur = stockage.charger()
+    assert "L1" in moteur.combats and "L1" not in moteur.matchs
+    rapport = importer(stockage, moteur)
+    assert (rapport.acceptes, rapport.deja_enregistres) == (0, 3)
+    assert moteur.joueur("A")['Points'] == 0
+    assert stockage.charger().joueur("A")['Points'] == 0
+
+
+def test_lot_renvoye_apres_compaction(stockage):
+    moteur = stockage.charger()
+    inscrire(stockage, moteur)
+    importer(stockage, moteur)
+    stockage.enregistrer(moteur, evenements.annulation("L1"))
+    stockage.compacter()
+    moteur = stockage.charger()
+    assert importer(stockage, moteur).acceptes == 0
+    assert moteur.joueur("A")['Points'] == 0
+
+
+def test_lignes_rejetees():
+    from championnat.classements import MoteurClassement
+
+    moteur = MoteurClassement()
+    for joueur in "AB":
+        moteur.appliquer(evenements.ajout("CLUB", joueur, 70))
+    rapport = importer_combats("Joueur1,Joueur2,Vainqueur,Technique\nA,X,A,Ippon\nA,A,A,Ippon\nA,B,C,Ippon\n"
+                               "A,B,A,Koka\n", moteur, moteur.appliquer)
+    assert rapport.acceptes == 0
+    assert rapport.rejets_df['Motif'].tolist() == ["Joueur inconnu", "Les deux joueurs sont identiques",
+                                                   "Vainqueur ni Joueur1 ni Joueur2", "Technique inconnue"]
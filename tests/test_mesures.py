@@ -0,0 +1,91 @@
+import io
+import json
+import logging
+import threading
+
+import pytest
+
+from championnat import mesures
+
+
+def test_chronos_compteurs_et_fenetre():
+    registre = mesures.Mesures(fenetre=3)
+
+    @registre.mesurer("calcul")
+    def calcul(x):
+        return 2 * x
+
+    assert [calcul(i) for i in range(5)] == [0, 2, 4, 6, 8]
+    with registre.chrono("bloc"):
+        pass
+    registre.compter("lignes", 10)
+    registre.compter("lignes")
+    statistiques = registre.statistiques().set_index('Mesure')
+    assert statistiques.loc["calcul", 'Appels'] == 5 and statistiques.loc["bloc", 'Appels'] == 1
+    assert len(registre._durees["calcul"]) == 3  # fenêtre glissante, appels comptés en entier
+    assert (statistiques['p50_ms'] <= statistiques['p95_ms']).all()
+    assert (statistiques['p95_ms'] <= statistiques['Max_ms']).all()
+    assert registre.compteurs().values.tolist() == [["lignes", 11]]
+    registre.reinitialiser()
+    assert registre.statistiques().empty and registre.compteurs().empty
+
+
+def test_passage_decoupe_en_etapes():
+    registre = mesures.Mesures(passages=2)
+    registre.commencer_passage("abandonné")  # interrompu par st.rerun : jamais terminé
+    passage = registre.commencer_passage("Voir Classements", session="s1")
+    with registre.chrono("stockage.charger"):
+        pass
+    registre.marquer("etat")
+    # Une mesure prise dans un autre thread ne compte pas dans le passage
+    autre = threading.Thread(target=lambda: registre.enregistrer("export.pdf", 0.5))
+    autre.start()
+    autre.join()
+    registre.marquer("page")
+    assert registre.terminer_passage() is passage and registre.terminer_passage() is None
+    assert [etape for etape, _ in passage.etapes] == ["etat", "page"]
+    assert [nom for nom, _ in passage.mesures] == ["stockage.charger"]
+    assert passage.duree >= sum(duree for _, duree in passage.etapes)
+    assert passage.tableau()['Type'].tolist() == ["étape", "étape", "mesure"]
+    assert [p.nom for p in registre.passages] == ["Voir Classements"]
+    assert set(registre.statistiques()['Mesure']) == {"stockage.charger", "export.pdf", "passage", "etat", "page"}
+    for i in range(3):
+        registre.commencer_passage(f"P{i}")
+        registre.terminer_passage()
+    assert [p.nom for p in registre.passages] == ["P1", "P2"]
+
+
+def test_journaux_json():
+    registre = mesures.Mesures()
+    sortie = io.StringIO()
+    gestionnaire = logging.StreamHandler(sortie)
+    gestionnaire.setFormatter(mesures.FormatJSON())
+    niveau = mesures.journal.level
+    mesures.journal.addHandler(gestionnaire)
+    mesures.journal.setLevel(logging.INFO)
+    try:
+        registre.commencer_passage("Podium", session="s1")
+        registre.enregistrer("import.csv", 0.25, lignes=3)
+        registre.marquer("page")
+        registre.terminer_passage()
+    finally:
+        mesures.journal.removeHandler(gestionnaire)
+        mesures.journal.setLevel(niveau)
+    mesure, passage = [json.loads(ligne) for ligne in sortie.getvalue().splitlines()]
+    assert (mesure["type"], mesure["nom"], mesure["duree_ms"], mesure["lignes"]) == ("mesure", "import.csv", 250.0, 3)
+    assert (passage["type"], passage["nom"], passage["session"]) == ("passage", "Podium", "s1")
+    assert list(passage["etapes"]) == ["page"] and passage["mesures"] == [["import.csv", 250.0]]
+
+
+def test_profil():
+    with pytest.raises(ValueError):
+        mesures.Profil("inconnu")
+    profil = mesures.Profil("cProfile")
+    profil.demarrer()
+    sum(range(1000))
+    assert "function calls" in profil.arreter()
+    try:
+        import pyinstrument  # noqa: F401
+    except ImportError:
+        with pytest.raises(ImportError):
+            mesures.Profil("pyinstrument").demarrer()
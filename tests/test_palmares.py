@@ -0,0 +1,56 @@
+import random
+
+from championnat.palmares import Palmares, cle_joueur
+
+
+def lignes(n, graine):
+    hasard = random.Random(graine)
+    return {f"J{i}": {'Points': hasard.randrange(5) * 5, 'Victoires': hasard.randrange(4), 'Performance': 0.5,
+                      'Categorie': hasard.choice("AB"), 'Equipe': hasard.choice("XYZ")} for i in range(n)}
+
+
+def contenu(palmares):
+    return ([palmares.noms()] + [palmares.noms(Categorie=c, Equipe=e) for c in "AB" for e in (None, *"XYZ")]
+            + [palmares.rang(nom, Categorie="A") for nom in sorted(palmares._entrees)])
+
+
+def test_chargement_en_bloc_equivalent_aux_insertions():
+    donnees = lignes(200, 1)
+    en_bloc, une_a_une = Palmares(cle_joueur, ('Categorie', 'Equipe')), Palmares(cle_joueur, ('Categorie', 'Equipe'))
+    en_bloc.placer_lot(donnees)
+    for nom, ligne in donnees.items():
+        une_a_une.placer(nom, ligne)
+    assert en_bloc._groupes_differes  # listes par groupe pas encore construites
+    # Un retrait puis des déplacements avant toute lecture par groupe
+    for palmares in (en_bloc, une_a_une):
+        palmares.retirer("J0")
+        palmares.placer("J1", dict(donnees["J1"], Points=100, Equipe="Z"))
+        palmares.placer_lot({nom: dict(ligne, Categorie="B") for nom, ligne in lignes(20, 2).items() if nom != "J0"})
+    assert contenu(en_bloc) == contenu(une_a_une)
+
+
+def page_attendue(donnees, debut, taille, recherche, tri, **filtres):
+    """Recalcul naïf : tri complet, filtres, rang, recherche puis tri demandé."""
+    retenus = sorted((cle_joueur(nom, ligne), nom) for nom, ligne in donnees.items()
+                     if all(valeur is None or ligne[groupe] == valeur for groupe, valeur in filtres.items()))
+    lignes = [(rang, nom) for rang, (_, nom) in enumerate(retenus, 1)
+              if (recherche or "").casefold() in nom.casefold()]
+    if tri == "nom":
+        lignes.sort(key=lambda ligne: ligne[1])
+    elif tri == "inverse":
+        lignes.reverse()
+    return len(lignes), lignes[debut:None if taille is None else debut + taille]
+
+
+def test_page_recherche_et_tris():
+    donnees = {nom.replace("J", "j" if int(nom[1:]) % 3 else "J"): ligne for nom, ligne in lignes(150, 3).items()}
+    palmares = Palmares(cle_joueur, ('Categorie', 'Equipe'))
+    palmares.placer_lot(donnees)
+    for tri in ("rang", "inverse", "nom"):
+        for recherche in (None, "", "j1", "J1", "5"):
+            for debut, taille in ((0, 10), (7, 25), (140, 25), (0, None), (200, 10)):
+                for filtres in ({}, {'Categorie': "A"}, {'Equipe': "Y"}, {'Categorie': "B", 'Equipe': "Z"},
+                                {'Equipe': "inconnue"}):
+                    obtenu = palmares.page(debut, taille, recherche, tri, **filtres)
+                    assert obtenu == page_attendue(donnees, debut, taille, recherche, tri, **filtres), \
+                        (tri, recherche, debut, taille, filtres)
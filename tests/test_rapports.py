@@ -0,0 +1,46 @@
+import time
+
+import pandas as pd
+
+from championnat import rapports
+
+
+def attendre(service, cle):
+    for _ in range(200):
+        etat = service.etat(cle)
+        if etat != "en_cours":
+            return etat
+        time.sleep(0.01)
+    raise AssertionError("rendu toujours en cours")
+
+
+def test_rendu_en_cache_sous_l_empreinte():
+    service = rapports.ServiceRendu(travailleurs=1)
+    table = pd.DataFrame({"Joueur": [f"J{i}" for i in range(2500)], "Points": range(2500)})
+    cle = service.demander("Rapport", {"Total": 3}, table)
+    assert service.demander("Rapport", {"Total": 3}, table.copy()) == cle
+    assert service.etat("autre") == "inconnu"
+    assert attendre(service, cle) == "pret"
+    assert service.resultat(cle).startswith(b"%PDF")
+    assert service.demander("Rapport", {"Total": 4}, table) != cle
+
+
+def test_echec_puis_nouvelle_demande(monkeypatch):
+    service = rapports.ServiceRendu(travailleurs=1)
+    appels = []
+
+    def rendu(title, stats, table_data):
+        appels.append(title)
+        if len(appels) == 1:
+            raise OSError("disque plein")
+        return rapports.io.BytesIO(b"%PDF-test")
+
+    monkeypatch.setattr(rapports, "export_to_pdf", rendu)
+    cle = service.demander("Rapport", {}, None)
+    assert attendre(service, cle) == "erreur"
+    assert str(service.erreur(cle)) == "disque plein"
+    # L'erreur reste affichée jusqu'à ce qu'on redemande le rendu
+    assert service.etat(cle) == "erreur"
+    assert service.demander("Rapport", {}, None) == cle
+    assert attendre(service, cle) == "pret" and service.resultat(cle) == b"%PDF-test"
+    assert service.erreur(cle) is None and len(appels) == 2
@@ -0,0 +1,90 @@
+import os
+import shutil
+
+import pytest
+
+from championnat import evenements, saisons
+
+
+def jouer(stockage, moteur, combats):
+    for joueur1, joueur2, vainqueur, technique in combats:
+        stockage.enregistrer(moteur, evenements.match(joueur1, joueur2, vainqueur, technique))
+
+
+@pytest.fixture
+def archives(stockage, tmp_path):
+    """Deux saisons archivées du championnat national, la troisième en cours."""
+    racine = str(tmp_path / "archives")
+    moteur = stockage.charger()
+    national, premiere = moteur.championnat, moteur.saison
+    for equipe, joueur, poids in [("E1", "A", 60), ("E1", "B", 90), ("E2", "C", 60), ("E2", "D", 95)]:
+        stockage.enregistrer(moteur, evenements.ajout(equipe, joueur, poids))
+    jouer(stockage, moteur, [("A", "C", "A", "Ippon (10 pts)"), ("B", "D", "D", "Yuko (5 pts)")])
+    saisons.nouvelle_saison(stockage, national, "S2", racine=racine)
+    moteur = stockage.charger()
+    stockage.enregistrer(moteur, evenements.modification("A", "E2", 60, 0, 0))  # A change d'équipe
+    jouer(stockage, moteur, [("A", "C", "A", "Waza-ari (7 pts)"), ("C", "D", "C", "Ippon (10 pts)")])
+    saisons.nouvelle_saison(stockage, national, "S3", racine=racine)
+    moteur = stockage.charger()
+    jouer(stockage, moteur, [("B", "A", "B", "Ippon (10 pts)")])
+    return racine, national, premiere, moteur
+
+
+def test_carrieres(archives):
+    racine, national, _, en_cours = archives
+    carrieres = saisons.carrieres(national, racine).set_index('Joueur')
+    assert carrieres.loc["A", ['Saisons', 'Victoires', 'Points', 'Meilleur_Rang', 'Equipe']].tolist() == \
+        [2, 2, 17, 1, "E2"]
+    # Une saison sans point ne donne pas de meilleur rang
+    assert carrieres.loc["B", 'Saisons'] == 2 and carrieres['Meilleur_Rang'].isna().loc["B"]
+    assert carrieres.index[0] == "A"  # victoires, puis points
+    avec_en_cours = saisons.carrieres(national, racine, en_cours).set_index('Joueur')
+    assert avec_en_cours.loc["B", ['Saisons', 'Victoires', 'Defaites']].tolist() == [3, 1, 1]
+    assert avec_en_cours.loc["A", 'Meilleur_Rang'] == 1
+
+
+def test_dynasties_et_categories(archives):
+    racine, national, premiere, en_cours = archives
+    dynasties = saisons.dynasties(national, racine).set_index('Equipe')
+    # Saison 1 : E1 10 pts contre 5 ; saison 2 : E2 17 pts, E1 plus aucun point
+    assert dynasties.loc["E1", ['Saisons', 'Titres', 'Podiums']].tolist() == [2, 1, 1]
+    assert dynasties.loc["E2", ['Saisons', 'Titres', 'Podiums', 'Points_Totaux']].tolist() == [2, 1, 2, 22]
+    # La saison en cours compte dans les totaux, pas dans les titres
+    avec_en_cours = saisons.dynasties(national, racine, en_cours).set_index('Equipe')
+    assert avec_en_cours.loc["E1", ['Saisons', 'Titres', 'Points_Totaux']].tolist() == [3, 1, 20]
+    evolution = saisons.evolution_categories("Points", national, racine)
+    assert list(evolution.columns) == sorted([premiere, "S2"])
+    assert evolution.loc["-60 kg"].tolist() == [10, 17]  # colonnes dans l'ordre des noms de saison
+
+
+def test_plusieurs_championnats_et_consolidation(archives, stockage):
+    racine, national, premiere, _ = archives
+    saisons.nouvelle_saison(stockage, "Ligue", "L1", racine=racine)
+    saisons.nouvelle_saison(stockage, "Ligue", "L2", racine=racine, garder_joueurs=False)
+    assert sorted((c, s) for c, s, _ in saisons.saisons_archivees(racine)) == sorted(
+        [(national, premiere), (national, "S2"), (national, "S3"), ("Ligue", "L1")])
+    # Sans filtre, les championnats s'additionnent
+    assert saisons.carrieres(racine=racine).set_index('Joueur').loc["B", 'Saisons'] == 4
+    assert saisons.carrieres("Ligue", racine).set_index('Joueur').loc["B", 'Saisons'] == 1
+
+    version = saisons.version_archives(racine)
+    shutil.rmtree(saisons.chemin_saison(racine, "Ligue", "L1"))
+    saisons.consolider(racine)
+    assert saisons.version_archives(racine) != version
+    assert "Ligue" not in set(saisons.lire_cumuls("saisons", racine=racine)['Championnat'])
+    for _, _, chemin in saisons.saisons_archivees(racine):
+        shutil.rmtree(chemin)
+    saisons.consolider(racine)
+    assert not os.path.exists(os.path.join(racine, saisons.CUMULS)) and saisons.version_archives(racine) == 0
+    assert saisons.carrieres(racine=racine).empty
+
+
+def test_saison_deja_archivee(archives, stockage):
+    racine, national, premiere, _ = archives
+    with pytest.raises(ValueError):
+        saisons.nouvelle_saison(stockage, national, "S2", racine=racine)
+    moteur = stockage.charger()
+    assert moteur.saison == "S3"
+    archive = saisons.ouvrir(national, "S2", racine)
+    assert archive.joueur("C")['Points'] == 10 and archive.joueur("A")['Equipe'] == "E2"
+    assert saisons.lire(national, "S2", racine=racine)['Joueur'].tolist()[:2] == ["C", "A"]
@@ -0,0 +1,106 @@
+import sqlite3
+
+from championnat import evenements, saisons
+from championnat.stockage import StockageSQLite
+
+
+def ids(moteur):
+    return dict(zip(moteur.judo_data['Joueur'], moteur.judo_data['Id'].tolist()))
+
+
+def test_id_stable_au_rechargement(stockage):
+    moteur = stockage.charger()
+    for i in range(4):
+        stockage.enregistrer(moteur, evenements.ajout("CLUB", f"J{i}", 60 + 5 * i))
+    stockage.enregistrer(moteur, evenements.suppression("J1"))
+    stockage.enregistrer(moteur, evenements.ajout("CLUB", "J4", 90))
+    attendus = ids(moteur)
+    assert attendus == {"J0": 0, "J3": 3, "J2": 2, "J4": 4}
+    assert ids(stockage.charger()) == attendus
+    stockage.compacter()
+    assert ids(stockage.charger()) == attendus
+
+
+def test_migration_base_sans_id(tmp_path):
+    chemin = str(tmp_path / "ancienne.db")
+    connexion = sqlite3.connect(chemin)
+    connexion.executescript("""
+        CREATE TABLE athletes (nom TEXT PRIMARY KEY, equipe TEXT NOT NULL, poids INTEGER NOT NULL,
+            victoires INTEGER NOT NULL, defaites INTEGER NOT NULL, points INTEGER NOT NULL,
+            performance REAL NOT NULL, categorie TEXT NOT NULL);
+        INSERT INTO athletes VALUES ('A', 'CLUB', 60, 0, 0, 0, 0, '-60 kg'), ('B', 'CLUB', 70, 0, 0, 0, 0, '-73 kg');
+    """)
+    connexion.close()
+    stockage = StockageSQLite(chemin)
+    moteur = stockage.charger()
+    assert ids(moteur) == {"A": 0, "B": 1}
+    stockage.enregistrer(moteur, evenements.ajout("CLUB", "C", 80))
+    assert ids(StockageSQLite(chemin).charger()) == {"A": 0, "B": 1, "C": 2}
+
+
+def etat(moteur):
+    return (moteur.judo_data.sort_values('Joueur', ignore_index=True).to_dict("list"), moteur.equipes,
+            moteur.equipes_par_categorie, sorted(moteur.matchs), moteur.classement()['Joueur'].tolist(),
+            moteur.combats.matchs(annules=True))
+
+
+def test_rechargement_equivalent(stockage):
+    moteur = stockage.charger()
+    for i in range(6):
+        stockage.enregistrer(moteur, evenements.ajout(f"E{i % 2}", f"J{i}", 55 + 8 * i))
+    premier = evenements.match("J0", "J1", "J0", "Ippon (10 pts)")
+    for evenement in (premier, evenements.match("J2", "J3", "J3", "Yuko (5 pts)"),
+                      evenements.match("J4", "J5", "Égalité"),
+                      evenements.matchs({"id": ["L1", "L2"], "joueur1": ["J1", "J2"], "joueur2": ["J5", "J4"],
+                                         "vainqueur": ["J5", "J2"], "points": [7, 10], "date": [1.0, 2.0]}),
+                      evenements.annulation(premier["id"]), evenements.suppression("J3"),
+                      evenements.modification("J4", "E0", 99, 2, 1)):
+        stockage.enregistrer(moteur, evenement)
+    assert moteur.verifier() == []
+    attendu = etat(moteur)
+    recharge = stockage.charger()
+    assert etat(recharge) == attendu and recharge.verifier() == []
+    stockage.compacter()
+    recharge = stockage.charger()
+    assert etat(recharge) == attendu and recharge.verifier() == []
+
+
+
+def test_nouvelle_saison_avec_une_autre_table(stockage, tmp_path):
+    moteur = stockage.charger()
+    stockage.enregistrer(moteur, evenements.ajout("CLUB", "A", 45))
+    # Événement relu depuis le journal, puis depuis l'instantané compacté par nouvelle_saison
+    stockage.enregistrer(moteur, evenements.saison(moteur.championnat, "2030", True, moteur.seq, ("F", "cadet")))
+    recharge = stockage.charger()
+    assert (recharge.saison, recharge.table_categories) == ("2030", ("F", "cadet"))
+    assert recharge.joueur("A")['Categorie'] == "-48 kg"
+    saisons.nouvelle_saison(stockage, moteur.championnat, "2031", racine=str(tmp_path / "archives"),
+                            table_categories=("M", "senior"))
+    recharge = stockage.charger()
+    assert (recharge.saison, recharge.table_categories) == ("2031", ("M", "senior"))
+    assert recharge.joueur("A")['Categorie'] == "-60 kg" and recharge.verifier() == []
+
+
+def test_compaction_et_lecteur_en_retard(stockage):
+    moteur = stockage.charger()
+    for i in range(3):
+        stockage.enregistrer(moteur, evenements.ajout("CLUB", f"J{i}", 60 + 5 * i))
+    en_retard = stockage.charger()
+    premier = evenements.match("J0", "J1", "J0", "Ippon (10 pts)")
+    stockage.enregistrer(moteur, premier)
+    stockage.enregistrer(moteur, evenements.match("J1", "J2", "J2", "Yuko (5 pts)"))
+    seq = moteur.seq
+    stockage.compacter()
+    if isinstance(stockage, StockageSQLite):
+        assert stockage.connexion.execute("SELECT COUNT(*) FROM evenements").fetchone()[0] == 1
+    assert stockage.dernier_seq() == seq and stockage.evenements_depuis(seq) == []
+    # Les événements absorbés ne peuvent plus être rejoués un à un : le lecteur recharge
+    assert stockage.evenements_depuis(en_retard.seq) is None
+    stockage.rattraper(en_retard)
+    assert en_retard.seq == seq and en_retard.joueur("J0")['Points'] == 10
+    # La numérotation continue après la compaction
+    stockage.enregistrer(en_retard, evenements.annulation(premier["id"]))
+    assert en_retard.seq == seq + 1 and [e["seq"] for e in stockage.evenements_depuis(seq)] == [seq + 1]
+    stockage.rattraper(moteur)
+    assert moteur.joueur("J0")['Points'] == 0
+    assert stockage.charger().classement()['Joueur'].tolist() == moteur.classement()['Joueur'].tolist()
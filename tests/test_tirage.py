@@ -0,0 +1,132 @@
+import random
+from itertools import combinations
+
+import pandas as pd
+import pytest
+
+from championnat import tirage
+from championnat.categories import categoriser
+
+
+def athletes(n, equipes=None, categorie="-73 kg"):
+    """``n`` athlètes classés : J0 est la tête de série n° 1."""
+    return pd.DataFrame({
+        'Joueur': [f"J{i}" for i in range(n)],
+        'Equipe': equipes or [f"E{i}" for i in range(n)],
+        'Points': list(range(10 * n, 0, -10)),
+        'Victoires': [0] * n,
+        'Performance': [0.0] * n,
+        'Categorie': categorie,
+    })
+
+
+def nommes(combat):
+    return [p for p in (combat["rouge"], combat["bleu"]) if not isinstance(p, tuple)]
+
+
+@pytest.mark.parametrize("n", range(6, 40))
+def test_tableau_et_exemptions(n):
+    combats = tirage.tirer(athletes(n), "-73 kg")["combats"]
+    taille = 1 << (n - 1).bit_length()
+    principaux = [c for c in combats if c["tour"] not in ("Repêchage", "Bronze")]
+    assert len(principaux) == n - 1  # élimination directe
+    premier_tour = [c for c in principaux if c["tour"] == principaux[0]["tour"]]
+    exemptes = {f"J{i}" for i in range(taille - n)}  # les meilleures têtes de série
+    assert len(premier_tour) == n - taille // 2
+    en_lice = [j for c in premier_tour for j in nommes(c)]
+    assert len(en_lice) == len(set(en_lice)) and not exemptes & set(en_lice)
+    # Chaque exempté entre au tour suivant, une seule fois
+    assert sorted(j for c in principaux[len(premier_tour):] for j in nommes(c)) == sorted(exemptes)
+    # Les têtes de série 1 et 2 ne peuvent se croiser qu'en finale
+    tableau = tirage.placer(athletes(n))
+    assert tirage.tour_de_rencontre(tableau.index("J0"), tableau.index("J1")) == taille.bit_length() - 1
+    assert principaux[-1]["tour"] == "Finale"
+
+
+@pytest.mark.parametrize("n", [8, 9, 12, 16, 17, 33])
+def test_repechage_et_bronze(n):
+    combats = tirage.tirer(athletes(n), "-73 kg")["combats"]
+    par_id = {c["id"]: c for c in combats}
+    quarts = [c["id"] for c in combats if c["tour"] == "Quart de finale"]
+    demis = [c["id"] for c in combats if c["tour"] == "Demi-finale"]
+    repechage = [c for c in combats if c["tour"] == "Repêchage"]
+    bronze = [c for c in combats if c["tour"] == "Bronze"]
+    assert len(repechage) == 2 and len(bronze) == 2
+    # Perdants des quarts par moitié de tableau
+    assert [(c["rouge"], c["bleu"]) for c in repechage] == [
+        (("P", quarts[0]), ("P", quarts[1])), (("P", quarts[2]), ("P", quarts[3]))]
+    # Vainqueur du repêchage contre le perdant de la demi-finale opposée
+    assert [(c["rouge"], c["bleu"]) for c in bronze] == [
+        (("V", repechage[0]["id"]), ("P", demis[1])), (("V", repechage[1]["id"]), ("P", demis[0]))]
+    assert all(set(c["depend"]) <= par_id.keys() for c in combats)
+
+
+@pytest.mark.parametrize("n", range(2, tirage.SEUIL_POULE + 1))
+def test_poule(n):
+    tirage_poule = tirage.tirer(athletes(n), "-73 kg")
+    assert tirage_poule["format"] == "poule"
+    combats = tirage_poule["combats"]
+    assert sorted(tuple(sorted(nommes(c))) for c in combats) == sorted(combinations(sorted(f"J{i}" for i in range(n)), 2))
+    par_tour = {}
+    for c in combats:
+        par_tour.setdefault(c["tour"], []).extend(nommes(c))
+    assert all(len(joueurs) == len(set(joueurs)) for joueurs in par_tour.values())
+
+
+def test_coequipiers_separes_au_premier_tour():
+    hasard = random.Random(3)
+    for _ in range(200):
+        n = hasard.randrange(6, 40)
+        taille = 1 << (n - 1).bit_length()
+        nb_equipes = hasard.randrange(2, 6)
+        equipes = [f"E{hasard.randrange(nb_equipes)}" for _ in range(n)]
+        # Séparation possible : aucune équipe n'a plus d'athlètes que de rencontres (ou d'exemptions) au premier tour
+        if max(equipes.count(e) for e in set(equipes)) > taille // 2:
+            continue
+        equipe = dict(zip([f"J{i}" for i in range(n)], equipes))
+        tableau = tirage.placer(athletes(n, equipes))
+        for i in range(0, taille, 2):
+            rouge, bleu = tableau[i], tableau[i + 1]
+            assert rouge is None or bleu is None or equipe[rouge] != equipe[bleu], (n, equipes)
+
+
+def test_coequipiers_dans_des_quarts_differents():
+    equipes = ["A"] * 4 + [f"E{i}" for i in range(12)]
+    tableau = tirage.placer(athletes(16, equipes))
+    quarts = {tableau.index(f"J{i}") // 4 for i in range(4)}
+    assert len(quarts) == 4
+
+
+def championnat(n, hasard):
+    poids = [hasard.choice([60, 66, 73, 81, 90, 100, 120]) for _ in range(n)]
+    data = athletes(n, [f"E{hasard.randrange(5)}" for _ in range(n)])
+    data['Poids'] = poids
+    data['Categorie'] = categoriser(poids)
+    return data
+
+
+@pytest.mark.parametrize("tapis", [1, 3, 8])
+def test_planifier_respecte_dependances_repos_et_tapis(tapis):
+    hasard = random.Random(tapis)
+    tirages = tirage.tirer_tout(championnat(90, hasard))
+    combats = {c["id"]: c for t in tirages for c in t["combats"]}
+    duree, repos = 6, 10
+    planning = tirage.planifier(tirages, tapis, duree, repos)
+    assert sorted(planning['Combat']) == sorted(combats)
+    fin = dict(zip(planning['Combat'], planning['Fin']))
+    debut = dict(zip(planning['Combat'], planning['Debut']))
+    assert (planning['Fin'] - planning['Debut'] == duree).all()
+    for combat_id, combat in combats.items():
+        # Jamais avant la fin de ses combats d'origine, repos compris
+        assert all(debut[combat_id] >= fin[p] + repos for p in combat["depend"])
+    # Repos entre deux combats d'un athlète nommé
+    for joueur in {j for c in combats.values() for j in nommes(c)}:
+        horaires = sorted((debut[i], fin[i]) for i, c in combats.items() if joueur in nommes(c))
+        assert all(d2 >= f1 + repos for (_, f1), (d2, _) in zip(horaires, horaires[1:]))
+    # Un combat à la fois par tapis, jamais plus de ``tapis`` en parallèle
+    assert set(planning['Tapis']) <= set(range(1, tapis + 1))
+    for _, lignes in planning.groupby('Tapis'):
+        lignes = lignes.sort_values('Debut')
+        assert (lignes['Debut'].to_numpy()[1:] >= lignes['Fin'].to_numpy()[:-1]).all()
+    instants = sorted(set(planning['Debut']))
+    assert max(((planning['Debut'] <= t) & (planning['Fin'] > t)).sum() for t in instants) <= tapis